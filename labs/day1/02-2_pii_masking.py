@@ -17,6 +17,7 @@ from presidio_anonymizer import AnonymizerEngine
 
 analyzer = AnalyzerEngine()
 anonymizer = AnonymizerEngine()
+# (Tip) 앱/노트북마다 엔진을 새로 만들지 않으려면 pii_engines.get_analyzer()로 공용 엔진을 씁니다.
 
 print("✅ Presidio 엔진 초기화 완료.")
 
@@ -48,6 +49,20 @@ if pii_text:
     for res in analyzer_results:
         print(f"  - {res.entity_type}: {pii_text[res.start:res.end]}")
 
+# %%
+# === 3-1. (심화) 한국어 PII 인식기 추가 ===
+# 주민번호, +82/010 전화번호, 한국 주소는 'en' 파이프라인이 놓칩니다.
+# korean_pii.py의 인식기는 패턴을 하나의 정규식으로 한 번만 스캔하고
+# 주민번호 검증번호, 카드번호 Luhn 체크섬으로 오탐을 걸러냅니다.
+from korean_pii import KoreanPiiRecognizer
+
+analyzer.registry.add_recognizer(KoreanPiiRecognizer())
+if pii_text:
+    analyzer_results = analyzer.analyze(text=pii_text, language='en')
+    print(f"✅ 한국어 인식기 추가 후 {len(analyzer_results)}개의 PII가 탐지되었습니다.")
+    for res in analyzer_results:
+        print(f"  - {res.entity_type}: {pii_text[res.start:res.end]}")
+
 # %%
 # === 4. PII 마스킹 (Anonymize) ===
 # 탐지된 PII를 <PHONE_NUMBER>, <CREDIT_CARD_NUMBER> 등으로 대체합니다.
@@ -109,3 +124,39 @@ if 'anonymized_text' in locals() and API_KEY:
 else:
     print("🚨 [에러] 마스킹된 텍스트('anonymized_text')가 준비되지 않았습니다.")
 # %%
+# === 6. (심화) 대량 VOC 배치 마스킹 ===
+# 위 과정은 문서 1건을 한 스레드에서 처리합니다. 수십만 건을 매일 처리하려면
+# 워커마다 Presidio를 한 번만 로드하는 프로세스 풀 파이프라인(pii_batch.py)을 사용합니다.
+#   python pii_batch.py data/voc_tickets/ --out masked.jsonl --workers 8
+# 노트북 셀에서는 workers=1(현재 프로세스)로 실행합니다. 프로세스 풀은 spawn 방식(Windows/macOS)에서
+# 워커가 이 파일을 다시 import해 위의 API 호출 셀까지 다시 실행하므로 CLI로만 사용하세요.
+from pii_batch import run_batch
+
+if pii_text:
+    docs = [(i, pii_text) for i in range(200)]  # 같은 VOC 200건으로 처리량 확인
+    batch_stats = run_batch(docs, './data/masked_sample.jsonl', workers=1, batch_size=32)
+# %%
+# === 7. (심화) 대용량 로그/녹취록 스트리밍 마스킹 ===
+# f.read()로 파일 전체를 읽지 않고 청크 단위로 읽어 마스킹한 결과를 바로 씁니다.
+# 청크 경계에 걸친 PII도 놓치지 않으며, .gz 입력/출력을 지원합니다 (IP, User=123 포함).
+from pii_stream import mask_file
+
+log_stats = mask_file('./data/log_data.txt', './data/masked_log_data.txt.gz')
+# %%
+# === 8. (심화) 재식별 가능한 가명화 (토큰 볼트) ===
+# <PHONE_NUMBER>로 가리면 LLM 요약을 어느 고객 티켓에 연결할지 알 수 없습니다.
+# 볼트는 같은 값을 항상 같은 토큰(CUST_7f3a..., PHONE_5b5c...)으로 바꾸고
+# 토큰 → 원래 값 매핑을 로컬에만 저장해, LLM 응답을 로컬에서 되돌릴 수 있게 합니다.
+from pii_vault import PiiVault
+
+if pii_text:
+    with PiiVault('./data/.pii_vault.sqlite') as vault:
+        tokenized_text = vault.mask(pii_text)
+        print("--- [토큰화된 데이터 (LLM 전송용)] ---")
+        print(tokenized_text)
+
+        # LLM 응답에 토큰이 그대로 들어 있다고 가정하고 로컬에서 재식별
+        llm_summary = tokenized_text.splitlines()[2]
+        print("\n--- [로컬 재식별 결과] ---")
+        print(vault.reidentify(llm_summary))
+# %%
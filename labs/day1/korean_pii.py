@@ -0,0 +1,178 @@
+# %% 0. 파일 헤더 및 설명
+"""
+한국어 PII 인식기 묶음 (정규식 한 번 + 체크섬 검증)
+
+Presidio 'en' 파이프라인은 주민번호(850101-1234567), +82-10-... / 010-... 전화번호,
+한국 주소를 놓치고, 모든 텍스트에 NER을 돌리면 느립니다. 이 모듈은
+
+- 주민/외국인등록번호, 전화번호, 카드번호, 이메일, 주소 패턴을 하나의 정규식으로 합쳐 한 번만 스캔
+- 후보마다 검증: 주민번호는 생년월일/성별 자리 + 검증번호, 카드번호는 Luhn
+- Presidio용 인식기(KoreanPiiRecognizer)로 감싸 AnalyzerEngine에 등록
+- has_korean_pii(): 후보가 하나도 없는 텍스트는 NER 단계를 건너뛰는 사전 필터
+
+를 제공합니다. 사전 필터로 NER을 건너뛰면 숫자/이메일/주소 없이 이름만 있는 텍스트의
+이름(PERSON)은 마스킹되지 않으므로, 처리량이 더 중요할 때만 켭니다.
+
+사용법:
+    from korean_pii import KoreanPiiRecognizer, find_korean_pii, has_korean_pii
+
+    analyzer.registry.add_recognizer(KoreanPiiRecognizer())
+    results = analyzer.analyze(text=text, language="en")
+
+    find_korean_pii("주민번호: 850101-1234567")   # [PiiMatch('KR_RRN', 6, 20, 0.7)]
+"""
+
+import re
+import datetime
+from typing import List, NamedTuple, Optional
+
+try:
+    from presidio_analyzer import EntityRecognizer, RecognizerResult
+except ImportError:  # 정규식 탐지(find_korean_pii)만 사용할 때
+    EntityRecognizer, RecognizerResult = object, None
+
+# %% 1. 패턴 (하나의 정규식으로 결합)
+
+# 그룹 이름 = 엔티티 이름. 같은 위치에서 여러 패턴이 맞으면 앞쪽 패턴이 우선
+PATTERNS = {
+    # 주민/외국인등록번호: YYMMDD-GNNNNNN (G: 성별/세기 1~8)
+    "KR_RRN": r"(?<!\d)\d{2}(?:0[1-9]|1[0-2])(?:0[1-9]|[12]\d|3[01])\s?-?\s?[1-8]\d{6}(?!\d)",
+    # 카드번호: 4-4-4-4 (15자리 4-6-5 포함)
+    "CREDIT_CARD": r"(?<!\d)(?:\d{4}[- ]?\d{4}[- ]?\d{4}[- ]?\d{4}|\d{4}[- ]?\d{6}[- ]?\d{5})(?!\d)",
+    # 전화번호: 010-1234-5678, +82-10-1234-5678, 02-123-4567, 031-123-4567, 070-...
+    "KR_PHONE": (
+        r"(?<![\d+])(?:\+82[-. ]?(?:\(0\))?(?:1[016789]|2|[3-6][1-5]|70)|01[016789]|02|0[3-6][1-5]|070)"
+        r"[-. )]?\d{3,4}[-. ]?\d{4}(?!\d)"
+    ),
+    "EMAIL_ADDRESS": r"[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Za-z]{2,}",
+    # 주소: 시/도 + (시/군/구) + 도로명 번호 또는 동/리 지번
+    "KR_ADDRESS": (
+        r"(?:서울|부산|대구|인천|광주|대전|울산|세종|경기|강원|충북|충남|전북|전남|경북|경남|제주)"
+        r"(?:특별자치시|특별자치도|특별시|광역시|도)?\s*(?:[가-힣]+(?:시|군|구)\s*){0,2}"
+        r"(?:[가-힣0-9]+(?:로|길)\s*\d+(?:-\d+)?(?:번길\s*\d+)?|[가-힣0-9]+(?:동|리|가)\s*\d+(?:-\d+)?(?:번지)?)"
+    ),
+}
+
+COMBINED_PATTERN = re.compile("|".join(f"(?P<{name}>{pattern})" for name, pattern in PATTERNS.items()))
+
+ENTITY_TYPES = list(PATTERNS)
+
+# 검증 결과별 점수 (검증 실패로 버린 후보는 점수 없음)
+SCORES = {
+    "KR_RRN": 0.95,          # 검증번호 일치
+    "KR_RRN_NO_CHECK": 0.7,  # 2020.10 이후 발급 번호는 검증번호가 없으므로 날짜/성별만 맞아도 탐지
+    "CREDIT_CARD": 0.9,
+    "KR_PHONE": 0.75,
+    "EMAIL_ADDRESS": 0.9,
+    "KR_ADDRESS": 0.6,
+}
+
+# %% 2. 검증
+
+RRN_WEIGHTS = (2, 3, 4, 5, 6, 7, 8, 9, 2, 3, 4, 5)
+RRN_CENTURY = {"1": 1900, "2": 1900, "5": 1900, "6": 1900, "3": 2000, "4": 2000, "7": 2000, "8": 2000}
+
+
+def _digits(value: str) -> str:
+    return re.sub(r"\D", "", value)
+
+
+def rrn_score(value: str) -> Optional[float]:
+    """
+    주민/외국인등록번호 점수 (형식이 틀리면 None)
+
+    생년월일이 실제 날짜가 아니면 버리고, 검증번호까지 맞으면 높은 점수를 줍니다.
+    외국인등록번호(성별 자리 5~8)는 검증번호 계산 방식이 달라 (13 - 합 % 11) % 10을 씁니다.
+    """
+    digits = _digits(value)
+    if len(digits) != 13 or digits[6] not in RRN_CENTURY:
+        return None
+    try:
+        datetime.date(RRN_CENTURY[digits[6]] + int(digits[:2]), int(digits[2:4]), int(digits[4:6]))
+    except ValueError:
+        return None
+
+    total = sum(int(d) * w for d, w in zip(digits, RRN_WEIGHTS))
+    base = 13 if digits[6] in "5678" else 11
+    if (base - total % 11) % 10 == int(digits[12]):
+        return SCORES["KR_RRN"]
+    return SCORES["KR_RRN_NO_CHECK"]
+
+
+def luhn_valid(value: str) -> bool:
+    """Luhn 체크섬 (카드번호)"""
+    digits = _digits(value)
+    total = 0
+    for i, d in enumerate(reversed(digits)):
+        n = int(d)
+        if i % 2 == 1:
+            n = n * 2 - 9 if n > 4 else n * 2
+        total += n
+    return len(digits) >= 13 and total % 10 == 0
+
+
+def _score(entity: str, value: str) -> Optional[float]:
+    if entity == "KR_RRN":
+        return rrn_score(value)
+    if entity == "CREDIT_CARD":
+        return SCORES[entity] if luhn_valid(value) else None
+    return SCORES[entity]
+
+# %% 3. 탐지 / 사전 필터
+
+class PiiMatch(NamedTuple):
+    entity_type: str
+    start: int
+    end: int
+    score: float
+
+
+def find_korean_pii(text: str, entities: Optional[List[str]] = None) -> List[PiiMatch]:
+    """
+    텍스트를 한 번 스캔해 검증을 통과한 한국어 PII 목록 반환
+
+    Args:
+        text: 검사할 텍스트
+        entities: 찾을 엔티티 (None이면 전부)
+    """
+    matches = []
+    for m in COMBINED_PATTERN.finditer(text):
+        entity = m.lastgroup
+        if entities is not None and entity not in entities:
+            continue
+        score = _score(entity, m.group())
+        if score is not None:
+            matches.append(PiiMatch(entity, m.start(), m.end(), score))
+    return matches
+
+
+def has_korean_pii(text: str) -> bool:
+    """사전 필터: 검증을 통과한 후보가 하나라도 있는지 (없으면 NER 생략 가능)"""
+    return any(_score(m.lastgroup, m.group()) is not None for m in COMBINED_PATTERN.finditer(text))
+
+# %% 4. Presidio 인식기
+
+class KoreanPiiRecognizer(EntityRecognizer):
+    """
+    한국어 PII 인식기 (AnalyzerEngine.registry.add_recognizer()로 등록)
+
+    엔티티마다 PatternRecognizer를 따로 두면 텍스트를 엔티티 수만큼 스캔하지만,
+    이 인식기는 결합 정규식으로 한 번만 스캔합니다. NLP 결과는 사용하지 않습니다.
+    """
+
+    def __init__(self, supported_language: str = "en", supported_entities: Optional[List[str]] = None):
+        super().__init__(
+            supported_entities=supported_entities or ENTITY_TYPES,
+            name="KoreanPiiRecognizer",
+            supported_language=supported_language,
+        )
+
+    def load(self):
+        pass
+
+    def analyze(self, text: str, entities: List[str], nlp_artifacts=None) -> list:
+        wanted = [e for e in entities if e in self.supported_entities] if entities else self.supported_entities
+        return [
+            RecognizerResult(entity_type=m.entity_type, start=m.start, end=m.end, score=m.score)
+            for m in find_korean_pii(text, wanted)
+        ]
@@ -0,0 +1,296 @@
+# %% 0. 파일 헤더 및 설명
+"""
+대량 VOC PII 마스킹 배치 파이프라인 (멀티프로세스)
+
+02-2_pii_masking.py는 텍스트 파일 하나를 한 스레드에서 처리합니다.
+매일 밤 수십만 건의 VOC 티켓을 요약 전에 마스킹하기 위해
+
+- 입력: 디렉토리(*.txt), JSONL, CSV 컬럼(청크 단위로 읽음), DataFrame 컬럼
+- 프로세스 풀: 워커마다 Presidio 엔진(+ 한국어 인식기)을 한 번만 로드 (initializer)
+- --prefilter: 한국어 PII 패턴 후보가 없는 문서는 NER을 건너뜀 (korean_pii.has_korean_pii)
+- --vault: <엔티티> 대신 결정적 토큰(CUST_7f3a...)으로 치환하고 매핑을 볼트에 저장 (pii_vault)
+- 문서를 배치로 묶어 워커에 전달 (프로세스 간 통신 비용 절감)
+- 진행 중인 배치 수를 제한해 메모리 일정, 결과는 입력 순서대로 JSONL에 바로 기록
+- 처리량(docs/sec) 보고
+
+워커끼리 공유하는 상태가 없으므로 처리량은 코어 수에 거의 비례합니다.
+
+사용법:
+    python pii_batch.py data/voc_tickets/ --out masked.jsonl --workers 8
+    python pii_batch.py voc.jsonl --out masked.jsonl --text-field body
+    python pii_batch.py voc.csv --column 문의내용 --out masked.jsonl
+
+    from pii_batch import iter_directory, run_batch
+    stats = run_batch(iter_directory("data/voc_tickets"), "masked.jsonl", workers=8)
+"""
+
+import os
+import sys
+import glob
+import json
+import time
+import argparse
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from korean_pii import has_korean_pii
+from pii_engines import get_analyzer, get_anonymizer
+from pii_vault import PiiVault
+
+DEFAULT_BATCH_SIZE = 64
+DEFAULT_LANGUAGE = "en"   # Presidio 기본 모델 (신용카드/이메일/전화번호 등 패턴 기반은 인식)
+PROGRESS_EVERY = 5000     # 이 문서 수마다 진행 상황 출력
+CSV_CHUNKSIZE = 50_000    # CSV 입력을 이 행 수씩 읽음 (파일 전체를 메모리에 올리지 않음)
+
+# %% 1. 워커 엔진 (프로세스당 한 번 로드)
+
+# 워커 프로세스마다 한 번만 만드는 엔진 (initializer에서 설정)
+_analyzer = None
+_anonymizer = None
+_vault: Optional[PiiVault] = None
+_options: Dict[str, Any] = {}
+
+
+def build_engines(language: str = DEFAULT_LANGUAGE):
+    """Presidio 분석기/마스킹 엔진 (한국어 인식기 포함, 프로세스 공용 레지스트리에서 한 번만 생성)"""
+    return get_analyzer(language), get_anonymizer()
+
+
+def _init_worker(language: str, entities: Optional[List[str]], score_threshold: float,
+                 prefilter: bool = False, vault_path: Optional[str] = None):
+    """프로세스 풀 initializer: 워커당 한 번 엔진 로드 (볼트 연결도 워커마다 하나)"""
+    global _analyzer, _anonymizer, _vault, _options
+    _analyzer, _anonymizer = build_engines(language)
+    if _vault is not None:
+        _vault.close()
+    _vault = PiiVault(vault_path) if vault_path else None
+    _options = {"language": language, "entities": entities,
+                "score_threshold": score_threshold, "prefilter": prefilter}
+
+
+def mask_text(text: str) -> Dict[str, Any]:
+    """
+    문서 하나 마스킹 (현재 프로세스의 엔진 사용)
+
+    Returns:
+        {"text": 마스킹된 텍스트, "entities": [{"type", "start", "end", "score"}, ...]}
+    """
+    if not text:
+        return {"text": text or "", "entities": []}
+    if _options.get("prefilter") and not has_korean_pii(text):
+        # 패턴 후보가 없으면 NER 단계 생략 (이름만 있는 텍스트는 마스킹되지 않음)
+        return {"text": text, "entities": []}
+    results = _analyzer.analyze(
+        text=text,
+        language=_options["language"],
+        entities=_options["entities"],
+        score_threshold=_options["score_threshold"],
+    )
+    operators = _vault.operators({r.entity_type for r in results}) if _vault else None
+    masked = _anonymizer.anonymize(text=text, analyzer_results=results, operators=operators).text
+    entities = [
+        {"type": r.entity_type, "start": r.start, "end": r.end, "score": round(r.score, 3)}
+        for r in sorted(results, key=lambda r: r.start)
+    ]
+    return {"text": masked, "entities": entities}
+
+
+def _mask_batch(batch: List[Tuple[Any, str]]) -> List[Dict[str, Any]]:
+    """워커 작업 단위: (id, 텍스트) 배치 → 결과 레코드 목록"""
+    records = []
+    for doc_id, text in batch:
+        try:
+            records.append({"id": doc_id, **mask_text(text)})
+        except Exception as e:
+            # 문서 하나의 실패가 배치 전체를 잃지 않도록 (원문은 절대 기록하지 않음)
+            records.append({"id": doc_id, "text": None, "entities": [], "error": str(e)})
+    if _vault is not None:
+        # 결과가 디스크에 쓰이기 전에 토큰 매핑부터 저장
+        _vault.flush()
+    return records
+
+# %% 2. 입력 소스 (모두 (id, text) 제너레이터)
+
+def iter_directory(directory: str, pattern: str = "*.txt", encoding: str = "utf-8") -> Iterator[Tuple[str, str]]:
+    """디렉토리의 텍스트 파일 (id는 디렉토리 기준 상대 경로, 이름순)"""
+    for path in sorted(glob.glob(os.path.join(directory, "**", pattern), recursive=True)):
+        with open(path, "r", encoding=encoding) as f:
+            yield os.path.relpath(path, directory), f.read()
+
+
+def iter_jsonl(path: str, text_field: str = "text", id_field: Optional[str] = "id") -> Iterator[Tuple[Any, str]]:
+    """JSONL 파일 (id 필드가 없으면 줄 번호)"""
+    with open(path, "r", encoding="utf-8") as f:
+        for line_no, line in enumerate(f, 1):
+            if not line.strip():
+                continue
+            row = json.loads(line)
+            doc_id = row.get(id_field, line_no) if id_field else line_no
+            yield doc_id, row.get(text_field) or ""
+
+
+def iter_dataframe(df, column: str) -> Iterator[Tuple[Any, str]]:
+    """DataFrame 컬럼 (id는 인덱스 값, 결측치는 빈 문자열)"""
+    for index, text in df[column].items():
+        yield index, "" if text is None or text != text else str(text)
+
+
+def iter_csv(path: str, column: str, chunksize: int = CSV_CHUNKSIZE, encoding: str = "utf-8") -> Iterator[Tuple[Any, str]]:
+    """CSV 텍스트 컬럼 (chunksize 행씩 읽어 청크마다 생성, id는 0부터 시작하는 행 번호)"""
+    import pandas as pd
+
+    for chunk in pd.read_csv(path, usecols=[column], chunksize=chunksize, encoding=encoding):
+        yield from iter_dataframe(chunk, column)
+
+
+def _batched(docs: Iterable[Tuple[Any, str]], size: int) -> Iterator[List[Tuple[Any, str]]]:
+    batch = []
+    for doc in docs:
+        batch.append(doc)
+        if len(batch) >= size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+# %% 3. 배치 실행 (순서 보장 + 메모리 제한)
+
+def iter_masked(
+    docs: Iterable[Tuple[Any, str]],
+    workers: Optional[int] = None,
+    batch_size: int = DEFAULT_BATCH_SIZE,
+    language: str = DEFAULT_LANGUAGE,
+    entities: Optional[List[str]] = None,
+    score_threshold: float = 0.35,
+    prefilter: bool = False,
+    vault_path: Optional[str] = None,
+    max_pending: Optional[int] = None,
+) -> Iterator[Dict[str, Any]]:
+    """
+    문서를 프로세스 풀에서 마스킹하고 결과를 입력 순서대로 생성
+
+    Args:
+        docs: (id, text) 이터러블 (제너레이터면 필요한 만큼만 읽음)
+        workers: 워커 프로세스 수 (기본 CPU 수, 1이면 현재 프로세스에서 실행)
+        batch_size: 워커에 한 번에 보내는 문서 수
+        language: Presidio 언어
+        entities: 탐지할 엔티티 (None이면 전부)
+        score_threshold: 이 점수 미만 탐지는 무시
+        prefilter: 한국어 PII 패턴 후보가 없는 텍스트는 NER 없이 그대로 통과
+        vault_path: 지정하면 PII를 결정적 토큰으로 치환하고 토큰 → 값 매핑을 이 볼트에 저장
+        max_pending: 동시에 진행 중인 배치 수 상한 (기본 workers x 2, 메모리 사용량 결정)
+    """
+    global _vault
+    workers = workers or os.cpu_count() or 1
+    init_args = (language, entities, score_threshold, prefilter, vault_path)
+    if vault_path:
+        # 키 파일/테이블을 워커가 동시에 만들지 않도록 먼저 생성
+        PiiVault(vault_path).close()
+
+    if workers == 1:
+        _init_worker(*init_args)
+        try:
+            for batch in _batched(docs, batch_size):
+                yield from _mask_batch(batch)
+        finally:
+            # 현재 프로세스에서 연 볼트는 끝나면 (중간에 멈춰도) 닫음
+            if _vault is not None:
+                _vault.close()
+                _vault = None
+        return
+
+    max_pending = max_pending or workers * 2
+    pending = deque()
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=init_args) as pool:
+        for batch in _batched(docs, batch_size):
+            pending.append(pool.submit(_mask_batch, batch))
+            # 가장 오래된 배치부터 기다려 순서 유지 (그동안 다른 워커는 계속 처리)
+            while len(pending) >= max_pending:
+                yield from pending.popleft().result()
+        while pending:
+            yield from pending.popleft().result()
+
+
+def run_batch(
+    docs: Iterable[Tuple[Any, str]],
+    out_path: str,
+    workers: Optional[int] = None,
+    batch_size: int = DEFAULT_BATCH_SIZE,
+    verbose: bool = True,
+    **mask_kwargs,
+) -> Dict[str, Any]:
+    """
+    마스킹 결과를 JSONL로 기록 ({"id", "text", "entities"} 한 줄씩, 입력 순서)
+
+    Args:
+        docs: (id, text) 이터러블
+        out_path: 출력 JSONL 경로 (임시 파일에 쓴 뒤 완료 시 교체)
+        workers: 워커 프로세스 수
+        batch_size: 배치 크기
+        verbose: 진행 상황 출력
+        **mask_kwargs: iter_masked() 추가 인자 (language, entities, score_threshold, prefilter, vault_path, max_pending)
+
+    Returns:
+        {"docs", "entities", "errors", "seconds", "docs_per_sec"}
+    """
+    stats = {"docs": 0, "entities": 0, "errors": 0}
+    started = time.perf_counter()
+    tmp_path = out_path + ".tmp"
+
+    with open(tmp_path, "w", encoding="utf-8") as out:
+        for record in iter_masked(docs, workers=workers, batch_size=batch_size, **mask_kwargs):
+            out.write(json.dumps(record, ensure_ascii=False) + "\n")
+            stats["docs"] += 1
+            stats["entities"] += len(record["entities"])
+            stats["errors"] += "error" in record
+            if verbose and stats["docs"] % PROGRESS_EVERY == 0:
+                elapsed = time.perf_counter() - started
+                print(f"   {stats['docs']:,}건 처리 ({stats['docs'] / elapsed:,.0f} docs/sec)")
+    os.replace(tmp_path, out_path)
+
+    seconds = time.perf_counter() - started
+    stats["seconds"] = round(seconds, 2)
+    stats["docs_per_sec"] = round(stats["docs"] / seconds, 1) if seconds else 0.0
+    if verbose:
+        print(f"✅ {stats['docs']:,}건 마스킹 완료 → {out_path}")
+        print(f"   PII {stats['entities']:,}개, 실패 {stats['errors']}건, "
+              f"{stats['seconds']}초 ({stats['docs_per_sec']:,} docs/sec)")
+    return stats
+
+# %% 4. CLI
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="VOC 텍스트 대량 PII 마스킹")
+    parser.add_argument("source", help="텍스트 디렉토리, .jsonl, 또는 .csv")
+    parser.add_argument("--out", required=True, help="출력 JSONL 경로")
+    parser.add_argument("--workers", type=int, default=None, help="워커 프로세스 수 (기본 CPU 수)")
+    parser.add_argument("--batch-size", type=int, default=DEFAULT_BATCH_SIZE)
+    parser.add_argument("--pattern", default="*.txt", help="디렉토리 입력의 파일 패턴")
+    parser.add_argument("--text-field", default="text", help="JSONL 텍스트 필드")
+    parser.add_argument("--id-field", default="id", help="JSONL id 필드")
+    parser.add_argument("--column", help="CSV 텍스트 컬럼")
+    parser.add_argument("--language", default=DEFAULT_LANGUAGE)
+    parser.add_argument("--prefilter", action="store_true",
+                        help="전화번호/주민번호/카드/이메일/주소 후보가 없는 텍스트는 NER 생략 (빠르지만 이름만 있는 문서는 통과)")
+    parser.add_argument("--vault", help="가명화 볼트 경로 (지정하면 재식별 가능한 토큰으로 치환)")
+    args = parser.parse_args(argv)
+
+    if os.path.isdir(args.source):
+        docs = iter_directory(args.source, args.pattern)
+    elif args.source.endswith(".jsonl"):
+        docs = iter_jsonl(args.source, args.text_field, args.id_field)
+    elif args.source.endswith(".csv"):
+        if not args.column:
+            parser.error("CSV 입력은 --column이 필요합니다")
+        docs = iter_csv(args.source, args.column)
+    else:
+        parser.error(f"지원하지 않는 입력: {args.source}")
+
+    run_batch(docs, args.out, workers=args.workers, batch_size=args.batch_size,
+              language=args.language, prefilter=args.prefilter, vault_path=args.vault)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
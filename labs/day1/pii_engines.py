@@ -0,0 +1,196 @@
+# %% 0. 파일 헤더 및 설명
+"""
+프로세스 공용 Presidio 엔진 레지스트리 (지연 로드 + 스레드 안전 싱글톤)
+
+AnalyzerEngine()은 spaCy 모델을 로드하느라 수 초가 걸립니다. 스크립트나 Streamlit 세션마다
+엔진을 새로 만들면 매번 그 비용을 치르므로, 이 모듈은 설정(언어, 인식기 묶음, spaCy 모델)별로
+엔진을 한 번만 만들어 프로세스 전체에서 공유합니다.
+
+- get_analyzer() / get_anonymizer(): 처음 호출할 때 생성, 이후에는 같은 객체 반환
+- 여러 스레드가 동시에 처음 호출해도 엔진은 한 번만 생성 (설정별 잠금)
+- warm_up(): 앱 시작 시 미리 로드 (background=True면 백그라운드 스레드)
+- mask(): 요청 경로에서는 analyze + anonymize 호출 비용만 발생
+
+사용법:
+    from pii_engines import get_analyzer, mask, warm_up
+
+    warm_up(background=True)               # 앱 시작 시
+    masked, results = mask("연락처 010-1234-5678")
+
+    # Streamlit: 세션 간 공유 (st.cache_resource와 함께 써도 같은 객체)
+    @st.cache_resource
+    def get_pii_engines():
+        return get_analyzer(), get_anonymizer()
+"""
+
+import time
+import threading
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+DEFAULT_LANGUAGE = "en"
+DEFAULT_RECOGNIZERS = ("korean",)
+WARM_UP_TEXT = "연락처 010-1234-5678, john.doe@example.com, 850101-1234567"
+
+
+def _korean_recognizer(language: str):
+    from korean_pii import KoreanPiiRecognizer
+    return KoreanPiiRecognizer(supported_language=language)
+
+
+def _log_recognizer(language: str):
+    """로그 식별자: User=123, user:profile:456 (값 부분만 탐지)"""
+    from presidio_analyzer import Pattern, PatternRecognizer
+    return PatternRecognizer(
+        supported_entity="LOG_USER_ID",
+        supported_language=language,
+        name="LogUserIdRecognizer",
+        patterns=[
+            Pattern("user_key_value", r"(?<=\bUser=)[\w.@-]+", 0.85),
+            Pattern("user_profile_key", r"(?<=\buser:profile:)\w+", 0.85),
+        ],
+    )
+
+
+# 추가 인식기 이름 → 생성 함수 (언어를 받아 Presidio 인식기 반환)
+RECOGNIZER_FACTORIES: Dict[str, Callable] = {
+    "korean": _korean_recognizer,
+    "log": _log_recognizer,
+}
+
+# %% 1. 레지스트리
+
+_analyzers: Dict[Tuple, object] = {}
+_anonymizer = None
+_key_locks: Dict[Tuple, threading.Lock] = {}
+_registry_lock = threading.Lock()
+
+
+def _config_key(language: str, recognizers: Sequence[str], spacy_model: Optional[str]) -> Tuple:
+    unknown = [name for name in recognizers if name not in RECOGNIZER_FACTORIES]
+    if unknown:
+        raise ValueError(f"알 수 없는 인식기: {unknown} (가능: {', '.join(RECOGNIZER_FACTORIES)})")
+    return (language, tuple(sorted(set(recognizers))), spacy_model)
+
+
+def _lock_for(key: Tuple) -> threading.Lock:
+    with _registry_lock:
+        return _key_locks.setdefault(key, threading.Lock())
+
+
+def _build_analyzer(language: str, recognizers: Tuple[str, ...], spacy_model: Optional[str]):
+    """AnalyzerEngine 생성 (spaCy 모델 로드 포함, 수 초 걸림)"""
+    from presidio_analyzer import AnalyzerEngine
+
+    if spacy_model:
+        from presidio_analyzer.nlp_engine import NlpEngineProvider
+        nlp_engine = NlpEngineProvider(nlp_configuration={
+            "nlp_engine_name": "spacy",
+            "models": [{"lang_code": language, "model_name": spacy_model}],
+        }).create_engine()
+        analyzer = AnalyzerEngine(nlp_engine=nlp_engine, supported_languages=[language])
+    else:
+        analyzer = AnalyzerEngine()
+
+    for name in recognizers:
+        analyzer.registry.add_recognizer(RECOGNIZER_FACTORIES[name](language))
+    return analyzer
+
+
+def get_analyzer(
+    language: str = DEFAULT_LANGUAGE,
+    recognizers: Sequence[str] = DEFAULT_RECOGNIZERS,
+    spacy_model: Optional[str] = None,
+):
+    """
+    설정별 공용 AnalyzerEngine (처음 호출 시 생성)
+
+    Args:
+        language: 분석 언어
+        recognizers: 기본 인식기에 더할 인식기 이름 (RECOGNIZER_FACTORIES 키)
+        spacy_model: spaCy 모델 이름 (None이면 Presidio 기본값)
+    """
+    key = _config_key(language, recognizers, spacy_model)
+    analyzer = _analyzers.get(key)
+    if analyzer is not None:
+        return analyzer
+    # 같은 설정은 한 스레드만 생성하고 나머지는 기다렸다가 결과를 공유
+    with _lock_for(key):
+        if key not in _analyzers:
+            _analyzers[key] = _build_analyzer(*key)
+        return _analyzers[key]
+
+
+def get_anonymizer():
+    """공용 AnonymizerEngine (상태가 없어 설정과 무관하게 하나)"""
+    global _anonymizer
+    if _anonymizer is None:
+        with _registry_lock:
+            if _anonymizer is None:
+                from presidio_anonymizer import AnonymizerEngine
+                _anonymizer = AnonymizerEngine()
+    return _anonymizer
+
+
+def loaded_configs() -> List[Tuple]:
+    """지금까지 로드된 (language, recognizers, spacy_model) 목록"""
+    return list(_analyzers)
+
+
+def clear():
+    """로드된 엔진 모두 제거 (테스트나 설정 변경 후 다시 로드할 때)"""
+    global _anonymizer
+    with _registry_lock:
+        _analyzers.clear()
+        _key_locks.clear()
+        _anonymizer = None
+
+# %% 2. 워밍업 / 마스킹
+
+def warm_up(
+    language: str = DEFAULT_LANGUAGE,
+    recognizers: Sequence[str] = DEFAULT_RECOGNIZERS,
+    spacy_model: Optional[str] = None,
+    background: bool = False,
+):
+    """
+    엔진을 미리 로드하고 한 번 실행 (첫 analyze 호출의 지연 초기화까지 처리)
+
+    Args:
+        background: True면 데몬 스레드에서 실행하고 스레드를 바로 반환
+
+    Returns:
+        소요 시간(초), background=True면 threading.Thread
+    """
+    if background:
+        thread = threading.Thread(
+            target=warm_up, args=(language, recognizers, spacy_model), daemon=True, name="pii-warm-up"
+        )
+        thread.start()
+        return thread
+
+    started = time.perf_counter()
+    mask(WARM_UP_TEXT, language=language, recognizers=recognizers, spacy_model=spacy_model)
+    seconds = time.perf_counter() - started
+    print(f"🔥 Presidio 엔진 준비 완료 ({language}, {seconds:.1f}초)")
+    return seconds
+
+
+def mask(
+    text: str,
+    language: str = DEFAULT_LANGUAGE,
+    entities: Optional[List[str]] = None,
+    score_threshold: float = 0.35,
+    recognizers: Sequence[str] = DEFAULT_RECOGNIZERS,
+    spacy_model: Optional[str] = None,
+):
+    """
+    공용 엔진으로 텍스트 마스킹
+
+    Returns:
+        (마스킹된 텍스트, analyzer 결과 목록)
+    """
+    analyzer = get_analyzer(language, recognizers, spacy_model)
+    results = analyzer.analyze(
+        text=text, language=language, entities=entities, score_threshold=score_threshold
+    )
+    return get_anonymizer().anonymize(text=text, analyzer_results=results).text, results
@@ -0,0 +1,238 @@
+# %% 0. 파일 헤더 및 설명
+"""
+대용량 텍스트/로그 파일 스트리밍 PII 마스킹 (메모리 일정)
+
+02-2_pii_masking.py는 파일 전체를 f.read()로 읽어 한 번에 마스킹하므로
+수 GB짜리 상담 녹취록이나 애플리케이션 로그(log_data.txt 형식: IP, User=123)에는 쓸 수 없습니다.
+이 모듈은
+
+- chunk_chars 글자씩 읽어 마스킹하고 결과를 바로 출력 파일에 씀
+- 청크 끝 overlap 글자는 확정하지 않고 다음 청크와 함께 다시 분석
+  → 청크 경계에 걸친 엔티티(예: 주민번호 앞/뒤가 나뉜 경우)도 놓치지 않음
+- 확정 지점은 줄바꿈(line) 또는 공백(space)에 맞추고, 엔티티 중간이면 엔티티 앞으로 당김
+- .gz 입력/출력 지원 (확장자로 판단)
+
+메모리는 청크 + overlap 크기만 사용하므로 파일 크기와 무관합니다.
+청크는 spaCy 모델의 max_length(기본 1,000,000자, 넘으면 E088 에러)보다 작게 자동으로 줄입니다.
+overlap보다 긴 엔티티는 경계에서 나뉠 수 있습니다 (기본 512자).
+
+사용법:
+    python pii_stream.py data/log_data.txt --out data/masked_log_data.txt.gz
+    python pii_stream.py transcripts.txt.gz --out masked.txt.gz --boundary space
+
+    from pii_stream import mask_file
+    stats = mask_file("app.log.gz", "app.masked.log.gz")
+"""
+
+import os
+import sys
+import gzip
+import time
+import argparse
+from collections import Counter
+from typing import IO, Any, Dict, Iterator, List, Optional, Sequence, Tuple
+
+from pii_engines import DEFAULT_LANGUAGE, get_analyzer, get_anonymizer
+
+DEFAULT_CHUNK_CHARS = 100_000   # 10만 글자 (spaCy 기본 max_length 1,000,000보다 충분히 작게)
+DEFAULT_OVERLAP = 512
+LOG_RECOGNIZERS = ("korean", "log")
+BOUNDARIES = ("line", "space", "none")
+
+# %% 1. 파일 열기 (gzip 지원)
+
+def open_text(path: str, mode: str = "r", encoding: str = "utf-8", compressed: Optional[bool] = None) -> IO[str]:
+    """
+    텍스트 파일 열기 ("-"는 표준 입출력)
+
+    Args:
+        path: 파일 경로
+        mode: "r" 또는 "w"
+        encoding: 인코딩
+        compressed: gzip 여부 (None이면 .gz 확장자로 판단)
+    """
+    if path == "-":
+        return sys.stdin if mode == "r" else sys.stdout
+    if compressed is None:
+        compressed = path.endswith(".gz")
+    # newline=""로 원본 줄바꿈(\r\n 등)을 그대로 유지
+    if compressed:
+        return gzip.open(path, mode + "t", encoding=encoding, newline="")
+    return open(path, mode, encoding=encoding, newline="")
+
+# %% 2. 청크 경계 처리
+
+def _clamp_chunk_chars(analyzer, language: str, chunk_chars: int, overlap: int) -> int:
+    """
+    spaCy nlp.max_length를 넘지 않는 청크 크기
+
+    분석하는 버퍼는 이전 청크에서 넘어온 부분(최대 약 2 x overlap)과 새 청크를 합친 것이므로
+    max_length - 2 x overlap으로 제한합니다. spaCy를 쓰지 않는 엔진이면 그대로 둡니다.
+    """
+    nlp = getattr(analyzer.nlp_engine, "nlp", None)
+    model = nlp.get(language) if isinstance(nlp, dict) else None
+    max_length = getattr(model, "max_length", None)
+    if max_length is None:
+        return chunk_chars
+    return min(chunk_chars, max_length - overlap * 2)
+
+
+def _find_cut(buffer: str, results: list, overlap: int, boundary: str) -> int:
+    """
+    버퍼에서 이번에 확정할 위치 (이후는 다음 청크와 함께 다시 분석)
+
+    기본 위치는 끝에서 overlap 글자 앞이고, 그 앞 overlap 구간에서 줄바꿈/공백을 찾아 맞춘 뒤
+    확정 위치를 가로지르는 엔티티가 있으면 엔티티 시작 위치로 당깁니다.
+    """
+    cut = len(buffer) - overlap
+    if boundary != "none":
+        window_start = max(0, cut - overlap)
+        pos = buffer.rfind("\n", window_start, cut)
+        if pos == -1 and boundary == "space":
+            pos = buffer.rfind(" ", window_start, cut)
+        if pos != -1:
+            cut = pos + 1
+
+    moved = True
+    while moved:
+        moved = False
+        for r in results:
+            if r.start < cut < r.end:
+                cut = r.start
+                moved = True
+    # 버퍼 전체를 덮는 엔티티처럼 당길 곳이 없으면 기본 위치에서 자름
+    return cut if cut > 0 else len(buffer) - overlap
+
+
+def iter_masked_chunks(
+    stream: IO[str],
+    chunk_chars: int = DEFAULT_CHUNK_CHARS,
+    overlap: int = DEFAULT_OVERLAP,
+    boundary: str = "line",
+    language: str = DEFAULT_LANGUAGE,
+    entities: Optional[List[str]] = None,
+    score_threshold: float = 0.35,
+    recognizers: Sequence[str] = LOG_RECOGNIZERS,
+) -> Iterator[Tuple[str, list]]:
+    """
+    텍스트 스트림을 청크 단위로 마스킹
+
+    Args:
+        stream: 읽기용 텍스트 스트림
+        chunk_chars: 한 번에 읽을 글자 수 (메모리 사용량 결정, spaCy max_length - 2 x overlap 이하로 제한)
+        overlap: 다음 청크와 함께 다시 분석할 끝부분 글자 수 (가장 긴 엔티티보다 커야 함)
+        boundary: 확정 지점 기준 ("line", "space", "none")
+        language, entities, score_threshold: analyzer.analyze() 인자
+        recognizers: pii_engines 추가 인식기 (기본: 한국어 + 로그 User=)
+
+    Yields:
+        (마스킹된 텍스트 조각, 그 조각 기준 analyzer 결과)
+    """
+    if boundary not in BOUNDARIES:
+        raise ValueError(f"boundary는 {BOUNDARIES} 중 하나여야 합니다: {boundary!r}")
+    analyzer = get_analyzer(language, recognizers)
+    anonymizer = get_anonymizer()
+    chunk_chars = _clamp_chunk_chars(analyzer, language, chunk_chars, overlap)
+    if overlap * 2 >= chunk_chars:
+        raise ValueError("chunk_chars는 overlap의 2배보다 커야 합니다")
+
+    carry = ""
+    while True:
+        chunk = stream.read(chunk_chars)
+        final = not chunk
+        buffer = carry + chunk
+        if not buffer:
+            return
+        if not final and len(buffer) <= overlap * 2:
+            # 스트림이 짧게 끊어 읽힌 경우 (표준 입력 등) 더 읽은 뒤 분석
+            carry = buffer
+            continue
+
+        results = analyzer.analyze(
+            text=buffer, language=language, entities=entities, score_threshold=score_threshold
+        )
+        cut = len(buffer) if final else _find_cut(buffer, results, overlap, boundary)
+        committed = [r for r in results if r.end <= cut]
+        yield anonymizer.anonymize(text=buffer[:cut], analyzer_results=committed).text, committed
+
+        carry = buffer[cut:]
+        if final:
+            return
+
+# %% 3. 파일 단위 실행
+
+def mask_file(
+    src: str,
+    dst: str,
+    chunk_chars: int = DEFAULT_CHUNK_CHARS,
+    overlap: int = DEFAULT_OVERLAP,
+    boundary: str = "line",
+    encoding: str = "utf-8",
+    verbose: bool = True,
+    **mask_kwargs,
+) -> Dict[str, Any]:
+    """
+    파일을 스트리밍 마스킹해 dst에 기록 (임시 파일에 쓴 뒤 완료 시 교체)
+
+    Args:
+        src: 입력 파일 (.gz 가능, "-"는 표준 입력)
+        dst: 출력 파일 (.gz면 압축, "-"는 표준 출력)
+        **mask_kwargs: iter_masked_chunks() 추가 인자 (language, entities, score_threshold, recognizers)
+
+    Returns:
+        {"chars", "entities", "by_type", "seconds", "chars_per_sec"}
+    """
+    stats: Dict[str, Any] = {"chars": 0, "entities": 0}
+    by_type: Counter = Counter()
+    started = time.perf_counter()
+    tmp = dst if dst == "-" else dst + ".tmp"
+
+    with open_text(src, "r", encoding) as reader:
+        out = open_text(tmp, "w", encoding, compressed=dst.endswith(".gz"))
+        try:
+            for masked, results in iter_masked_chunks(reader, chunk_chars, overlap, boundary, **mask_kwargs):
+                out.write(masked)
+                stats["chars"] += len(masked)
+                stats["entities"] += len(results)
+                by_type.update(r.entity_type for r in results)
+                if verbose and dst != "-":
+                    print(f"   {stats['chars']:,}자 처리, PII {stats['entities']:,}개", file=sys.stderr)
+        finally:
+            if out is not sys.stdout:
+                out.close()
+    if tmp != dst:
+        os.replace(tmp, dst)
+
+    seconds = time.perf_counter() - started
+    stats["by_type"] = dict(by_type.most_common())
+    stats["seconds"] = round(seconds, 2)
+    stats["chars_per_sec"] = round(stats["chars"] / seconds) if seconds else 0
+    if verbose and dst != "-":
+        print(f"✅ 마스킹 완료 → {dst} ({stats['seconds']}초, {stats['chars_per_sec']:,}자/초)")
+        for entity, count in stats["by_type"].items():
+            print(f"   - {entity}: {count:,}개")
+    return stats
+
+# %% 4. CLI
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="대용량 텍스트/로그 파일 스트리밍 PII 마스킹")
+    parser.add_argument("source", help="입력 파일 (.gz 가능, - 는 표준 입력)")
+    parser.add_argument("--out", required=True, help="출력 파일 (.gz면 압축, - 는 표준 출력)")
+    parser.add_argument("--chunk-chars", type=int, default=DEFAULT_CHUNK_CHARS)
+    parser.add_argument("--overlap", type=int, default=DEFAULT_OVERLAP)
+    parser.add_argument("--boundary", choices=BOUNDARIES, default="line",
+                        help="확정 지점 기준 (로그는 line, 줄바꿈 없는 녹취록은 space)")
+    parser.add_argument("--encoding", default="utf-8")
+    parser.add_argument("--language", default=DEFAULT_LANGUAGE)
+    parser.add_argument("--quiet", action="store_true", help="진행 로그 생략")
+    args = parser.parse_args(argv)
+
+    mask_file(args.source, args.out, chunk_chars=args.chunk_chars, overlap=args.overlap,
+              boundary=args.boundary, encoding=args.encoding, verbose=not args.quiet,
+              language=args.language)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,254 @@
+# %% 0. 파일 헤더 및 설명
+"""
+결정적 가명화 볼트 (키 기반 토큰 + 로컬 디스크 저장소 + 재식별)
+
+02-2_pii_masking.py의 <PHONE_NUMBER> 같은 마스킹은 단방향이라, LLM 요약 결과를
+어느 고객 티켓에 연결해야 할지 알 수 없습니다. 이 모듈은
+
+- 같은 값 → 항상 같은 토큰 (CUST_7f3a9c01e2): HMAC(키, 엔티티 + 정규화 값)
+  키를 파일(또는 PII_VAULT_KEY)에 보관하므로 실행이 달라도 토큰이 같음
+- 토큰 → 원래 값 매핑을 로컬 SQLite 볼트에 저장 (토큰이 기본 키, 메모리 캐시로 O(1) 조회)
+  새 토큰은 돌려주기 전에 트랜잭션으로 기록하고 다시 확인하므로, 여러 프로세스/스레드가 같은 볼트를
+  써도 해시 앞부분이 겹친 다른 값이 같은 토큰을 받지 않음
+- Presidio AnonymizerEngine용 custom operator 제공 (operators())
+- LLM 응답 안의 토큰을 원래 값으로 되돌리는 재식별 (한 건 / 여러 건 일괄, 조회 쿼리 한 번)
+
+볼트 파일과 키 파일은 원본 PII와 같은 수준으로 보호해야 하며 외부로 보내면 안 됩니다.
+
+사용법:
+    from pii_vault import PiiVault
+
+    with PiiVault(".pii_vault.sqlite") as vault:
+        masked = vault.mask("연락처 010-1234-5678")          # "연락처 PHONE_3fa9c2..."
+        summary = call_llm(masked)
+        print(vault.reidentify(summary))                    # 토큰 → 원래 값
+"""
+
+import os
+import re
+import hmac
+import sqlite3
+import hashlib
+import secrets
+import threading
+from typing import Dict, Iterable, List, Optional
+
+DEFAULT_VAULT_PATH = ".pii_vault.sqlite"
+DEFAULT_TOKEN_HEX = 10       # 40비트: 수백만 값까지 충돌이 드묾 (충돌 시 자동으로 늘림)
+SQL_BATCH = 500              # IN (...) 한 번에 넣는 토큰 수
+
+# 엔티티별 토큰 접두어 (없으면 엔티티 이름)
+TOKEN_PREFIXES = {
+    "PERSON": "CUST",
+    "KR_PHONE": "PHONE",
+    "PHONE_NUMBER": "PHONE",
+    "EMAIL_ADDRESS": "EMAIL",
+    "KR_RRN": "RRN",
+    "CREDIT_CARD": "CARD",
+    "KR_ADDRESS": "ADDR",
+    "LOCATION": "LOC",
+    "IP_ADDRESS": "IP",
+    "LOG_USER_ID": "USER",
+}
+
+# 토큰 바로 뒤에 조사("CUST_...님", "...로")가 붙어도 찾도록 \b 대신 영숫자 경계 사용
+# 볼트에 없는 토큰 모양 문자열은 조회 후 그대로 남음
+TOKEN_PATTERN = re.compile(r"(?<![0-9A-Za-z_])[A-Z][A-Z_]*_[0-9a-f]{4,}(?![0-9A-Za-z])")
+
+# 표기만 다른 같은 값이 같은 토큰이 되도록 (010-1234-5678 == 01012345678)
+_DIGIT_ENTITIES = {"KR_PHONE", "PHONE_NUMBER", "KR_RRN", "CREDIT_CARD"}
+
+
+def normalize(value: str, entity: str) -> str:
+    """토큰 계산용 정규화 (볼트에는 원래 표기를 저장)"""
+    value = value.strip()
+    if entity in _DIGIT_ENTITIES:
+        digits = re.sub(r"\D", "", value)
+        # +82 10... → 010...
+        if entity in ("KR_PHONE", "PHONE_NUMBER") and digits.startswith("82"):
+            return "0" + digits[2:]
+        return digits
+    if entity == "EMAIL_ADDRESS":
+        return value.lower()
+    return re.sub(r"\s+", " ", value)
+
+# %% 1. 키 관리
+
+def load_key(vault_path: str) -> bytes:
+    """
+    가명화 키 (PII_VAULT_KEY 환경 변수 → <볼트>.key 파일 → 새로 생성해 파일에 저장)
+
+    키가 바뀌면 같은 값도 다른 토큰이 되므로 키 파일을 볼트와 함께 백업합니다.
+    """
+    env = os.getenv("PII_VAULT_KEY")
+    if env:
+        return env.encode()
+
+    key_path = vault_path + ".key"
+    if os.path.exists(key_path):
+        with open(key_path, "rb") as f:
+            return f.read().strip()
+
+    key = secrets.token_hex(32).encode()
+    # 소유자만 읽을 수 있게 생성
+    fd = os.open(key_path, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o600)
+    with os.fdopen(fd, "wb") as f:
+        f.write(key)
+    return key
+
+# %% 2. 볼트
+
+class PiiVault:
+    """
+    토큰 ↔ 원래 값 저장소
+
+    Args:
+        path: SQLite 볼트 경로 (여러 프로세스가 같이 써도 됨, WAL 모드)
+            한 인스턴스를 여러 스레드가 공유해도 됨 (연결과 캐시는 잠금으로 보호)
+        key: HMAC 키 (None이면 load_key())
+        token_hex: 토큰 해시 길이 (16진수 글자 수)
+    """
+
+    def __init__(self, path: str = DEFAULT_VAULT_PATH, key: Optional[bytes] = None,
+                 token_hex: int = DEFAULT_TOKEN_HEX):
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self.path = path
+        self.key = key or load_key(path)
+        self.token_hex = token_hex
+        self._lock = threading.RLock()
+        self._conn = sqlite3.connect(path, timeout=30, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        # 새 값마다 짧은 트랜잭션을 커밋하므로 WAL에서 안전한 NORMAL로 fsync 횟수를 줄임
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS tokens ("
+            " token TEXT PRIMARY KEY, entity TEXT NOT NULL, value TEXT NOT NULL, normalized TEXT NOT NULL)"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS tokens_value ON tokens (entity, normalized)")
+        self._conn.commit()
+        # 메모리 캐시 (이번 실행에서 만들거나 조회한 매핑)
+        self._by_value: Dict[tuple, str] = {}
+        self._by_token: Dict[str, str] = {}
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        with self._lock:
+            self.flush()
+            self._conn.close()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM tokens").fetchone()[0]
+
+    # ----- 토큰화 -----
+
+    def tokenize(self, value: str, entity: str = "PERSON") -> str:
+        """값 → 토큰 (같은 엔티티/정규화 값이면 항상 같은 토큰, 돌려주기 전에 볼트에 기록)"""
+        normalized = normalize(value, entity)
+        cache_key = (entity, normalized)
+        with self._lock:
+            token = self._by_value.get(cache_key)
+            if token is not None:
+                return token
+
+            prefix = TOKEN_PREFIXES.get(entity, entity)
+            digest = hmac.new(self.key, f"{entity}\0{normalized}".encode(), hashlib.sha256).hexdigest()
+            length = self.token_hex
+            while not self._claim(f"{prefix}_{digest[:length]}", entity, value, normalized):
+                length += 2  # 해시 앞부분 충돌: 더 긴 토큰 사용
+
+            token = f"{prefix}_{digest[:length]}"
+            self._by_value[cache_key] = token
+            self._by_token[token] = value
+            return token
+
+    def _claim(self, token: str, entity: str, value: str, normalized: str) -> bool:
+        """
+        토큰을 이 값에 배정할 수 있으면 True (이미 같은 값의 토큰이거나, 새로 기록에 성공)
+
+        조회와 삽입 사이에 다른 프로세스가 같은 토큰을 넣을 수 있으므로,
+        INSERT OR IGNORE가 무시되면 같은 트랜잭션 안에서 저장된 (엔티티, 정규화 값)을 다시 확인합니다.
+        """
+        owner = self._conn.execute("SELECT entity, normalized FROM tokens WHERE token = ?", (token,)).fetchone()
+        if owner is None:
+            with self._conn:
+                inserted = self._conn.execute(
+                    "INSERT OR IGNORE INTO tokens VALUES (?, ?, ?, ?)", (token, entity, value, normalized)
+                ).rowcount
+                if inserted:
+                    return True
+                owner = self._conn.execute(
+                    "SELECT entity, normalized FROM tokens WHERE token = ?", (token,)
+                ).fetchone()
+        return tuple(owner) == (entity, normalized)
+
+    def flush(self):
+        """열린 트랜잭션 커밋 (새 매핑은 tokenize()가 바로 기록하므로 close / with 종료 시 확인용)"""
+        with self._lock:
+            self._conn.commit()
+
+    def operators(self, entities: Iterable[str] = TOKEN_PREFIXES) -> dict:
+        """
+        Presidio AnonymizerEngine.anonymize(operators=...)에 넘길 엔티티별 custom operator
+
+        목록에 없는 엔티티(DEFAULT)는 엔티티 이름으로 토큰화합니다.
+        """
+        from presidio_anonymizer.entities import OperatorConfig
+
+        operators = {
+            entity: OperatorConfig("custom", {"lambda": lambda v, e=entity: self.tokenize(v, e)})
+            for entity in entities
+        }
+        operators["DEFAULT"] = OperatorConfig("custom", {"lambda": lambda v: self.tokenize(v, "PII")})
+        return operators
+
+    def mask(self, text: str, language: str = "en", **analyze_kwargs) -> str:
+        """공용 Presidio 엔진(pii_engines)으로 탐지한 PII를 토큰으로 치환"""
+        from pii_engines import get_analyzer, get_anonymizer
+
+        results = get_analyzer(language).analyze(text=text, language=language, **analyze_kwargs)
+        operators = self.operators({r.entity_type for r in results})
+        return get_anonymizer().anonymize(text=text, analyzer_results=results, operators=operators).text
+
+    # ----- 재식별 -----
+
+    def lookup(self, tokens: Iterable[str]) -> Dict[str, str]:
+        """토큰 목록 → {토큰: 원래 값} (캐시에 없는 토큰만 SQL로 묶어서 조회)"""
+        found = {}
+        missing = []
+        with self._lock:
+            for token in set(tokens):
+                if token in self._by_token:
+                    found[token] = self._by_token[token]
+                else:
+                    missing.append(token)
+            for i in range(0, len(missing), SQL_BATCH):
+                batch = missing[i:i + SQL_BATCH]
+                placeholders = ",".join("?" * len(batch))
+                rows = self._conn.execute(f"SELECT token, value FROM tokens WHERE token IN ({placeholders})", batch)
+                for token, value in rows.fetchall():
+                    self._by_token[token] = value
+                    found[token] = value
+        return found
+
+    def reidentify(self, text: str) -> str:
+        """텍스트 안의 토큰을 원래 값으로 (볼트에 없는 토큰은 그대로)"""
+        return self.reidentify_many([text])[0]
+
+    def reidentify_many(self, texts: List[str]) -> List[str]:
+        """여러 응답을 일괄 재식별 (전체 토큰을 모아 한 번에 조회)"""
+        tokens = {m.group(0) for text in texts for m in TOKEN_PATTERN.finditer(text or "")}
+        mapping = self.lookup(tokens)
+        if not mapping:
+            return list(texts)
+        return [
+            TOKEN_PATTERN.sub(lambda m: mapping.get(m.group(0), m.group(0)), text) if text else text
+            for text in texts
+        ]
@@ -0,0 +1,459 @@
+# %% 0. 파일 헤더 및 설명
+"""
+EDAAgent / PandasPseudoAgent 오프라인 벤치마크 (DATASET_GUIDE 숨겨진 인사이트 채점)
+
+Agent 코드를 바꿨을 때 정답에 더 빨리/느리게 도달하는지 객관적으로 비교하기 위한 스위트입니다.
+
+- 고정된 목표/질문 세트를 labs/day2/data 데이터셋(과 --scale로 만든 대용량 합성 데이터)에서 실행
+- LLM은 스크립트 응답(ScriptedChatModel) 또는 녹화해 둔 응답(--replay)으로 대체 → 네트워크 없이 실행
+- 측정: wall time, LLM 호출 수, 프롬프트 토큰(추정), 코드 실행 시간, 코드 실행 중 최대 메모리
+- 최종 답변의 수치를 DATASET_GUIDE.md의 숨겨진 인사이트 기준으로 채점
+- 결과는 JSON 히스토리 파일에 누적하고, 직전 실행보다 나빠진 항목을 표시
+
+스크립트 응답의 {obs1}, {obs2} ...는 Agent가 보낸 n번째 Observation으로 채워집니다.
+따라서 실행/인코딩이 망가져 Observation의 수치가 틀리면 점수도 떨어집니다.
+
+랩 스크립트는 import하면 LLM 호출과 데이터 생성까지 실행되므로,
+AST에서 import / 함수 / 클래스 / 상수 정의만 골라 실행해 Agent 클래스를 가져옵니다 (load_lab).
+
+사용법:
+    python agent_benchmark.py                               # 기본 케이스
+    python agent_benchmark.py --scale 1000000 --label v2    # + 100만 행 합성 데이터
+    python agent_benchmark.py --record responses.json       # 실제 LLM 응답 녹화 (POTENS API 필요)
+    python agent_benchmark.py --replay responses.json       # 녹화한 응답으로 재실행
+"""
+
+import io
+import os
+import re
+import ast
+import sys
+import json
+import time
+import argparse
+import subprocess
+from contextlib import redirect_stdout
+from datetime import datetime
+from typing import Any, Callable, Dict, List, NamedTuple, Optional
+
+import pandas as pd
+from langchain_core.messages import AIMessage, AIMessageChunk, HumanMessage
+
+from agent_profiler import RunProfiler
+from observation_encoder import estimate_tokens
+from synthetic_data import write_dataset
+
+LAB_DIR = os.path.dirname(os.path.abspath(__file__))
+DATA_DIR = os.path.join(LAB_DIR, "data")
+SCALED_DATA_DIR = os.path.join(LAB_DIR, ".benchmark_data")
+DEFAULT_HISTORY = os.path.join(LAB_DIR, "benchmark_history.json")
+
+# 직전 실행 대비 이 비율 이상 느려지면 회귀로 표시
+REGRESSION_TOLERANCE = 0.2
+
+# %% 1. 랩 스크립트에서 정의만 로드
+
+def _is_definition(node: ast.stmt) -> bool:
+    """import, 함수/클래스 정의, 호출이 없는 상수 대입만 True (실행 셀은 제외)"""
+    if isinstance(node, (ast.Import, ast.ImportFrom, ast.FunctionDef, ast.AsyncFunctionDef, ast.ClassDef)):
+        return True
+    if isinstance(node, ast.Assign):
+        return not any(isinstance(child, ast.Call) for child in ast.walk(node.value))
+    return False
+
+
+def load_lab(filename: str) -> Dict[str, Any]:
+    """
+    랩 스크립트의 정의만 실행한 네임스페이스 반환
+
+    Args:
+        filename: labs/day2 안의 파일 이름 (예: "lab4_eda_agent.py")
+
+    Returns:
+        {이름: 객체} (예: namespace["EDAAgent"])
+    """
+    path = os.path.join(LAB_DIR, filename)
+    with open(path, "r", encoding="utf-8") as f:
+        tree = ast.parse(f.read(), filename=path)
+    tree.body = [node for node in tree.body if _is_definition(node)]
+    if LAB_DIR not in sys.path:
+        sys.path.insert(0, LAB_DIR)
+    namespace = {"__name__": f"lab_{os.path.splitext(filename)[0]}", "__file__": path}
+    exec(compile(tree, path, "exec"), namespace)
+    return namespace
+
+# %% 2. 스크립트 / 녹화 LLM
+
+class ScriptedChatModel:
+    """
+    정해진 응답을 순서대로 돌려주는 LLM 대역 (invoke / stream만 지원)
+
+    응답의 {obsN}은 지금까지 받은 N번째 Observation 내용으로 치환합니다.
+    호출 수와 프롬프트 토큰(추정)을 셉니다.
+    """
+
+    def __init__(self, responses: List[str]):
+        self.responses = list(responses)
+        self.calls = 0
+        self.prompt_tokens = 0
+
+    def _respond(self, messages, stop: Optional[List[str]]) -> str:
+        if self.calls < len(self.responses):
+            return self.responses[self.calls]
+        return "Final Answer: (스크립트 응답이 끝났습니다)"
+
+    def invoke(self, messages, stop: Optional[List[str]] = None, **kwargs) -> AIMessage:
+        self.prompt_tokens += sum(estimate_tokens(message.content) for message in messages)
+        text = self._respond(messages, stop)
+        self.calls += 1
+        observations = [
+            message.content[len("Observation:"):].strip()
+            for message in messages
+            if isinstance(message, HumanMessage) and message.content.startswith("Observation:")
+        ]
+        for idx, observation in enumerate(observations, 1):
+            text = text.replace(f"{{obs{idx}}}", observation)
+        return AIMessage(content=text)
+
+    def stream(self, messages, stop: Optional[List[str]] = None, **kwargs):
+        yield AIMessageChunk(content=self.invoke(messages, stop=stop).content)
+
+
+class RecordingChatModel(ScriptedChatModel):
+    """실제 LLM을 호출하면서 응답을 responses에 기록 (--record용)"""
+
+    def __init__(self, inner):
+        super().__init__([])
+        self.inner = inner
+
+    def _respond(self, messages, stop: Optional[List[str]]) -> str:
+        content = self.inner.invoke(messages, stop=stop).content
+        self.responses.append(content)
+        return content
+
+# %% 3. 케이스 정의
+
+class Insight(NamedTuple):
+    """숨겨진 인사이트 하나: 최종 답변에서 수치를 찾는 패턴과 DATASET_GUIDE 기준 판정"""
+    name: str
+    pattern: str                      # 첫 번째 그룹이 수치
+    check: Callable[[float], bool]
+
+
+def _step(thought: str, code: str) -> str:
+    return f"Thought: {thought}\nAction: python_repl\nAction Input:\n```python\n{code}\n```"
+
+
+_NUMBER = r"(-?\d+(?:\.\d+)?)"
+
+ECOMMERCE_INSIGHTS = [
+    Insight("premium_2x", rf"프리미엄[^\n]*?{_NUMBER}\s*배", lambda v: 1.5 <= v <= 2.5),
+    Insight("seoul_rating", rf"서울[^\n]*?{_NUMBER}\s*점", lambda v: v > 0.2),
+    Insight("age_40s", r"(\d+)\s*대[^\n]*구매 횟수", lambda v: v == 40),
+    Insight("female_rating", rf"여성[^\n]*?{_NUMBER}\s*점", lambda v: v > 0),
+]
+
+HR_INSIGHTS = [
+    Insight("dev_salary", rf"개발[^\n]*?{_NUMBER}\s*배", lambda v: v > 1.05),
+    Insight("position_pay", rf"부장[^\n]*?{_NUMBER}\s*배", lambda v: 2.0 <= v <= 3.0),
+    Insight("overtime_satisfaction", rf"상관계수[^\n]*?{_NUMBER}", lambda v: v < 0),
+    Insight("satisfaction_attrition", rf"퇴사율[^\n]*?{_NUMBER}\s*배", lambda v: v > 1.5),
+]
+
+ECOMMERCE_SCRIPT = [
+    _step("프리미엄 여부별 평균 구매액 비율을 계산합니다.",
+          "amount = df.groupby('is_premium')['total_amount'].mean()\n"
+          "result = round(float(amount[1] / amount[0]), 2)"),
+    _step("서울과 다른 지역의 평균 평점 차이를 봅니다.",
+          "rating = df.groupby(df['region'] == '서울')['avg_rating'].mean()\n"
+          "result = round(float(rating[True] - rating[False]), 2)"),
+    _step("연령대별 평균 구매 횟수가 가장 많은 구간을 찾습니다.",
+          "counts = df.groupby(df['age'] // 10 * 10)['purchase_count'].mean()\n"
+          "result = int(counts.idxmax())"),
+    _step("성별 평균 평점 차이를 봅니다.",
+          "rating = df.groupby('gender')['avg_rating'].mean()\n"
+          "result = round(float(rating['F'] - rating['M']), 2)"),
+    "Final Answer:\n"
+    "## 인사이트 1: 프리미엄 고객 구매액\n- 발견: 프리미엄 고객 구매액은 일반 고객의 {obs1}배\n"
+    "## 인사이트 2: 서울 고객 평점\n- 발견: 서울 고객 평점이 타 지역보다 {obs2}점 높음\n"
+    "## 인사이트 3: 연령대별 구매\n- 발견: {obs3}대의 구매 횟수가 가장 많음\n"
+    "## 인사이트 4: 성별 평점\n- 발견: 여성 고객 평점이 남성보다 {obs4}점 높음",
+]
+
+HR_SCRIPT = [
+    _step("개발 부서와 나머지 부서의 평균 연봉 비율을 계산합니다.",
+          "salary = df.groupby(df['department'] == '개발')['salary'].mean()\n"
+          "result = round(float(salary[True] / salary[False]), 2)"),
+    _step("부장과 사원의 평균 연봉 비율을 계산합니다.",
+          "salary = df.groupby('position')['salary'].mean()\n"
+          "result = round(float(salary['부장'] / salary['사원']), 2)"),
+    _step("야근 시간과 만족도의 상관관계를 봅니다.",
+          "result = round(float(df['overtime_hours'].corr(df['satisfaction_score'])), 2)"),
+    _step("만족도 3점 미만 직원과 나머지의 퇴사율 비율을 계산합니다.",
+          "rate = df.groupby(df['satisfaction_score'] < 3)['has_resigned'].mean()\n"
+          "result = round(float(rate[True] / rate[False]), 2)"),
+    "Final Answer:\n"
+    "## 인사이트 1: 부서별 연봉\n- 발견: 개발 부서 연봉은 다른 부서의 {obs1}배\n"
+    "## 인사이트 2: 직급별 연봉\n- 발견: 부장 연봉은 사원의 {obs2}배\n"
+    "## 인사이트 3: 야근과 만족도\n- 발견: 야근 시간과 만족도의 상관계수 {obs3}\n"
+    "## 인사이트 4: 만족도와 퇴사\n- 발견: 만족도 3점 미만 직원의 퇴사율은 나머지의 {obs4}배",
+]
+
+CASES: List[Dict[str, Any]] = [
+    {
+        "name": "eda_ecommerce",
+        "agent": "eda",
+        "dataset": "sample_ecommerce.csv",
+        "goal": "고객 구매 패턴과 평점에 영향을 주는 요인을 분석해주세요",
+        "script": ECOMMERCE_SCRIPT,
+        "insights": ECOMMERCE_INSIGHTS,
+    },
+    {
+        "name": "eda_hr",
+        "agent": "eda",
+        "dataset": "sample_hr.csv",
+        "goal": "연봉 구조와 퇴사 원인을 분석해주세요",
+        "script": HR_SCRIPT,
+        "insights": HR_INSIGHTS,
+    },
+    {
+        "name": "pandas_premium",
+        "agent": "pandas",
+        "dataset": "sample_ecommerce.csv",
+        "goal": "프리미엄 고객은 일반 고객보다 구매액을 몇 배 더 쓰나요?",
+        "script": [ECOMMERCE_SCRIPT[0], "Final Answer: 프리미엄 고객 구매액은 일반 고객의 {obs1}배입니다."],
+        "insights": ECOMMERCE_INSIGHTS[:1],
+    },
+]
+
+
+def scaled_cases(rows: int) -> List[Dict[str, Any]]:
+    """EDA 케이스를 rows행 합성 데이터(synthetic_data.py)로 바꾼 케이스"""
+    schemas = {"eda_ecommerce": "ecommerce", "eda_hr": "hr"}
+    return [
+        {**case, "name": f"{case['name']}_{rows}", "dataset": (schemas[case["name"]], rows)}
+        for case in CASES if case["name"] in schemas
+    ]
+
+# %% 4. 실행 / 채점
+
+def _dataset_path(dataset) -> str:
+    """케이스 데이터셋 경로 (합성 데이터는 처음 한 번만 생성)"""
+    if isinstance(dataset, str):
+        return os.path.join(DATA_DIR, dataset)
+    schema, rows = dataset
+    path = os.path.join(SCALED_DATA_DIR, f"{schema}_{rows}.csv")
+    if not os.path.exists(path):
+        print(f"🏭 합성 데이터 생성: {path}")
+        write_dataset(schema, rows, path, verbose=False)
+    return path
+
+
+def score_answer(answer: str, insights: List[Insight]) -> Dict[str, Any]:
+    """최종 답변에서 인사이트별 수치를 찾아 판정 → {"score", "found": {이름: 수치 또는 None}}"""
+    found, passed = {}, 0
+    for insight in insights:
+        match = re.search(insight.pattern, answer or "")
+        value = float(match.group(1)) if match else None
+        found[insight.name] = value
+        if value is not None and insight.check(value):
+            passed += 1
+    return {"score": round(passed / len(insights), 3) if insights else 0.0, "found": found}
+
+
+def run_case(
+    case: Dict[str, Any],
+    labs: Dict[str, Dict[str, Any]],
+    chat_model: Optional[ScriptedChatModel] = None,
+    max_iterations: int = 8,
+) -> Dict[str, Any]:
+    """
+    케이스 하나 실행 (Agent 출력은 버림)
+
+    Args:
+        case: CASES 항목
+        labs: {"eda": lab4 네임스페이스, "pandas": lab2 네임스페이스}
+        chat_model: 사용할 LLM 대역 (없으면 케이스 스크립트)
+        max_iterations: Agent 최대 반복 횟수
+
+    Returns:
+        측정값과 채점 결과
+    """
+    started = time.perf_counter()
+    df = pd.read_csv(_dataset_path(case["dataset"]))
+    load_seconds = time.perf_counter() - started
+
+    model = chat_model or ScriptedChatModel(case["script"])
+    profiler = RunProfiler(track_memory=True)
+
+    started = time.perf_counter()
+    with redirect_stdout(io.StringIO()):
+        if case["agent"] == "eda":
+            agent = labs["eda"]["EDAAgent"](model, df, verbose=False, profiler=profiler)
+            answer = agent.run(case["goal"], max_iterations=max_iterations)
+        else:
+            agent = labs["pandas"]["PandasPseudoAgent"](model, df, profiler=profiler)
+            answer = agent.run(case["goal"], max_iterations=max_iterations, auto_execute=True)
+    wall_seconds = time.perf_counter() - started
+
+    rows = profiler.iteration_breakdown()
+    exec_ms = sum(row.get("exec", 0.0) for row in rows)
+    peak_kb = max((row.get("peak_mem_kb", 0.0) for row in rows), default=0.0)
+    profiler.close()
+
+    return {
+        "case": case["name"],
+        "rows": len(df),
+        "load_s": round(load_seconds, 3),
+        "wall_s": round(wall_seconds, 3),
+        "llm_calls": model.calls,
+        "prompt_tokens": model.prompt_tokens,
+        "exec_ms": round(exec_ms, 1),
+        "peak_mem_mb": round(peak_kb / 1024, 2),
+        **score_answer(answer, case["insights"]),
+    }
+
+# %% 5. 히스토리 / 회귀 비교
+
+def _git_commit() -> Optional[str]:
+    try:
+        out = subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=LAB_DIR,
+                             capture_output=True, text=True, timeout=5)
+        return out.stdout.strip() or None
+    except (OSError, subprocess.SubprocessError):
+        return None
+
+
+def load_history(path: str) -> List[Dict[str, Any]]:
+    if not os.path.exists(path):
+        return []
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def append_history(path: str, entry: Dict[str, Any]):
+    """히스토리 파일에 실행 결과 하나 추가 (임시 파일에 쓴 뒤 교체)"""
+    history = load_history(path)
+    history.append(entry)
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(history, f, ensure_ascii=False, indent=2)
+    os.replace(tmp_path, path)
+
+
+def find_regressions(previous: Dict[str, Any], current: Dict[str, Any],
+                     tolerance: float = REGRESSION_TOLERANCE) -> List[str]:
+    """같은 케이스끼리 비교해 나빠진 항목 설명 목록 (점수 하락, 호출/토큰 증가, 시간 증가)"""
+    before = {result["case"]: result for result in previous["results"]}
+    messages = []
+    for result in current["results"]:
+        old = before.get(result["case"])
+        if old is None:
+            continue
+        name = result["case"]
+        if result["score"] < old["score"]:
+            messages.append(f"{name}: 점수 {old['score']} → {result['score']}")
+        if result["llm_calls"] > old["llm_calls"]:
+            messages.append(f"{name}: LLM 호출 {old['llm_calls']} → {result['llm_calls']}")
+        if result["prompt_tokens"] > old["prompt_tokens"] * (1 + tolerance / 2):
+            messages.append(f"{name}: 프롬프트 토큰 {old['prompt_tokens']} → {result['prompt_tokens']}")
+        for key in ("wall_s", "exec_ms"):
+            # 아주 짧은 구간의 흔들림은 무시 (50ms 미만)
+            limit = old[key] * (1 + tolerance)
+            noise = 0.05 if key == "wall_s" else 50
+            if result[key] > limit and result[key] - old[key] > noise:
+                messages.append(f"{name}: {key} {old[key]} → {result[key]}")
+    return messages
+
+
+def print_results(results: List[Dict[str, Any]]):
+    header = f"{'case':<24} {'rows':>10} {'wall(s)':>8} {'llm':>4} {'tokens':>7} {'exec(ms)':>9} {'mem(MB)':>8} {'score':>6}"
+    print(header)
+    print("-" * len(header))
+    for r in results:
+        print(f"{r['case']:<24} {r['rows']:>10,} {r['wall_s']:>8.2f} {r['llm_calls']:>4} "
+              f"{r['prompt_tokens']:>7} {r['exec_ms']:>9.1f} {r['peak_mem_mb']:>8.2f} {r['score']:>6.0%}")
+
+# %% 6. CLI
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="EDAAgent / PandasPseudoAgent 오프라인 벤치마크")
+    parser.add_argument("--cases", help="실행할 케이스 이름 (쉼표 구분, 기본 전체)")
+    parser.add_argument("--scale", type=int, action="append", default=[],
+                        help="합성 데이터 행 수 (여러 번 지정 가능, 예: --scale 1000000)")
+    parser.add_argument("--history", default=DEFAULT_HISTORY, help="결과 히스토리 JSON 파일")
+    parser.add_argument("--label", default="", help="이번 실행 이름 (예: 브랜치/버전)")
+    parser.add_argument("--max-iterations", type=int, default=8)
+    group = parser.add_mutually_exclusive_group()
+    group.add_argument("--replay", help="녹화한 응답 JSON ({케이스: [응답, ...]})으로 실행")
+    group.add_argument("--record", help="실제 LLM(POTENS)으로 실행하며 응답을 이 파일에 녹화")
+    args = parser.parse_args(argv)
+
+    cases = CASES + [case for rows in args.scale for case in scaled_cases(rows)]
+    if args.cases:
+        selected = set(args.cases.split(","))
+        cases = [case for case in cases if case["name"] in selected]
+    if not cases:
+        parser.error("실행할 케이스가 없습니다")
+
+    labs = {}
+    if any(case["agent"] == "eda" for case in cases):
+        labs["eda"] = load_lab("lab4_eda_agent.py")
+    if any(case["agent"] == "pandas" for case in cases):
+        labs["pandas"] = load_lab("lab2_pandas_psuedo_agent.py")
+
+    replay = {}
+    if args.replay:
+        with open(args.replay, "r", encoding="utf-8") as f:
+            replay = json.load(f)
+    recorded = {}
+    if args.record:
+        from potens_wrapper import PotensChatModel
+        real_model = PotensChatModel()
+
+    results = []
+    for case in cases:
+        chat_model = None
+        if args.record:
+            chat_model = RecordingChatModel(real_model)
+        elif case["name"] in replay:
+            chat_model = ScriptedChatModel(replay[case["name"]])
+        print(f"▶️ {case['name']}")
+        results.append(run_case(case, labs, chat_model, max_iterations=args.max_iterations))
+        if args.record:
+            recorded[case["name"]] = chat_model.responses
+
+    if args.record:
+        with open(args.record, "w", encoding="utf-8") as f:
+            json.dump(recorded, f, ensure_ascii=False, indent=2)
+        print(f"💾 응답 녹화: {args.record}")
+
+    print()
+    print_results(results)
+
+    entry = {
+        "timestamp": datetime.now().isoformat(timespec="seconds"),
+        "label": args.label,
+        "commit": _git_commit(),
+        "mode": "record" if args.record else "replay" if args.replay else "scripted",
+        "results": results,
+    }
+    history = load_history(args.history)
+    previous = next((e for e in reversed(history) if e.get("mode") == entry["mode"]), None)
+    append_history(args.history, entry)
+    print(f"\n💾 히스토리 저장: {args.history} ({len(history) + 1}회째)")
+
+    if previous is not None:
+        regressions = find_regressions(previous, entry)
+        label = previous.get("label") or previous.get("commit") or previous["timestamp"]
+        if regressions:
+            print(f"\n⚠️ 직전 실행({label}) 대비 회귀:")
+            for message in regressions:
+                print(f"   - {message}")
+            return 1
+        print(f"\n✅ 직전 실행({label}) 대비 회귀 없음")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
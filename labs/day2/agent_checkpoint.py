@@ -0,0 +1,197 @@
+# %% 0. 파일 헤더 및 설명
+"""
+Agent 세션 체크포인트 (append-only JSONL)
+
+Streamlit 프로세스가 재시작되거나 EDAAgent.run이 중간(예: 7회차)에 죽어도
+이미 비용을 낸 LLM 응답과 코드 실행 결과를 잃지 않도록, 매 단계를 디스크에 기록합니다.
+
+- 세션마다 파일 하나: <directory>/<session_id>.jsonl
+- 레코드 종류: message(시스템/사용자/AI 메시지), step(실행 코드 + 결과 + Observation 요약), final
+- 한 단계의 레코드를 모아 write 1번 + flush 1번 (fsync는 선택) → 단계당 1ms 미만
+- 마지막 줄이 쓰다 만 상태여도 로드 시 그 줄을 잘라내고 그 앞까지 복구
+
+사용법:
+    from agent_checkpoint import AgentCheckpoint
+
+    checkpoint = AgentCheckpoint("eda-20251113")
+    agent = EDAAgent(chat_model, df, checkpoint=checkpoint)
+    agent.run(goal)          # 매 단계 자동 기록
+    agent.resume()           # 재시작 후: 완료된 LLM 호출/실행은 건너뛰고 이어서 진행
+"""
+
+import os
+import json
+import hashlib
+from typing import Any, Dict, List, Optional
+
+from langchain_core.messages import BaseMessage, HumanMessage, AIMessage, SystemMessage
+
+DEFAULT_CHECKPOINT_DIR = ".agent_checkpoints"
+
+_ROLE_TO_MESSAGE = {
+    "system": SystemMessage,
+    "human": HumanMessage,
+    "ai": AIMessage,
+}
+
+# %% 1. 체크포인트 클래스
+
+class AgentCheckpoint:
+    """
+    세션 하나의 체크포인트 (JSONL 파일)
+
+    record_*()는 메모리 버퍼에만 추가하고, commit()에서 한 번에 기록합니다.
+    """
+
+    def __init__(self, session_id: str, directory: str = DEFAULT_CHECKPOINT_DIR, fsync: bool = False):
+        """
+        Args:
+            session_id: 세션 ID (파일 이름으로 사용)
+            directory: 체크포인트 디렉토리
+            fsync: True면 commit마다 os.fsync (전원 장애까지 대비, 대신 느림)
+        """
+        if not session_id or os.sep in session_id or session_id.startswith("."):
+            raise ValueError(f"잘못된 session_id: {session_id!r}")
+        self.session_id = session_id
+        self.directory = directory
+        self.path = os.path.join(directory, f"{session_id}.jsonl")
+        self.fsync = fsync
+        self._buffer: List[str] = []
+        self._file = None
+
+    # ---- 기록 ----
+
+    def reset(self, meta: Optional[Dict[str, Any]] = None):
+        """새 실행 시작: 기존 기록을 지우고 meta 레코드로 시작"""
+        self.close()
+        os.makedirs(self.directory, exist_ok=True)
+        with open(self.path, "w", encoding="utf-8"):
+            pass
+        self._buffer = []
+        self._append({"type": "meta", **(meta or {})})
+
+    def record_message(self, message: BaseMessage):
+        """LangChain 메시지 기록 (시스템 프롬프트, 초기 질문, AI 응답)"""
+        self._append({"type": "message", "role": message.type, "content": message.content})
+
+    def record_step(
+        self,
+        iteration: int,
+        codes: List[str],
+        results: List[Any],
+        observation: str,
+        refs: Optional[List[str]] = None,
+    ):
+        """
+        한 단계의 실행 기록 (코드, 결과, LLM에 보낸 Observation과 그 digest)
+
+        Args:
+            iteration: 반복 번호 (1부터)
+            codes: 실행한 코드 목록 (멀티 액션이면 여러 개)
+            results: 코드별 결과 문자열
+            observation: LLM에 보낸 Observation 본문
+            refs: 이 단계에서 만들어진 변수 이름 등 네임스페이스 참조 (선택)
+        """
+        self._append({
+            "type": "step",
+            "iteration": iteration,
+            "codes": codes,
+            "results": [str(r) for r in results],
+            "observation": observation,
+            "digest": hashlib.sha1(observation.encode("utf-8")).hexdigest(),
+            "refs": refs or [],
+        })
+
+    def record_final(self, answer: str):
+        """최종 답변 기록 (resume 시 LLM 호출 없이 바로 반환)"""
+        self._append({"type": "final", "answer": answer})
+
+    def commit(self):
+        """버퍼의 레코드를 write 1번으로 기록"""
+        if not self._buffer:
+            return
+        if self._file is None:
+            os.makedirs(self.directory, exist_ok=True)
+            self._file = open(self.path, "a", encoding="utf-8")
+        self._file.write("".join(self._buffer))
+        self._file.flush()
+        if self.fsync:
+            os.fsync(self._file.fileno())
+        self._buffer = []
+
+    def close(self):
+        """남은 버퍼를 기록하고 파일 닫기"""
+        self.commit()
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def _append(self, record: Dict[str, Any]):
+        self._buffer.append(json.dumps(record, ensure_ascii=False) + "\n")
+
+    # ---- 복구 ----
+
+    def exists(self) -> bool:
+        return os.path.exists(self.path)
+
+    def load(self) -> Dict[str, Any]:
+        """
+        기록을 읽어 Agent 상태로 복원
+
+        Returns:
+            {
+                "meta": 실행 정보 (goal 등),
+                "messages": LangChain 메시지 목록 (step은 Observation 메시지로 복원),
+                "history": [{"iteration", "code", "result"}, ...],
+                "final": 최종 답변 또는 None,
+            }
+        """
+        self.commit()
+        state = {"meta": {}, "messages": [], "history": [], "final": None}
+        if not self.exists():
+            return state
+
+        # 마지막으로 온전히 읽은 줄의 끝 위치 (쓰다 만 줄은 여기서 잘라내야 이후 commit이 그 뒤에 이어 붙지 않음)
+        good_offset = 0
+        with open(self.path, "rb") as f:
+            for raw in f:
+                if not raw.endswith(b"\n"):
+                    # 줄바꿈까지 쓰지 못한 마지막 줄은 버림
+                    break
+                try:
+                    record = json.loads(raw.decode("utf-8"))
+                except (UnicodeDecodeError, json.JSONDecodeError):
+                    break
+                good_offset += len(raw)
+
+                kind = record.get("type")
+                if kind == "meta":
+                    state["meta"] = {k: v for k, v in record.items() if k != "type"}
+                elif kind == "message":
+                    message_cls = _ROLE_TO_MESSAGE.get(record["role"], HumanMessage)
+                    state["messages"].append(message_cls(content=record["content"]))
+                elif kind == "step":
+                    for code, result in zip(record["codes"], record["results"]):
+                        state["history"].append({
+                            "iteration": record["iteration"],
+                            "code": code,
+                            "result": result,
+                        })
+                    state["messages"].append(HumanMessage(content=f"Observation: {record['observation']}"))
+                elif kind == "final":
+                    state["final"] = record["answer"]
+
+        if os.path.getsize(self.path) > good_offset:
+            os.truncate(self.path, good_offset)
+        return state
+
+
+# %% 2. 세션 목록
+
+def list_sessions(directory: str = DEFAULT_CHECKPOINT_DIR) -> List[str]:
+    """저장된 세션 ID 목록 (최근 수정 순)"""
+    if not os.path.isdir(directory):
+        return []
+    files = [f for f in os.listdir(directory) if f.endswith(".jsonl")]
+    files.sort(key=lambda f: os.path.getmtime(os.path.join(directory, f)), reverse=True)
+    return [f[:-len(".jsonl")] for f in files]
@@ -0,0 +1,203 @@
+# %% 0. 파일 헤더 및 설명
+"""
+Agent 실행 프로파일러 (반복별 시간 분해 + Chrome trace)
+
+show_history()/show_conversation()은 잘린 텍스트만 보여주기 때문에,
+실행이 LLM 대기 때문에 느린지(LLM-bound) 코드 실행 때문에 느린지(compute-bound) 알 수 없습니다.
+이 모듈은 반복(iteration)마다 다음 값을 기록합니다.
+
+- llm: LLM 응답 대기 시간 (+ 프롬프트/응답 크기)
+- queue: 스레드 풀에서 실행을 기다린 시간 (멀티 액션)
+- extract: 응답에서 코드 추출 시간
+- exec: 코드 실행 wall / CPU 시간, 최대 메모리(tracemalloc)
+- encode: Observation 인코딩 시간
+
+결과는 요약 표(print_summary)와 Chrome trace / Perfetto JSON(save_chrome_trace)으로 확인합니다.
+(chrome://tracing 또는 https://ui.perfetto.dev 에서 파일 열기)
+
+사용법:
+    from agent_profiler import RunProfiler
+
+    profiler = RunProfiler()
+    agent = EDAAgent(chat_model, df, profiler=profiler)
+    agent.run(goal)
+    profiler.print_summary()
+    profiler.save_chrome_trace("eda_trace.json")
+"""
+
+import os
+import json
+import time
+import threading
+import tracemalloc
+from contextlib import contextmanager
+from typing import Any, Dict, List
+
+# 요약 표에 표시할 구간 순서
+PHASES = ["llm", "queue", "extract", "exec", "encode"]
+
+# %% 1. 프로파일러
+
+class RunProfiler:
+    """
+    Agent 실행 구간을 기록하는 프로파일러
+
+    enabled=False면 모든 기록이 no-op이라 Agent 코드에서 분기 없이 사용할 수 있습니다.
+    """
+
+    def __init__(self, enabled: bool = True, track_memory: bool = True):
+        """
+        Args:
+            enabled: False면 아무것도 기록하지 않음
+            track_memory: True면 exec 구간의 최대 메모리를 tracemalloc으로 측정
+        """
+        self.enabled = enabled
+        self.track_memory = track_memory
+        self.current_iteration = 0
+        self.events: List[Dict[str, Any]] = []
+        self._t0 = time.perf_counter()
+        self._lock = threading.Lock()
+        self._started_tracemalloc = False
+
+    def set_iteration(self, iteration: int):
+        """이후 기록되는 구간이 속할 반복 번호"""
+        self.current_iteration = iteration
+
+    @contextmanager
+    def span(self, phase: str, measure: bool = False, **args):
+        """
+        구간 하나를 측정하는 컨텍스트 매니저
+
+        Args:
+            phase: 구간 이름 (llm, queue, extract, exec, encode 등)
+            measure: True면 CPU 시간과 최대 메모리도 측정 (exec 구간용)
+            **args: 함께 기록할 값 (prompt_chars 등). 블록 안에서 dict로 받아 값을 추가할 수 있음
+        """
+        if not self.enabled:
+            yield args
+            return
+
+        mem_before = 0
+        if measure and self.track_memory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._started_tracemalloc = True
+        if measure and tracemalloc.is_tracing():
+            tracemalloc.reset_peak()
+            mem_before = tracemalloc.get_traced_memory()[0]
+
+        start = time.perf_counter()
+        cpu_start = time.thread_time()
+        try:
+            yield args
+        finally:
+            end = time.perf_counter()
+            if measure:
+                args["cpu_ms"] = round((time.thread_time() - cpu_start) * 1000, 3)
+                if tracemalloc.is_tracing():
+                    args["peak_mem_kb"] = round((tracemalloc.get_traced_memory()[1] - mem_before) / 1024, 1)
+            self._add(phase, start, end, args)
+
+    def record(self, phase: str, start: float, end: float, **args):
+        """이미 측정한 구간(perf_counter 기준 시각)을 직접 기록 (예: 큐 대기 시간)"""
+        if self.enabled:
+            self._add(phase, start, end, args)
+
+    def _add(self, phase: str, start: float, end: float, args: Dict[str, Any]):
+        event = {
+            "phase": phase,
+            "iteration": self.current_iteration,
+            "start_ms": (start - self._t0) * 1000,
+            "duration_ms": (end - start) * 1000,
+            "thread": threading.get_ident(),
+            "args": dict(args),
+        }
+        with self._lock:
+            self.events.append(event)
+
+    def close(self):
+        """프로파일러가 시작한 tracemalloc 정리"""
+        if self._started_tracemalloc:
+            tracemalloc.stop()
+            self._started_tracemalloc = False
+
+    # ---- 리포트 ----
+
+    def iteration_breakdown(self) -> List[Dict[str, Any]]:
+        """반복별 구간 합계 (ms)와 크기/메모리 지표"""
+        rows: Dict[int, Dict[str, Any]] = {}
+        for event in self.events:
+            row = rows.setdefault(event["iteration"], {"iteration": event["iteration"]})
+            row[event["phase"]] = row.get(event["phase"], 0.0) + event["duration_ms"]
+            for key in ("cpu_ms", "prompt_chars", "response_chars"):
+                if key in event["args"]:
+                    row[key] = row.get(key, 0) + event["args"][key]
+            if "peak_mem_kb" in event["args"]:
+                row["peak_mem_kb"] = max(row.get("peak_mem_kb", 0), event["args"]["peak_mem_kb"])
+        return [rows[k] for k in sorted(rows)]
+
+    def summary(self) -> str:
+        """반복별 시간 분해 표 + 전체 비중 (LLM-bound / compute-bound 판단용)"""
+        rows = self.iteration_breakdown()
+        if not rows:
+            return "(기록된 구간 없음)"
+
+        header = f"{'iter':>4} " + " ".join(f"{p + '(ms)':>12}" for p in PHASES)
+        header += f" {'cpu(ms)':>10} {'mem(KB)':>10} {'prompt':>8} {'resp':>7}"
+        lines = [header, "-" * len(header)]
+        totals = {p: 0.0 for p in PHASES}
+        for row in rows:
+            line = f"{row['iteration']:>4} "
+            line += " ".join(f"{row.get(p, 0.0):>12.1f}" for p in PHASES)
+            line += f" {row.get('cpu_ms', 0.0):>10.1f} {row.get('peak_mem_kb', 0.0):>10.1f}"
+            line += f" {row.get('prompt_chars', 0):>8} {row.get('response_chars', 0):>7}"
+            lines.append(line)
+            for p in PHASES:
+                totals[p] += row.get(p, 0.0)
+
+        measured = sum(totals.values()) or 1.0
+        lines.append("-" * len(header))
+        lines.append(
+            "합계  " + " ".join(f"{totals[p]:>12.1f}" for p in PHASES)
+        )
+        lines.append(
+            "비중  " + " ".join(f"{totals[p] / measured:>12.1%}" for p in PHASES)
+        )
+        bound = "LLM-bound" if totals["llm"] >= measured / 2 else "compute-bound"
+        lines.append(f"\n판정: {bound} (LLM 대기 {totals['llm'] / measured:.0%})")
+        return "\n".join(lines)
+
+    def print_summary(self):
+        print("\n" + "="*80)
+        print("⏱️ 실행 프로파일")
+        print("="*80)
+        print(self.summary())
+
+    def to_chrome_trace(self) -> Dict[str, Any]:
+        """Chrome trace / Perfetto에서 열 수 있는 JSON 객체"""
+        pid = os.getpid()
+        threads = {}
+        trace_events = []
+        for event in self.events:
+            tid = threads.setdefault(event["thread"], len(threads) + 1)
+            trace_events.append({
+                "name": event["phase"],
+                "cat": "agent",
+                "ph": "X",
+                "ts": round(event["start_ms"] * 1000, 1),
+                "dur": round(event["duration_ms"] * 1000, 1),
+                "pid": pid,
+                "tid": tid,
+                "args": {"iteration": event["iteration"], **event["args"]},
+            })
+        for thread, tid in threads.items():
+            trace_events.append({
+                "name": "thread_name", "ph": "M", "pid": pid, "tid": tid,
+                "args": {"name": "main" if tid == 1 else f"worker-{tid}"},
+            })
+        return {"traceEvents": trace_events, "displayTimeUnit": "ms"}
+
+    def save_chrome_trace(self, path: str):
+        """Chrome trace JSON 파일 저장"""
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(self.to_chrome_trace(), f, ensure_ascii=False)
+        print(f"✅ trace 저장: {path} (chrome://tracing 또는 ui.perfetto.dev에서 열기)")
@@ -0,0 +1,398 @@
+# %% 0. 파일 헤더 및 설명
+"""
+Agent 실행 런타임 (작업 큐 + 우선순위/테넌트 스케줄러)
+
+PandasPseudoAgent, EDAAgent, SecurePandasAgent는 호출한 스레드에서 질문 하나를 끝까지
+print하며 실행하는 블로킹 루프입니다. 이 모듈은 Agent 실행을 "작업(job)"으로 제출받아
+
+- 작업마다 ID를 발급하고, 진행 이벤트(상태 변화, print 로그, 결과)를 스트리밍
+- 공유 워커 풀 하나에서 여러 세션을 번갈아 실행
+- 테넌트별 동시 실행 수 제한 + 우선순위 (Streamlit 대화형 질문이 대량 EDA 작업보다 먼저)
+
+를 제공합니다. 전역 sys.stdout은 건드리지 않고, 작업 안에서 runtime.print로 출력한 내용만
+해당 작업의 "log" 이벤트로 돌려받습니다 (EDAAgent(print_fn=runtime.print)).
+Agent들이 함께 쓸 LLM 클라이언트(chat_model)와 코드 실행용 스레드 풀(executor)도 런타임이 보관합니다.
+
+끝난 작업은 result()로 결과를 가져가면 인자/결과/이벤트를 비우고 요약만 남기며,
+job_ttl이 지나거나 max_jobs를 넘으면 목록에서도 제거합니다 (오래 도는 Streamlit 서버의 메모리 일정).
+
+사용법:
+    from agent_runtime import AgentRuntime, PRIORITY_BULK
+
+    runtime = AgentRuntime(chat_model=chat_model, max_workers=4, tenant_limits={"batch": 1})
+    job_id = runtime.submit(
+        lambda: EDAAgent(runtime.chat_model, df, executor=runtime.executor, print_fn=runtime.print).run(goal),
+        tenant="batch", priority=PRIORITY_BULK, name="EDA",
+    )
+    for event in runtime.stream(job_id):
+        print(event["type"], event["data"])
+    runtime.result(job_id)
+"""
+
+import sys
+import time
+import uuid
+import heapq
+import asyncio
+import threading
+import traceback
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, AsyncIterator, Callable, Dict, Iterator, List, Optional
+
+# 우선순위 (숫자가 작을수록 먼저 실행)
+PRIORITY_INTERACTIVE = 0
+PRIORITY_DEFAULT = 5
+PRIORITY_BULK = 10
+
+# 작업 상태
+QUEUED = "queued"
+RUNNING = "running"
+DONE = "done"
+FAILED = "failed"
+CANCELLED = "cancelled"
+FINISHED_STATES = (DONE, FAILED, CANCELLED)
+
+DEFAULT_JOB_TTL = 600        # 끝난 작업을 목록에 남겨 두는 시간 (초)
+DEFAULT_MAX_JOBS = 1000      # 끝난 작업을 이 수 넘게 보관하지 않음 (오래된 것부터 제거)
+
+# %% 1. 작업
+
+class AgentJob:
+    """제출된 작업 하나 (상태, 이벤트 기록, 결과)"""
+
+    def __init__(self, fn: Callable[..., Any], args: tuple, kwargs: Dict[str, Any],
+                 tenant: str, priority: int, name: str, echo: bool = False):
+        self.id = uuid.uuid4().hex[:12]
+        self.fn = fn
+        self.args = args
+        self.kwargs = kwargs
+        self.tenant = tenant
+        self.priority = priority
+        self.name = name or getattr(fn, "__name__", "job")
+        self.status = QUEUED
+        self.result: Any = None
+        self.error: Optional[str] = None
+        self.created_at = time.time()
+        self.started_at: Optional[float] = None
+        self.finished_at: Optional[float] = None
+        self.events: List[Dict[str, Any]] = []
+        self.collected = False
+        self.echo = echo
+        self._log_buffer = ""
+        self._cond = threading.Condition()
+
+    def emit(self, event_type: str, data: Any = None):
+        """이벤트 추가 (구독 중인 stream()을 깨움)"""
+        with self._cond:
+            self.events.append({
+                "job_id": self.id,
+                "seq": len(self.events),
+                "type": event_type,
+                "data": data,
+                "time": time.time(),
+            })
+            self._cond.notify_all()
+
+    def finish(self, status: str):
+        """종료 상태로 바꾸고 상태 이벤트 기록 (stream()이 마지막 이벤트를 놓치지 않도록 한 번에)"""
+        with self._cond:
+            self.status = status
+            self.finished_at = time.time()
+            self.emit("status", status)
+
+    def print(self, *values, sep: str = " ", end: str = "\n", file=None, flush: bool = False):
+        """print 대체: 출력을 줄 단위로 모아 "log" 이벤트로 (file을 지정하면 그 파일로)"""
+        if file is not None:
+            print(*values, sep=sep, end=end, file=file, flush=flush)
+            return
+        text = sep.join(str(value) for value in values) + end
+        if self.echo:
+            sys.stdout.write(text)
+        with self._cond:
+            self._log_buffer += text
+            *lines, self._log_buffer = self._log_buffer.split("\n")
+            for line in lines:
+                self.emit("log", line)
+
+    def flush_log(self):
+        """작업 종료 시 줄바꿈 없이 남은 출력 전송"""
+        with self._cond:
+            if self._log_buffer:
+                self.emit("log", self._log_buffer)
+                self._log_buffer = ""
+
+    def release(self):
+        """결과를 가져간 작업의 인자/결과/이벤트를 비움 (상태와 시간 요약만 유지)"""
+        with self._cond:
+            self.fn = self.args = self.kwargs = None
+            self.result = None
+            self.events = []
+            self.collected = True
+            self._cond.notify_all()
+
+    @property
+    def finished(self) -> bool:
+        return self.status in FINISHED_STATES
+
+    def info(self) -> Dict[str, Any]:
+        """작업 요약 (목록 표시용)"""
+        return {
+            "id": self.id,
+            "name": self.name,
+            "tenant": self.tenant,
+            "priority": self.priority,
+            "status": self.status,
+            "queued_sec": round((self.started_at or time.time()) - self.created_at, 2),
+            "run_sec": round((self.finished_at or time.time()) - self.started_at, 2) if self.started_at else 0.0,
+            "error": self.error,
+        }
+
+# %% 2. 런타임 (스케줄러)
+
+class AgentRuntime:
+    """
+    Agent 작업 큐 + 스케줄러
+
+    빈 워커가 생길 때마다 대기열에서 (우선순위, 제출 순서)가 가장 앞선 작업 중
+    테넌트 동시 실행 한도에 걸리지 않는 작업을 꺼내 실행합니다.
+    """
+
+    def __init__(
+        self,
+        chat_model: Any = None,
+        max_workers: int = 4,
+        tenant_limits: Optional[Dict[str, int]] = None,
+        default_tenant_limit: int = 2,
+        exec_workers: int = 4,
+        echo: bool = False,
+        job_ttl: float = DEFAULT_JOB_TTL,
+        max_jobs: int = DEFAULT_MAX_JOBS,
+    ):
+        """
+        Args:
+            chat_model: Agent들이 공유할 LLM 클라이언트 (예: PotensChatModel())
+            max_workers: 동시에 실행할 작업 수 (워커 풀 크기)
+            tenant_limits: 테넌트별 동시 실행 한도 (예: {"batch": 1})
+            default_tenant_limit: tenant_limits에 없는 테넌트의 한도
+            exec_workers: Agent 코드 실행용 공유 스레드 풀 크기 (executor 인자로 전달)
+            echo: True면 작업의 runtime.print 출력을 콘솔에도 그대로 출력
+            job_ttl: 끝난 작업을 목록에 남겨 두는 시간 (초)
+            max_jobs: 보관할 끝난 작업 수 상한
+        """
+        self.chat_model = chat_model
+        self.max_workers = max_workers
+        self.tenant_limits = dict(tenant_limits or {})
+        self.default_tenant_limit = default_tenant_limit
+        self.echo = echo
+        self.job_ttl = job_ttl
+        self.max_jobs = max_jobs
+        self.executor = ThreadPoolExecutor(max_workers=exec_workers, thread_name_prefix="agent-exec")
+
+        self.jobs: Dict[str, AgentJob] = {}
+        self._queue: List[tuple] = []           # (priority, seq, job_id) 힙
+        self._seq = 0
+        self._running = 0
+        self._tenant_running: Dict[str, int] = {}
+        self._lock = threading.Lock()
+        self._pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="agent-job")
+        self._closed = False
+        self._local = threading.local()         # 작업 스레드별 현재 작업 (runtime.print용)
+
+    # ---- 제출 / 조회 ----
+
+    def submit(
+        self,
+        fn: Callable[..., Any],
+        *args,
+        tenant: str = "default",
+        priority: int = PRIORITY_DEFAULT,
+        name: str = "",
+        **kwargs,
+    ) -> str:
+        """
+        작업 제출 (바로 반환)
+
+        Args:
+            fn: 작업 스레드에서 실행할 함수 (예: lambda: agent.run(question))
+            tenant: 테넌트 (세션/사용자/팀 등 동시 실행 한도 단위)
+            priority: 우선순위 (PRIORITY_INTERACTIVE < PRIORITY_DEFAULT < PRIORITY_BULK)
+            name: 목록에 표시할 이름
+
+        Returns:
+            작업 ID
+        """
+        if self._closed:
+            raise RuntimeError("이미 종료된 런타임입니다")
+        job = AgentJob(fn, args, kwargs, tenant, priority, name, echo=self.echo)
+        with self._lock:
+            self._evict()
+            self.jobs[job.id] = job
+            heapq.heappush(self._queue, (priority, self._seq, job.id))
+            self._seq += 1
+        job.emit("status", QUEUED)
+        self._schedule()
+        return job.id
+
+    def print(self, *values, **kwargs):
+        """
+        print 대체 (Agent의 print_fn으로 전달)
+
+        작업 스레드에서 호출하면 그 작업의 "log" 이벤트로, 그 외 스레드에서는 일반 print로 출력합니다.
+        """
+        job = getattr(self._local, "job", None)
+        if job is None:
+            print(*values, **kwargs)
+        else:
+            job.print(*values, **kwargs)
+
+    def get(self, job_id: str) -> AgentJob:
+        if job_id not in self.jobs:
+            raise KeyError(f"없는 작업 ID: {job_id}")
+        return self.jobs[job_id]
+
+    def list_jobs(self, tenant: Optional[str] = None) -> List[Dict[str, Any]]:
+        """작업 목록 (제출 순)"""
+        return [job.info() for job in self.jobs.values() if tenant is None or job.tenant == tenant]
+
+    def cancel(self, job_id: str) -> bool:
+        """대기 중인 작업 취소 (이미 실행 중이면 False)"""
+        job = self.get(job_id)
+        with self._lock:
+            if job.status != QUEUED:
+                return False
+            self._queue = [entry for entry in self._queue if entry[2] != job_id]
+            heapq.heapify(self._queue)
+            job.fn = job.args = job.kwargs = None
+            job.finish(CANCELLED)
+        return True
+
+    def stream(self, job_id: str, timeout: Optional[float] = None) -> Iterator[Dict[str, Any]]:
+        """
+        작업 이벤트를 처음부터 순서대로 생성 (작업이 끝나면 종료)
+
+        이벤트: {"job_id", "seq", "type": status/log/result/error, "data", "time"}
+        """
+        job = self.get(job_id)
+        index = 0
+        while True:
+            with job._cond:
+                while index >= len(job.events) and not job.finished:
+                    if not job._cond.wait(timeout):
+                        raise TimeoutError(f"작업 {job_id} 이벤트 대기 시간 초과")
+                pending = job.events[index:]
+                finished = job.finished
+            for event in pending:
+                yield event
+            index += len(pending)
+            if finished and index >= len(job.events):
+                return
+
+    async def astream(self, job_id: str) -> AsyncIterator[Dict[str, Any]]:
+        """stream()의 asyncio 버전 (이벤트 대기는 기본 스레드 풀에서)"""
+        loop = asyncio.get_running_loop()
+        iterator = self.stream(job_id)
+        done = object()
+        while True:
+            event = await loop.run_in_executor(None, next, iterator, done)
+            if event is done:
+                return
+            yield event
+
+    def result(self, job_id: str, timeout: Optional[float] = None) -> Any:
+        """
+        작업이 끝날 때까지 기다려 결과 반환 (실패하면 RuntimeError)
+
+        결과를 한 번 가져가면 작업의 인자/결과/이벤트를 비우므로 같은 작업의 결과는 다시 가져올 수 없습니다.
+        """
+        job = self.get(job_id)
+        with job._cond:
+            if not job._cond.wait_for(lambda: job.finished, timeout):
+                raise TimeoutError(f"작업 {job_id} 완료 대기 시간 초과")
+            if job.collected:
+                raise RuntimeError(f"작업 {job_id}의 결과는 이미 가져갔습니다")
+            status, error, result = job.status, job.error, job.result
+            job.release()
+        if status == FAILED:
+            raise RuntimeError(f"작업 {job_id} 실패: {error}")
+        if status == CANCELLED:
+            raise RuntimeError(f"작업 {job_id}는 취소되었습니다")
+        return result
+
+    async def aresult(self, job_id: str) -> Any:
+        """result()의 asyncio 버전"""
+        return await asyncio.get_running_loop().run_in_executor(None, self.result, job_id)
+
+    # ---- 스케줄링 ----
+
+    def _evict(self):
+        """끝난 지 job_ttl이 지난 작업과 max_jobs를 넘는 오래된 작업을 목록에서 제거 (_lock 안에서 호출)"""
+        now = time.time()
+        finished = sorted(
+            (job for job in self.jobs.values() if job.finished and job.finished_at is not None),
+            key=lambda job: job.finished_at,
+        )
+        overflow = len(finished) - self.max_jobs
+        for i, job in enumerate(finished):
+            if i < overflow or now - job.finished_at > self.job_ttl:
+                job.release()
+                del self.jobs[job.id]
+
+    def _tenant_limit(self, tenant: str) -> int:
+        return self.tenant_limits.get(tenant, self.default_tenant_limit)
+
+    def _schedule(self):
+        """빈 워커 수만큼 실행 가능한 작업을 꺼내 시작"""
+        started = []
+        with self._lock:
+            while self._running < self.max_workers and self._queue:
+                entry = next(
+                    (e for e in sorted(self._queue)
+                     if self._tenant_running.get(self.jobs[e[2]].tenant, 0) < self._tenant_limit(self.jobs[e[2]].tenant)),
+                    None,
+                )
+                if entry is None:
+                    break  # 대기 작업이 모두 테넌트 한도에 걸림
+                self._queue.remove(entry)
+                heapq.heapify(self._queue)
+                job = self.jobs[entry[2]]
+                job.status = RUNNING
+                job.started_at = time.time()
+                self._running += 1
+                self._tenant_running[job.tenant] = self._tenant_running.get(job.tenant, 0) + 1
+                started.append(job)
+        for job in started:
+            job.emit("status", RUNNING)
+            self._pool.submit(self._run_job, job)
+
+    def _run_job(self, job: AgentJob):
+        self._local.job = job
+        try:
+            job.result = job.fn(*job.args, **job.kwargs)
+            status = DONE
+        except Exception as e:
+            job.error = f"{type(e).__name__}: {e}"
+            job.emit("error", traceback.format_exc())
+            status = FAILED
+        finally:
+            job.flush_log()
+            self._local.job = None
+            # 끝난 작업은 인자(대화 이력 복사본 등)가 더 필요 없음
+            job.fn = job.args = job.kwargs = None
+
+        if status == DONE:
+            job.emit("result", job.result)
+        with self._lock:
+            self._running -= 1
+            self._tenant_running[job.tenant] -= 1
+        job.finish(status)
+        self._schedule()
+
+    # ---- 종료 ----
+
+    def shutdown(self, wait: bool = True):
+        """대기 작업을 취소하고 워커 풀 종료"""
+        self._closed = True
+        for job_id in [entry[2] for entry in list(self._queue)]:
+            self.cancel(job_id)
+        self._pool.shutdown(wait=wait)
+        self.executor.shutdown(wait=wait)
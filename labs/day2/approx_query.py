@@ -0,0 +1,279 @@
+# %% 0. 파일 헤더 및 설명
+"""
+근사 우선 질의 (층화 표본 + 부트스트랩 신뢰구간)
+
+"어느 지역 평점이 더 높은가?", "프리미엄 고객이 2배 더 쓰는가?" 같은 EDA 질문은
+전체 스캔 없이 표본으로도 답할 수 있습니다. 이 모듈은
+
+- 층화 저수지 표본(stratified reservoir sample): 층(예: region)마다 난수 키가 가장 작은 행을 유지
+  → 메모리 일정, CSV도 청크 단위 한 번 읽기로 생성
+- 같은 코드를 부트스트랩 재표본에 반복 실행해 신뢰구간 계산 (층 안에서 복원추출)
+- 구간이 충분히 좁으면 근사값을 Observation으로, 넓으면 전체 데이터로 정확히 재계산
+
+을 제공합니다. 근사하는 것은 평균/중앙값/비율/분위수처럼 데이터 길이와 무관한 통계뿐입니다.
+len, sum, count, value_counts처럼 행 수에 비례하는 결과나 max/min/nunique처럼 표본에서
+체계적으로 작게 나오는 결과는 판단이 애매하면 모두 전체 데이터로 정확히 계산합니다. 표본 크기가 고정이므로 데이터가 커져도 질의 지연 시간은 거의 일정합니다.
+
+사용법:
+    from approx_query import ApproxEngine
+
+    approx = ApproxEngine.from_frame(df, sample_size=20000, strata="region")
+    agent = EDAAgent(chat_model, df, approx=approx)
+    # 코드 첫 줄에 `exact = True`가 있으면 근사 없이 전체 데이터로 계산
+"""
+
+import re
+from typing import Any, Callable, Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+# 코드에서 정확한 계산을 요청하는 표시 (한 줄 단독)
+EXACT_PATTERN = re.compile(r"^\s*exact\s*=\s*True\s*$", re.MULTILINE)
+
+# 부트스트랩 대상으로 삼을 Series 최대 길이 (그 이상은 근사하지 않고 정확히 계산)
+MAX_SERIES_LENGTH = 50
+
+# 표본에서 체계적으로 치우치는 연산 (극값, 고유값 개수 등) → 항상 정확히 계산
+BIASED_PATTERN = re.compile(
+    r"\.(max|min|idxmax|idxmin|nunique|unique|nlargest|nsmallest|cummax|cummin|head|tail)\s*\("
+)
+
+# 표본을 두 번 이어 붙였을 때 결과가 이만큼 넘게 바뀌면 길이 의존 결과로 판단 (std의 ddof 차이 등은 허용)
+SIZE_INVARIANCE_RTOL = 1e-3
+
+_KEY = "__approx_key"
+
+# %% 1. 층화 저수지 표본
+
+def _keep_smallest_keys(frame: pd.DataFrame, strata: Optional[str], limit: int) -> pd.DataFrame:
+    """층마다 난수 키가 가장 작은 limit개 행만 유지 (= 층 안의 단순 무작위 비복원 표본)"""
+    if strata is None:
+        return frame.nsmallest(limit, _KEY) if len(frame) > limit else frame
+    rank = frame.groupby(strata, dropna=False, sort=False)[_KEY].rank(method="first")
+    return frame[rank <= limit]
+
+
+def _allocate(frame: pd.DataFrame, strata: Optional[str], counts: pd.Series, size: int) -> pd.DataFrame:
+    """층별 모집단 크기에 비례해 표본 크기를 배분 (층마다 최소 1행)"""
+    if strata is None:
+        return frame.nsmallest(size, _KEY).drop(columns=_KEY)
+    total = counts.sum()
+    quota = (counts / total * size).round().clip(lower=1).astype(int)
+    rank = frame.groupby(strata, dropna=False, sort=False)[_KEY].rank(method="first")
+    limit = frame[strata].map(quota)
+    return frame[rank <= limit].drop(columns=_KEY)
+
+
+def stratified_sample(
+    df: pd.DataFrame,
+    size: int,
+    strata: Optional[str] = None,
+    seed: int = 0,
+) -> pd.DataFrame:
+    """
+    메모리에 있는 DataFrame의 층화 표본 (층별 크기는 모집단 비율에 비례)
+
+    Args:
+        df: 모집단
+        size: 표본 크기 (df가 더 작으면 df 그대로)
+        strata: 층 컬럼 (None이면 단순 무작위 표본)
+        seed: 난수 시드
+    """
+    if len(df) <= size:
+        return df
+    rng = np.random.default_rng(seed)
+    keyed = df.assign(**{_KEY: rng.random(len(df))})
+    counts = df[strata].value_counts(dropna=False) if strata else pd.Series([len(df)])
+    return _allocate(keyed, strata, counts, size)
+
+
+def reservoir_sample_csv(
+    path: str,
+    size: int,
+    strata: Optional[str] = None,
+    chunksize: int = 200_000,
+    seed: int = 0,
+    **read_kwargs,
+) -> Dict[str, Any]:
+    """
+    CSV를 청크 단위로 한 번 읽으며 층화 저수지 표본 생성 (파일 전체를 메모리에 올리지 않음)
+
+    층마다 최대 size개 후보만 유지하고, 다 읽은 뒤 층별 행 수 비율로 배분합니다.
+
+    Returns:
+        {"sample": 표본 DataFrame, "population_rows": 전체 행 수}
+    """
+    rng = np.random.default_rng(seed)
+    reservoir: Optional[pd.DataFrame] = None
+    counts = pd.Series(dtype="int64")
+    rows = 0
+    for chunk in pd.read_csv(path, chunksize=chunksize, **read_kwargs):
+        rows += len(chunk)
+        if strata:
+            counts = counts.add(chunk[strata].value_counts(dropna=False), fill_value=0)
+        chunk = chunk.assign(**{_KEY: rng.random(len(chunk))})
+        merged = chunk if reservoir is None else pd.concat([reservoir, chunk], ignore_index=True)
+        reservoir = _keep_smallest_keys(merged, strata, size)
+
+    if reservoir is None:
+        return {"sample": pd.read_csv(path, nrows=0, **read_kwargs), "population_rows": 0}
+    if not strata:
+        counts = pd.Series([rows])
+    return {"sample": _allocate(reservoir, strata, counts.astype(int), size), "population_rows": rows}
+
+# %% 2. 근사 엔진
+
+def _numeric_view(value: Any) -> Optional[pd.Series]:
+    """부트스트랩할 수 있는 결과면 float Series로 변환 (스칼라는 길이 1), 아니면 None"""
+    if isinstance(value, (bool, np.bool_)):
+        return None
+    if isinstance(value, (int, float, np.number)):
+        return pd.Series([float(value)], index=["value"])
+    if isinstance(value, pd.Series) and 0 < len(value) <= MAX_SERIES_LENGTH \
+            and pd.api.types.is_numeric_dtype(value) and not pd.api.types.is_bool_dtype(value):
+        return value.astype(float)
+    return None
+
+
+def _same_values(left: pd.Series, right: Optional[pd.Series]) -> bool:
+    """두 결과가 같은 인덱스에 (상대 오차 SIZE_INVARIANCE_RTOL 안에서) 같은 값인지"""
+    if right is None or not left.index.equals(right.index):
+        return False
+    return bool(np.allclose(left.to_numpy(), right.to_numpy(), rtol=SIZE_INVARIANCE_RTOL, atol=0, equal_nan=True))
+
+
+class ApproxEngine:
+    """
+    고정 크기 표본에서 코드를 실행하고 부트스트랩 신뢰구간을 붙이는 엔진
+
+    결과가 숫자 하나 또는 짧은 숫자 Series(그룹별 평균 등)이고 행 수와 무관할 때만 근사하며,
+    그 외 결과나 구간이 너무 넓은 경우는 호출 측이 전체 데이터로 정확히 계산합니다.
+    """
+
+    def __init__(
+        self,
+        sample: pd.DataFrame,
+        population_rows: int,
+        strata: Optional[str] = None,
+        n_boot: int = 30,
+        confidence: float = 0.95,
+        max_rel_width: float = 0.05,
+        seed: int = 0,
+    ):
+        """
+        Args:
+            sample: 층화 표본 (stratified_sample / reservoir_sample_csv 결과)
+            population_rows: 모집단 행 수
+            strata: 층 컬럼 (부트스트랩도 층 안에서 복원추출)
+            n_boot: 부트스트랩 반복 횟수
+            confidence: 신뢰수준
+            max_rel_width: 허용하는 구간 반폭 / |추정값| (넘으면 정확히 재계산)
+            seed: 난수 시드
+        """
+        self.sample = sample.reset_index(drop=True)
+        self.population_rows = population_rows
+        self.strata = strata
+        self.n_boot = n_boot
+        self.confidence = confidence
+        self.max_rel_width = max_rel_width
+        self.seed = seed
+        self.stats = {"approximate": 0, "exact": 0}
+
+        if strata:
+            groups = self.sample.groupby(strata, dropna=False, sort=False).indices
+            self._positions: List[np.ndarray] = list(groups.values())
+        else:
+            self._positions = [np.arange(len(self.sample))]
+
+    @classmethod
+    def from_frame(cls, df: pd.DataFrame, sample_size: int = 20000, strata: Optional[str] = None, **kwargs):
+        """메모리에 있는 DataFrame으로 엔진 생성 (표본은 한 번만 추출)"""
+        seed = kwargs.get("seed", 0)
+        return cls(stratified_sample(df, sample_size, strata, seed), len(df), strata=strata, **kwargs)
+
+    @classmethod
+    def from_csv(cls, path: str, sample_size: int = 20000, strata: Optional[str] = None, **kwargs):
+        """CSV를 청크로 읽어 표본만 보관하는 엔진 생성"""
+        seed = kwargs.get("seed", 0)
+        drawn = reservoir_sample_csv(path, sample_size, strata, seed=seed)
+        return cls(drawn["sample"], drawn["population_rows"], strata=strata, **kwargs)
+
+    @property
+    def is_full(self) -> bool:
+        """표본이 곧 모집단인지 (작은 데이터)"""
+        return len(self.sample) >= self.population_rows
+
+    @staticmethod
+    def split_exact_request(code: str):
+        """코드에서 `exact = True` 줄을 찾아 제거 → (정확 계산 요청 여부, 나머지 코드)"""
+        if EXACT_PATTERN.search(code):
+            return True, EXACT_PATTERN.sub("", code).strip()
+        return False, code
+
+    @staticmethod
+    def is_biased(code: str) -> bool:
+        """표본으로 추정하면 치우치는 연산(max/min/nunique 등)을 쓰는 코드인지"""
+        return bool(BIASED_PATTERN.search(code))
+
+    def estimate(self, evaluate: Callable[[pd.DataFrame], Any]) -> Optional[Dict[str, Any]]:
+        """
+        evaluate(표본)을 실행하고 부트스트랩으로 신뢰구간 계산
+
+        Args:
+            evaluate: DataFrame을 받아 코드 결과 값을 반환하는 함수
+
+        Returns:
+            {"value", "low", "high", "rel_width", "precise"} (값은 float Series),
+            근사할 수 없는 결과(숫자가 아니거나 행 수에 따라 달라지는 결과)면 None
+        """
+        # 코드가 df를 수정해도 보관 중인 표본은 그대로 유지
+        point = _numeric_view(evaluate(self.sample.copy()))
+        if point is None:
+            return None
+        # 표본을 두 번 이어 붙여도 같은 값이어야 길이와 무관한 통계 (len/sum/count/value_counts는 2배)
+        doubled = _numeric_view(evaluate(pd.concat([self.sample, self.sample], ignore_index=True)))
+        if not _same_values(point, doubled):
+            return None
+
+        rng = np.random.default_rng(self.seed)
+        replicates = []
+        for _ in range(self.n_boot):
+            idx = np.concatenate([rng.choice(pos, size=len(pos), replace=True) for pos in self._positions])
+            value = _numeric_view(evaluate(self.sample.iloc[idx]))
+            if value is not None:
+                replicates.append(value.reindex(point.index))
+        if len(replicates) < max(self.n_boot // 2, 2):
+            return None
+
+        table = pd.concat(replicates, axis=1)
+        alpha = (1 - self.confidence) / 2
+        low = table.quantile(alpha, axis=1)
+        high = table.quantile(1 - alpha, axis=1)
+        half_width = (high - low) / 2
+        rel = (half_width / point.abs().where(point.abs() > 0)).fillna(np.inf)
+        rel_width = float(rel.max()) if len(rel) else np.inf
+        return {
+            "value": point,
+            "low": low,
+            "high": high,
+            "rel_width": rel_width,
+            "precise": rel_width <= self.max_rel_width,
+        }
+
+    def describe(self, estimate: Dict[str, Any]) -> Any:
+        """Observation에 넣을 값 (스칼라면 숫자, Series면 추정값/하한/상한 표)"""
+        value = estimate["value"]
+        if list(value.index) == ["value"]:
+            return float(value.iloc[0])
+        return pd.DataFrame({"추정값": value, "하한": estimate["low"], "상한": estimate["high"]})
+
+    def header(self, estimate: Dict[str, Any]) -> str:
+        """근사 결과 설명 한 줄 (표본 크기, 신뢰구간, 상대 오차)"""
+        line = (
+            f"≈ 근사값 (표본 {len(self.sample):,}행 / 전체 {self.population_rows:,}행, "
+            f"{self.confidence:.0%} 신뢰구간 상대 반폭 ±{estimate['rel_width']:.1%})"
+        )
+        if list(estimate["value"].index) == ["value"]:
+            line += f"\n{self.confidence:.0%} CI: [{estimate['low'].iloc[0]:.4g}, {estimate['high'].iloc[0]:.4g}]"
+        return line
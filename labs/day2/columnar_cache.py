@@ -0,0 +1,257 @@
+# %% 0. 파일 헤더 및 설명
+"""
+CSV → 컬럼 포맷(Feather/Parquet) 내용 주소 캐시
+
+lab3-1, lab3-2(Streamlit)는 rerun마다, lab4는 실행마다 pd.read_csv로 CSV를 다시 파싱합니다.
+이 모듈은
+
+- 입력 바이트의 sha256(+ read_csv 인자)을 키로
+- 처음 한 번만 CSV를 파싱해 (추론된 dtype 그대로) Feather 또는 Parquet으로 저장하고
+- 다음부터는 컬럼 파일을 메모리 맵으로 읽어 파싱 없이 로드
+- 캐시 디렉토리 크기가 상한을 넘으면 오래 안 쓴 파일부터 삭제 (LRU, 파일 mtime 기준)
+
+를 제공합니다. Feather/Parquet 읽기/쓰기에 pyarrow가 필요하며, 없으면 경고를 한 번 출력하고
+캐시 없이 pd.read_csv로 읽습니다. 디스크의 파일은 (경로, 크기, 수정 시각)이 같으면 해시도 다시 계산하지 않으므로,
+파싱에 수십 초 걸리는 1GB CSV도 두 번째부터는 1초 안에 로드됩니다.
+
+사용법:
+    from columnar_cache import read_csv_cached
+
+    df = read_csv_cached("sample_ecommerce.csv")          # 경로
+    df = read_csv_cached(uploaded_file)                   # Streamlit 업로드 파일 (getvalue())
+"""
+
+import os
+import io
+import json
+import hashlib
+import threading
+import importlib.util
+from typing import Any, Dict, Optional, Union
+
+import pandas as pd
+
+from data_profile import file_sha256
+
+CACHE_VERSION = 1
+DEFAULT_CACHE_DIR = ".columnar_cache"
+DEFAULT_MAX_SIZE_MB = 2048
+
+_INDEX_FILE = "file_hashes.json"
+
+# %% 1. 캐시
+
+class ColumnarCache:
+    """
+    sha256 → 컬럼 포맷 파일 캐시 (크기 상한, LRU 삭제)
+
+    같은 프로세스의 여러 스레드(Streamlit 세션)가 함께 써도 되도록 잠금을 사용합니다.
+    """
+
+    def __init__(
+        self,
+        cache_dir: str = DEFAULT_CACHE_DIR,
+        max_size_mb: float = DEFAULT_MAX_SIZE_MB,
+        fmt: str = "feather",
+    ):
+        """
+        Args:
+            cache_dir: 컬럼 파일을 저장할 디렉토리
+            max_size_mb: 캐시 디렉토리 크기 상한 (MB)
+            fmt: "feather" (비압축, 메모리 맵 로드가 가장 빠름) 또는 "parquet" (압축, 디스크 절약)
+        """
+        if fmt not in ("feather", "parquet"):
+            raise ValueError(f"지원하지 않는 포맷: {fmt!r} (feather 또는 parquet)")
+        self.cache_dir = cache_dir
+        self.max_size = int(max_size_mb * 1024 * 1024)
+        self.fmt = fmt
+        self.stats = {"hits": 0, "misses": 0, "evictions": 0, "uncacheable": 0}
+        self._lock = threading.Lock()
+        self.enabled = importlib.util.find_spec("pyarrow") is not None
+        if not self.enabled:
+            print("⚠️ pyarrow가 설치되어 있지 않아 컬럼 캐시를 끕니다 (pip install pyarrow). CSV를 매번 파싱합니다.")
+        os.makedirs(cache_dir, exist_ok=True)
+        self._hashes = self._load_index()
+
+    # ---- 키 ----
+
+    def _load_index(self) -> Dict[str, Dict[str, Any]]:
+        """(경로, 크기, 수정 시각) → sha256 인덱스 (깨졌으면 빈 인덱스)"""
+        try:
+            with open(os.path.join(self.cache_dir, _INDEX_FILE), "r", encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, json.JSONDecodeError):
+            return {}
+
+    def _file_digest(self, path: str) -> str:
+        """파일 sha256 (크기와 수정 시각이 그대로면 저장된 값 재사용)"""
+        stat = os.stat(path)
+        abs_path = os.path.abspath(path)
+        entry = self._hashes.get(abs_path)
+        if entry and entry["size"] == stat.st_size and entry["mtime_ns"] == stat.st_mtime_ns:
+            return entry["sha256"]
+
+        digest = file_sha256(path)
+        with self._lock:
+            self._hashes[abs_path] = {"size": stat.st_size, "mtime_ns": stat.st_mtime_ns, "sha256": digest}
+            tmp_path = os.path.join(self.cache_dir, _INDEX_FILE + ".tmp")
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(self._hashes, f)
+            os.replace(tmp_path, os.path.join(self.cache_dir, _INDEX_FILE))
+        return digest
+
+    def _key(self, digest: str, read_kwargs: Dict[str, Any]) -> str:
+        """내용 해시 + read_csv 인자 + 포맷 버전 → 캐시 키"""
+        options = json.dumps(read_kwargs, sort_keys=True, default=str)
+        suffix = hashlib.sha256(f"{CACHE_VERSION}:{options}".encode()).hexdigest()[:12]
+        return f"{digest}_{suffix}"
+
+    def _entry_path(self, key: str) -> str:
+        return os.path.join(self.cache_dir, f"{key}.{self.fmt}")
+
+    # ---- 읽기 / 쓰기 ----
+
+    def _read_columnar(self, path: str) -> pd.DataFrame:
+        """컬럼 파일을 메모리 맵으로 읽기"""
+        if self.fmt == "feather":
+            from pyarrow import feather
+            return feather.read_table(path, memory_map=True).to_pandas(split_blocks=True)
+        return pd.read_parquet(path, memory_map=True)
+
+    def _write_columnar(self, df: pd.DataFrame, path: str):
+        """임시 파일에 쓴 뒤 교체 (쓰는 도중 다른 세션이 깨진 파일을 읽지 않도록)"""
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        try:
+            if self.fmt == "feather":
+                df.to_feather(tmp_path, compression="uncompressed")
+            else:
+                df.to_parquet(tmp_path, index=False)
+            os.replace(tmp_path, path)
+        finally:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+
+    def _load(self, digest: str, source: Union[str, io.BytesIO], read_kwargs: Dict[str, Any]) -> pd.DataFrame:
+        path = self._entry_path(self._key(digest, read_kwargs))
+        if os.path.exists(path):
+            try:
+                df = self._read_columnar(path)
+                os.utime(path)  # LRU 순서 갱신
+                self.stats["hits"] += 1
+                return df
+            except Exception:
+                # 깨진 캐시 파일은 지우고 다시 생성
+                os.remove(path)
+
+        self.stats["misses"] += 1
+        df = pd.read_csv(source, **read_kwargs)
+        try:
+            self._write_columnar(df, path)
+        except Exception:
+            # 혼합 타입 object 컬럼 등 컬럼 포맷으로 저장할 수 없는 데이터는 캐시하지 않음
+            self.stats["uncacheable"] += 1
+            return df
+        self._evict(keep=path)
+        return df
+
+    def read_csv(self, path: str, **read_kwargs) -> pd.DataFrame:
+        """
+        디스크의 CSV 로드 (캐시에 있으면 파싱 없이)
+
+        Args:
+            path: CSV 파일 경로
+            **read_kwargs: pd.read_csv 추가 인자 (캐시 키에 포함)
+        """
+        if not self.enabled:
+            return pd.read_csv(path, **read_kwargs)
+        return self._load(self._file_digest(path), path, read_kwargs)
+
+    def read_csv_bytes(self, data: bytes, **read_kwargs) -> pd.DataFrame:
+        """메모리에 있는 CSV 바이트 로드 (업로드 파일 등)"""
+        if not self.enabled:
+            return pd.read_csv(io.BytesIO(data), **read_kwargs)
+        digest = hashlib.sha256(data).hexdigest()
+        return self._load(digest, io.BytesIO(data), read_kwargs)
+
+    # ---- 정리 ----
+
+    def _entries(self):
+        """(경로, 크기, mtime) 목록 (오래된 순)"""
+        entries = []
+        for name in os.listdir(self.cache_dir):
+            if not name.endswith(f".{self.fmt}"):
+                continue
+            path = os.path.join(self.cache_dir, name)
+            try:
+                stat = os.stat(path)
+            except OSError:
+                continue
+            entries.append((path, stat.st_size, stat.st_mtime))
+        return sorted(entries, key=lambda entry: entry[2])
+
+    def size(self) -> int:
+        """캐시 디렉토리의 컬럼 파일 크기 합계 (bytes)"""
+        return sum(size for _, size, _ in self._entries())
+
+    def _evict(self, keep: Optional[str] = None):
+        """크기 합계가 상한 이하가 될 때까지 오래 안 쓴 파일 삭제 (방금 쓴 파일은 유지)"""
+        with self._lock:
+            entries = self._entries()
+            total = sum(size for _, size, _ in entries)
+            for path, size, _ in entries:
+                if total <= self.max_size:
+                    break
+                if path == keep:
+                    continue
+                try:
+                    os.remove(path)
+                except OSError:
+                    continue
+                total -= size
+                self.stats["evictions"] += 1
+
+    def clear(self):
+        """캐시 파일 전부 삭제"""
+        for path, _, _ in self._entries():
+            os.remove(path)
+
+    def report(self) -> Dict[str, Any]:
+        """적중/미스/삭제 횟수와 캐시 크기"""
+        return {
+            **self.stats,
+            "enabled": self.enabled,
+            "entries": len(self._entries()),
+            "size_mb": round(self.size() / (1024 * 1024), 2),
+            "max_size_mb": round(self.max_size / (1024 * 1024), 2),
+        }
+
+# %% 2. 편의 함수
+
+_default_cache: Optional[ColumnarCache] = None
+
+
+def get_default_cache() -> ColumnarCache:
+    """모듈 기본 캐시 (.columnar_cache, 처음 호출할 때 생성)"""
+    global _default_cache
+    if _default_cache is None:
+        _default_cache = ColumnarCache()
+    return _default_cache
+
+
+def read_csv_cached(source: Any, cache: Optional[ColumnarCache] = None, **read_kwargs) -> pd.DataFrame:
+    """
+    pd.read_csv 대신 사용하는 캐시 로더
+
+    Args:
+        source: CSV 경로, bytes, 또는 getvalue()/read()가 있는 파일 객체 (Streamlit UploadedFile)
+        cache: 사용할 캐시 (없으면 기본 캐시)
+        **read_kwargs: pd.read_csv 추가 인자
+    """
+    cache = cache or get_default_cache()
+    if isinstance(source, (str, os.PathLike)):
+        return cache.read_csv(os.fspath(source), **read_kwargs)
+    if isinstance(source, bytes):
+        return cache.read_csv_bytes(source, **read_kwargs)
+    if hasattr(source, "getvalue"):
+        return cache.read_csv_bytes(source.getvalue(), **read_kwargs)
+    return cache.read_csv_bytes(source.read(), **read_kwargs)
@@ -0,0 +1,265 @@
+# %% 0. 파일 헤더 및 설명
+"""
+데이터셋 프로파일 인덱스 (디스크 캐시)
+
+Agent를 만들 때마다 dtypes, 결측치, 타입 요약을 다시 계산하고,
+LLM이 처음 몇 번의 반복을 shape/분포/상관관계 확인에 쓰는 것을 줄이기 위한 모듈입니다.
+
+- 데이터셋 파일마다 한 번만 프로파일을 계산 (컬럼 통계, 카디널리티, 분위수, 상위 값, 결측 비율, 상관행렬)
+- 파일 내용 해시(sha256) + 프로파일 버전 + top_k + dtype 서명을 키로 JSON 파일에 캐시
+  → 다음 실행부터는 밀리초 단위로 로드 (dtype 압축한 DataFrame을 넘기면 그 dtype 그대로 프로파일)
+- summarize_profile()로 글자 수 예산에 맞춘 요약을 첫 메시지에 넣어 사용
+
+사용법:
+    from data_profile import load_or_build_profile, summarize_profile
+
+    profile = load_or_build_profile("data/sample_ecommerce.csv")
+    print(summarize_profile(profile, max_chars=1500))
+"""
+
+import os
+import json
+import hashlib
+from typing import Any, Dict, List, Optional
+
+import pandas as pd
+import numpy as np
+
+PROFILE_VERSION = 1
+DEFAULT_CACHE_DIR = ".profile_cache"
+
+# %% 1. 파일 해시
+
+def file_sha256(path: str, block_size: int = 1 << 20) -> str:
+    """파일 내용을 블록 단위로 읽어 sha256 해시 계산 (메모리 사용 일정)"""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(block_size), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+# %% 2. 프로파일 생성
+
+def _to_number(value: Any) -> Optional[float]:
+    """numpy 스칼라를 JSON 저장 가능한 float로 변환 (NaN은 None)"""
+    if value is None or pd.isna(value):
+        return None
+    return round(float(value), 4)
+
+
+def build_profile(df: pd.DataFrame, top_k: int = 5) -> Dict[str, Any]:
+    """
+    DataFrame 한 번 순회로 컬럼별 프로파일 생성
+
+    Args:
+        df: 프로파일을 만들 DataFrame
+        top_k: 범주형 컬럼에서 저장할 상위 값 개수
+
+    Returns:
+        JSON 직렬화 가능한 프로파일 딕셔너리
+    """
+    num_rows = len(df)
+    columns = {}
+
+    for col in df.columns:
+        series = df[col]
+        null_count = int(series.isnull().sum())
+        info = {
+            "dtype": str(series.dtype),
+            "null_ratio": round(null_count / num_rows, 4) if num_rows else 0.0,
+            "n_unique": int(series.nunique(dropna=True)),
+        }
+
+        if pd.api.types.is_bool_dtype(series) or not pd.api.types.is_numeric_dtype(series):
+            if pd.api.types.is_datetime64_any_dtype(series):
+                info["kind"] = "datetime"
+                info["min"] = str(series.min())
+                info["max"] = str(series.max())
+            else:
+                info["kind"] = "categorical"
+                counts = series.value_counts(dropna=True).head(top_k)
+                info["top_values"] = [[str(value), int(count)] for value, count in counts.items()]
+        else:
+            info["kind"] = "numeric"
+            quantiles = series.quantile([0.25, 0.5, 0.75])
+            info.update({
+                "mean": _to_number(series.mean()),
+                "std": _to_number(series.std()),
+                "min": _to_number(series.min()),
+                "max": _to_number(series.max()),
+                "quantiles": {
+                    "25%": _to_number(quantiles.loc[0.25]),
+                    "50%": _to_number(quantiles.loc[0.5]),
+                    "75%": _to_number(quantiles.loc[0.75]),
+                },
+            })
+
+        columns[str(col)] = info
+
+    # 수치형 컬럼 간 상관행렬
+    numeric_df = df.select_dtypes(include=[np.number])
+    correlations = {}
+    if numeric_df.shape[1] >= 2:
+        corr = numeric_df.corr()
+        for row in corr.index:
+            correlations[str(row)] = {
+                str(other): _to_number(corr.loc[row, other]) for other in corr.columns
+            }
+
+    return {
+        "version": PROFILE_VERSION,
+        "top_k": top_k,
+        "num_rows": num_rows,
+        "num_columns": len(df.columns),
+        "columns": columns,
+        "correlations": correlations,
+    }
+
+
+# %% 3. 디스크 캐시 (내용 해시 키)
+
+def dtype_signature(df: pd.DataFrame) -> str:
+    """행 수 + 컬럼 이름/dtype 해시 (dtype 압축 여부나 필터링이 달라지면 다른 값)"""
+    spec = f"{len(df)}|" + "|".join(f"{col}:{dtype}" for col, dtype in df.dtypes.items())
+    return hashlib.sha1(spec.encode("utf-8")).hexdigest()[:8]
+
+
+def load_or_build_profile(
+    path: str,
+    df: Optional[pd.DataFrame] = None,
+    cache_dir: Optional[str] = None,
+    top_k: int = 5,
+) -> Dict[str, Any]:
+    """
+    캐시된 프로파일을 로드하거나, 없으면 생성 후 저장
+
+    캐시 키는 파일 해시 + 프로파일 버전 + top_k + 프레임 서명(행 수/dtype)이라,
+    compact_dtypes()를 거친 DataFrame과 원본 CSV의 프로파일은 따로 저장됩니다.
+
+    Args:
+        path: 데이터셋 파일 경로 (CSV 등)
+        df: Agent가 실제로 쓰는 DataFrame (있으면 파일을 다시 읽지 않고 이 dtype 그대로 프로파일 생성)
+        cache_dir: 캐시 디렉토리 (기본: 데이터 파일 옆 .profile_cache)
+        top_k: 범주형 상위 값 개수
+
+    Returns:
+        프로파일 딕셔너리 (source, sha256 포함)
+    """
+    if cache_dir is None:
+        cache_dir = os.path.join(os.path.dirname(os.path.abspath(path)), DEFAULT_CACHE_DIR)
+
+    sha = file_sha256(path)
+    signature = dtype_signature(df) if df is not None else "raw"
+    cache_path = os.path.join(cache_dir, f"{sha[:16]}-v{PROFILE_VERSION}-k{top_k}-{signature}.json")
+
+    if os.path.exists(cache_path):
+        with open(cache_path, "r", encoding="utf-8") as f:
+            profile = json.load(f)
+        if profile.get("version") == PROFILE_VERSION and profile.get("sha256") == sha \
+                and profile.get("top_k") == top_k and (df is None or _same_dtypes(profile, df)):
+            return profile
+
+    if df is None:
+        df = pd.read_csv(path)
+
+    profile = build_profile(df, top_k=top_k)
+    profile["source"] = os.path.basename(path)
+    profile["sha256"] = sha
+
+    os.makedirs(cache_dir, exist_ok=True)
+    tmp_path = cache_path + ".tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(profile, f, ensure_ascii=False)
+    os.replace(tmp_path, cache_path)
+
+    return profile
+
+
+def _same_dtypes(profile: Dict[str, Any], df: pd.DataFrame) -> bool:
+    """캐시된 프로파일의 dtype이 지금 DataFrame과 같은지 (dtype 압축 여부가 바뀌면 다시 생성)"""
+    columns = profile.get("columns", {})
+    return list(columns) == [str(col) for col in df.columns] and all(
+        columns[str(col)]["dtype"] == str(dtype) for col, dtype in df.dtypes.items()
+    )
+
+
+# %% 4. 예산 기반 요약 (첫 메시지용)
+
+def _top_correlations(profile: Dict[str, Any], limit: int = 5, threshold: float = 0.3) -> List[str]:
+    """절댓값이 큰 상관관계 쌍을 문자열 목록으로 반환"""
+    pairs = []
+    correlations = profile.get("correlations", {})
+    cols = list(correlations.keys())
+    for i, a in enumerate(cols):
+        for b in cols[i + 1:]:
+            r = correlations[a].get(b)
+            if r is not None and abs(r) >= threshold:
+                pairs.append((abs(r), f"{a}~{b}: {r:+.2f}"))
+    pairs.sort(reverse=True)
+    return [text for _, text in pairs[:limit]]
+
+
+def _column_line(name: str, info: Dict[str, Any], include_values: bool) -> str:
+    """컬럼 하나를 한 줄 요약으로 변환"""
+    line = f"  - {name} ({info['dtype']}, 고유값 {info['n_unique']}"
+    if info["null_ratio"] > 0:
+        line += f", 결측 {info['null_ratio']:.1%}"
+    line += ")"
+
+    if not include_values:
+        return line
+
+    if info["kind"] == "numeric":
+        q = info["quantiles"]
+        line += (
+            f": 평균 {info['mean']}, 표준편차 {info['std']}, "
+            f"최소 {info['min']}, 25% {q['25%']}, 50% {q['50%']}, 75% {q['75%']}, 최대 {info['max']}"
+        )
+    elif info["kind"] == "categorical":
+        top = ", ".join(f"{value}({count})" for value, count in info["top_values"])
+        line += f": 상위 값 {top}"
+    elif info["kind"] == "datetime":
+        line += f": {info['min']} ~ {info['max']}"
+    return line
+
+
+def summarize_profile(
+    profile: Dict[str, Any],
+    max_chars: int = 1500,
+    include_values: bool = True,
+) -> str:
+    """
+    프로파일을 글자 수 예산 안에서 요약
+
+    Args:
+        profile: load_or_build_profile()/build_profile() 결과
+        max_chars: 요약 최대 글자 수
+        include_values: False면 값/분포 정보 없이 스키마 메타정보만 (보안 프롬프트용)
+
+    Returns:
+        프롬프트에 넣을 요약 문자열
+    """
+    lines = [
+        f"- Shape: {profile['num_rows']}행 x {profile['num_columns']}컬럼",
+        "- 컬럼 프로파일:",
+    ]
+    used = sum(len(line) + 1 for line in lines)
+
+    columns = list(profile["columns"].items())
+    for idx, (name, info) in enumerate(columns):
+        line = _column_line(name, info, include_values)
+        if used + len(line) + 1 > max_chars:
+            lines.append(f"  ... ({len(columns) - idx}개 컬럼 생략)")
+            return "\n".join(lines)
+        lines.append(line)
+        used += len(line) + 1
+
+    if include_values:
+        corr_pairs = _top_correlations(profile)
+        if corr_pairs:
+            line = f"- 주요 상관관계: {', '.join(corr_pairs)}"
+            if used + len(line) + 1 <= max_chars:
+                lines.append(line)
+
+    return "\n".join(lines)
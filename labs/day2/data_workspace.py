@@ -0,0 +1,248 @@
+# %% 0. 파일 헤더 및 설명
+"""
+여러 데이터셋을 이름으로 다루는 지연 로딩 워크스페이스
+
+Agent는 df 하나만 받기 때문에 sample_hr.csv와 sample_ecommerce.csv를 함께 묻는 질문을 할 수 없고,
+파일을 전부 미리 읽어 두면 메모리가 낭비됩니다. 이 모듈은
+
+- 데이터셋을 이름으로 등록만 해 두고 (파일은 읽지 않음)
+- 생성된 코드가 그 이름을 실제로 참조할 때(AST로 확인) 처음 로드
+- 로드된 DataFrame은 메모리 예산 안에서 LRU로 유지 (넘으면 오래 안 쓴 것부터 해제)
+- 시스템 프롬프트에는 스키마(컬럼/타입)만 표시 (로드 전에는 앞 몇 행의 원본 타입으로 추정하고 "추정"으로 표시)
+
+를 제공합니다.
+
+사용법:
+    from data_workspace import DataWorkspace
+
+    workspace = DataWorkspace(memory_budget_mb=256)
+    workspace.register_directory("data")          # sample_hr, sample_ecommerce, ...
+    print(workspace.schema_summary())
+    agent = EDAAgent(chat_model, workspace=workspace)
+    # 코드: sample_hr.groupby("department")["salary"].mean()
+"""
+
+import os
+import re
+import ast
+import glob
+import keyword
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional
+
+import pandas as pd
+
+from dtype_compaction import compact_dtypes
+
+# 코드 실행 환경에서 이미 쓰는 이름 (데이터셋 이름으로 사용 불가)
+RESERVED_NAMES = {"pd", "np", "df", "result", "print"}
+
+# 스키마 추정에 읽을 행 수
+SCHEMA_SAMPLE_ROWS = 200
+
+# %% 1. 워크스페이스
+
+class DataWorkspace:
+    """
+    이름 → 데이터셋 파일 등록부 + 로드된 DataFrame LRU 캐시
+
+    여러 스레드(멀티 액션, 병렬 브랜치)에서 동시에 써도 같은 파일을 두 번 읽지 않도록 잠금을 사용합니다.
+    """
+
+    def __init__(self, memory_budget_mb: float = 256.0, compact: bool = True):
+        """
+        Args:
+            memory_budget_mb: 로드된 DataFrame들의 메모리 합계 상한 (MB, deep 기준)
+            compact: True면 로드할 때 dtype 압축 (category, datetime64 등)
+        """
+        self.memory_budget = int(memory_budget_mb * 1024 * 1024)
+        self.compact = compact
+        self.datasets: Dict[str, Dict[str, Any]] = {}
+        self._frames: "OrderedDict[str, pd.DataFrame]" = OrderedDict()
+        self._sizes: Dict[str, int] = {}
+        self._schemas: Dict[str, Dict[str, str]] = {}
+        self._lock = threading.RLock()
+        self.stats = {"loads": 0, "hits": 0, "evictions": 0}
+
+    # ---- 등록 ----
+
+    def register(self, name: str, path: str, **read_kwargs) -> str:
+        """
+        데이터셋 등록 (파일은 읽지 않음)
+
+        Args:
+            name: 코드에서 쓸 변수 이름 (예: sample_hr)
+            path: CSV 또는 Parquet 파일 경로
+            **read_kwargs: pd.read_csv / pd.read_parquet 추가 인자
+
+        Returns:
+            등록된 이름
+        """
+        if not name.isidentifier() or keyword.iskeyword(name) or name in RESERVED_NAMES:
+            raise ValueError(f"데이터셋 이름으로 쓸 수 없습니다: {name!r}")
+        if not os.path.exists(path):
+            raise FileNotFoundError(path)
+        with self._lock:
+            self.datasets[name] = {"path": path, "read_kwargs": read_kwargs}
+            self._drop(name)
+            self._schemas.pop(name, None)
+        return name
+
+    def register_directory(self, directory: str, pattern: str = "*.csv") -> List[str]:
+        """
+        디렉토리의 파일을 모두 등록 (이름은 파일명에서 확장자를 뺀 것, 변수명으로 쓸 수 없는 문자는 _)
+
+        Returns:
+            등록된 이름 목록
+        """
+        names = []
+        for path in sorted(glob.glob(os.path.join(directory, pattern))):
+            stem = os.path.splitext(os.path.basename(path))[0]
+            name = re.sub(r"\W", "_", stem)
+            if name[0].isdigit():
+                name = f"data_{name}"
+            names.append(self.register(name, path))
+        return names
+
+    @property
+    def names(self) -> List[str]:
+        return list(self.datasets)
+
+    # ---- 참조 감지 ----
+
+    def referenced(self, code: str) -> List[str]:
+        """코드에서 읽기로 참조하는 데이터셋 이름 (AST 기준, 문법 오류면 단어 매칭)"""
+        try:
+            tree = ast.parse(code)
+        except SyntaxError:
+            words = set(re.findall(r"\b\w+\b", code))
+            return [name for name in self.datasets if name in words]
+        used = {
+            node.id for node in ast.walk(tree)
+            if isinstance(node, ast.Name) and isinstance(node.ctx, ast.Load)
+        }
+        return [name for name in self.datasets if name in used]
+
+    def namespace(self, code: str) -> Dict[str, pd.DataFrame]:
+        """코드 실행 globals에 넣을 {이름: DataFrame} (참조된 데이터셋만 로드)"""
+        names = self.referenced(code)
+        return {name: self.load(name, pinned=names) for name in names}
+
+    # ---- 로드 / LRU ----
+
+    def load(self, name: str, pinned: Optional[List[str]] = None) -> pd.DataFrame:
+        """
+        데이터셋 DataFrame 반환 (처음이면 파일에서 로드, 예산 초과 시 LRU 해제)
+
+        Args:
+            name: 데이터셋 이름
+            pinned: 해제하면 안 되는 이름 (같은 코드에서 함께 쓰는 데이터셋)
+        """
+        if name not in self.datasets:
+            raise KeyError(f"등록되지 않은 데이터셋: {name} (등록: {', '.join(self.datasets)})")
+        with self._lock:
+            if name in self._frames:
+                self._frames.move_to_end(name)
+                self.stats["hits"] += 1
+                return self._frames[name]
+
+            frame = self._read(name)
+            self._frames[name] = frame
+            self._sizes[name] = int(frame.memory_usage(deep=True).sum())
+            self.stats["loads"] += 1
+            self._evict(keep=set(pinned or []) | {name})
+            return frame
+
+    def _read(self, name: str) -> pd.DataFrame:
+        info = self.datasets[name]
+        path = info["path"]
+        if path.endswith((".parquet", ".pq")):
+            frame = pd.read_parquet(path, **info["read_kwargs"])
+        else:
+            frame = pd.read_csv(path, **info["read_kwargs"])
+        return compact_dtypes(frame)[0] if self.compact else frame
+
+    def _evict(self, keep: set):
+        """메모리 합계가 예산 이하가 될 때까지 오래 안 쓴 DataFrame 해제"""
+        for name in list(self._frames):
+            if self.memory_usage() <= self.memory_budget:
+                break
+            if name not in keep:
+                self._drop(name)
+                self.stats["evictions"] += 1
+
+    def _drop(self, name: str):
+        self._frames.pop(name, None)
+        self._sizes.pop(name, None)
+
+    def memory_usage(self) -> int:
+        """로드된 DataFrame 메모리 합계 (bytes)"""
+        return sum(self._sizes.values())
+
+    def loaded(self) -> List[str]:
+        """현재 메모리에 있는 데이터셋 (오래된 순)"""
+        return list(self._frames)
+
+    # ---- 스키마 요약 (프롬프트용) ----
+
+    def schema(self, name: str) -> Dict[str, str]:
+        """
+        컬럼 → dtype (로드되어 있으면 그대로, 아니면 앞부분 행만 읽어 추정)
+
+        추정 스키마에는 dtype 압축을 적용하지 않습니다. 앞 SCHEMA_SAMPLE_ROWS행만으로는 category 여부(고유값 비율)를
+        전체 로드와 같게 판단할 수 없으므로, 틀린 압축 타입 대신 원본 타입을 보여주고 schema_summary에서 추정임을 표시합니다.
+        """
+        with self._lock:
+            if name in self._frames:
+                return {col: str(dtype) for col, dtype in self._frames[name].dtypes.items()}
+            if name not in self._schemas:
+                info = self.datasets[name]
+                path = info["path"]
+                if path.endswith((".parquet", ".pq")):
+                    import pyarrow.parquet as pq
+                    arrow_schema = pq.read_schema(path)
+                    self._schemas[name] = {field.name: str(field.type) for field in arrow_schema}
+                else:
+                    head = pd.read_csv(path, nrows=SCHEMA_SAMPLE_ROWS, **info["read_kwargs"])
+                    self._schemas[name] = {col: str(dtype) for col, dtype in head.dtypes.items()}
+            return self._schemas[name]
+
+    def schema_summary(self, max_chars: int = 2000) -> str:
+        """
+        등록된 데이터셋의 스키마 요약 (실제 값 없이 이름, 파일 크기, 컬럼/타입만)
+
+        Args:
+            max_chars: 최대 글자 수 (넘으면 뒤쪽 데이터셋은 이름만 표시)
+        """
+        lines = [
+            "**사용 가능한 데이터셋** (변수 이름으로 바로 사용, 참조할 때 자동 로드):",
+        ]
+        if self.compact:
+            lines.append("(추정: 로드 전 원본 타입. 로드하면 문자열/날짜 컬럼이 category/datetime으로 바뀔 수 있음)")
+        omitted = []
+        for name, info in self.datasets.items():
+            size_mb = os.path.getsize(info["path"]) / (1024 * 1024)
+            with self._lock:
+                estimated = name not in self._frames
+                schema = self.schema(name)
+            columns = ", ".join(f"{col}({dtype})" for col, dtype in schema.items())
+            label = ", 추정" if estimated else ""
+            line = f"- {name} [{os.path.basename(info['path'])}, {size_mb:.1f}MB{label}]: {columns}"
+            if sum(len(l) + 1 for l in lines) + len(line) > max_chars:
+                omitted.append(name)
+                continue
+            lines.append(line)
+        if omitted:
+            lines.append(f"- (스키마 생략) {', '.join(omitted)}")
+        return "\n".join(lines)
+
+    def report(self) -> Dict[str, Any]:
+        """로드/적중/해제 횟수와 현재 메모리 사용량"""
+        return {
+            **self.stats,
+            "registered": len(self.datasets),
+            "loaded": self.loaded(),
+            "memory_mb": round(self.memory_usage() / (1024 * 1024), 2),
+            "budget_mb": round(self.memory_budget / (1024 * 1024), 2),
+        }
@@ -0,0 +1,159 @@
+# %% 0. 파일 헤더 및 설명
+"""
+로드 직후 dtype 압축 + 메모리 리포트
+
+CSV를 그대로 읽으면 region, gender 같은 저카디널리티 문자열은 object, age 같은 작은 정수는 int64,
+signup_date 같은 날짜 문자열은 object로 잡혀 메모리를 몇 배 더 쓰고 groupby도 느려집니다.
+이 모듈은 로드 직후 한 번
+
+- 저카디널리티 문자열 → category
+- 그 외 문자열 → string[pyarrow] (pyarrow가 없으면 object 유지)
+- 날짜 형식 문자열 → datetime64
+- (선택, downcast_integers=True) 정수 → 값 범위에 맞는 가장 작은 정수 타입 (int8/int16/...)
+
+로 바꾸고, 컬럼별 전/후 메모리 리포트를 만듭니다. 정수와 실수는 기본적으로 그대로 둡니다.
+int8로 줄인 age에 `df['age'] * 2` 같은 연산을 하면 조용히 오버플로되므로, Agent가 만든 코드를
+실행할 DataFrame에는 정수 축소를 켜지 마세요 (결과 수치가 압축 전과 같아야 함).
+category 컬럼으로 groupby하면 필터 후 비어 있는 범주도 0으로 표시될 수 있습니다 (observed=False).
+
+사용법:
+    from dtype_compaction import compact_dtypes, print_memory_report
+
+    df, report = compact_dtypes(pd.read_csv("sample_ecommerce.csv"))
+    print_memory_report(report)
+"""
+
+import re
+import importlib.util
+from typing import Optional, Tuple
+
+import pandas as pd
+
+# 고유값 비율이 이 이하인 문자열 컬럼은 category로 변환
+DEFAULT_CATEGORY_RATIO = 0.5
+
+# 날짜 형식 판별에 쓰는 값 개수
+DATE_SAMPLE_SIZE = 200
+
+# YYYY-MM-DD, YYYY/MM/DD, YYYY.MM.DD (뒤에 시각 허용)
+DATE_PATTERN = re.compile(r"^\d{4}[-/.]\d{1,2}[-/.]\d{1,2}([ T]\d{1,2}:\d{2}(:\d{2})?)?$")
+
+# %% 1. 컬럼 변환
+
+def _string_dtype():
+    """pyarrow 문자열 dtype (pyarrow가 없으면 None)"""
+    if importlib.util.find_spec("pyarrow") is None:
+        return None
+    return pd.StringDtype("pyarrow")
+
+
+def _looks_like_date(series: pd.Series) -> bool:
+    """값 앞부분이 모두 날짜 형식인지"""
+    sample = series.dropna().astype(str).head(DATE_SAMPLE_SIZE)
+    return len(sample) > 0 and bool(sample.str.match(DATE_PATTERN).all())
+
+
+def compact_column(
+    series: pd.Series,
+    category_ratio: float = DEFAULT_CATEGORY_RATIO,
+    string_dtype=None,
+    downcast_integers: bool = False,
+) -> pd.Series:
+    """
+    컬럼 하나를 더 작은 dtype으로 변환 (변환할 수 없으면 그대로)
+
+    Args:
+        series: 변환할 컬럼
+        category_ratio: 고유값 수 / 행 수가 이 이하이면 category
+        string_dtype: 고카디널리티 문자열에 쓸 dtype (None이면 object 유지)
+        downcast_integers: True면 정수를 가장 작은 정수 타입으로 (산술 연산 시 오버플로 주의)
+    """
+    if pd.api.types.is_bool_dtype(series):
+        return series
+    if pd.api.types.is_integer_dtype(series):
+        return pd.to_numeric(series, downcast="integer") if downcast_integers else series
+    # 문자열 컬럼만 (pandas 2의 object, pandas 3의 기본 str dtype)
+    if not (series.dtype == object or pd.api.types.is_string_dtype(series)):
+        return series
+
+    if _looks_like_date(series):
+        converted = pd.to_datetime(series, errors="coerce")
+        # 형식이 맞지 않는 값이 섞여 있으면 (결측치가 새로 생기면) 변환하지 않음
+        if converted.isna().sum() == series.isna().sum():
+            return converted
+
+    values = series.dropna()
+    if not values.map(type).eq(str).all():
+        # 숫자/문자 혼합 컬럼은 그대로
+        return series
+    if len(series) and series.nunique(dropna=True) / len(series) <= category_ratio:
+        return series.astype("category")
+    if string_dtype is not None:
+        return series.astype(string_dtype)
+    return series
+
+
+def compact_dtypes(
+    df: pd.DataFrame,
+    category_ratio: float = DEFAULT_CATEGORY_RATIO,
+    use_pyarrow_strings: bool = True,
+    downcast_integers: bool = False,
+) -> Tuple[pd.DataFrame, pd.DataFrame]:
+    """
+    DataFrame 전체 dtype 압축
+
+    Args:
+        df: 원본 DataFrame (수정하지 않음)
+        category_ratio: category 변환 기준 고유값 비율
+        use_pyarrow_strings: 고카디널리티 문자열을 string[pyarrow]로 변환할지
+        downcast_integers: 정수를 int8/int16 등으로 줄일지 (기본 False: 코드 실행 결과가 바뀌지 않도록)
+
+    Returns:
+        (압축된 DataFrame, memory_report() 결과)
+    """
+    string_dtype = _string_dtype() if use_pyarrow_strings else None
+    compacted = pd.DataFrame(
+        {col: compact_column(df[col], category_ratio, string_dtype, downcast_integers) for col in df.columns},
+        index=df.index,
+    )
+    return compacted, memory_report(df, compacted)
+
+# %% 2. 메모리 리포트
+
+def memory_report(before: pd.DataFrame, after: pd.DataFrame) -> pd.DataFrame:
+    """컬럼별 전/후 dtype과 메모리(deep, bytes) 표 (마지막 행은 합계)"""
+    before_bytes = before.memory_usage(deep=True, index=False)
+    after_bytes = after.memory_usage(deep=True, index=False)
+    report = pd.DataFrame({
+        "before_dtype": before.dtypes.astype(str),
+        "after_dtype": after.dtypes.astype(str),
+        "before_bytes": before_bytes,
+        "after_bytes": after_bytes,
+    })
+    report.loc["(합계)"] = ["", "", int(before_bytes.sum()), int(after_bytes.sum())]
+    return report
+
+
+def print_memory_report(report: pd.DataFrame, top: Optional[int] = None):
+    """
+    메모리 리포트 출력 (바뀐 컬럼만, 절감량 큰 순)
+
+    Args:
+        report: memory_report() 결과
+        top: 표시할 최대 컬럼 수 (None이면 전부)
+    """
+    total = report.loc["(합계)"]
+    columns = report.drop(index="(합계)")
+    changed = columns[columns["before_dtype"] != columns["after_dtype"]]
+    changed = changed.assign(saved=changed["before_bytes"] - changed["after_bytes"])
+    changed = changed.sort_values("saved", ascending=False)
+    if top is not None:
+        changed = changed.head(top)
+
+    before_mb = total["before_bytes"] / (1024 * 1024)
+    after_mb = total["after_bytes"] / (1024 * 1024)
+    ratio = total["before_bytes"] / total["after_bytes"] if total["after_bytes"] else float("inf")
+    print(f"🗜️ 메모리: {before_mb:.2f}MB → {after_mb:.2f}MB ({ratio:.1f}배 감소)")
+    for col, row in changed.iterrows():
+        print(f"   - {col}: {row['before_dtype']} → {row['after_dtype']} "
+              f"({row['before_bytes'] / 1024:.1f}KB → {row['after_bytes'] / 1024:.1f}KB)")
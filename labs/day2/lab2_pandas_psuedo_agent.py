@@ -13,10 +13,18 @@
 import pandas as pd
 import numpy as np
 import re
-from typing import Optional
+import time
+import difflib
+import textwrap
+from typing import Any, Dict, List, Optional, Tuple
+from concurrent.futures import ThreadPoolExecutor
 
 from langchain_core.messages import HumanMessage, AIMessage, SystemMessage
-from potens_wrapper import PotensChatModel
+from potens_wrapper import PotensChatModel, REACT_STOP
+from observation_encoder import encode_observation
+from agent_profiler import RunProfiler
+from react_parser import parse_react
+from dtype_compaction import compact_dtypes, print_memory_report
 
 # %% [markdown]
 # # Part 1: ReAct 패턴 이해하기
@@ -46,6 +54,10 @@ df = pd.DataFrame({
 df.loc[df['membership_level'] == 'Platinum', 'total_amount'] *= 2
 df.loc[df['city'] == '서울', 'purchase_count'] += 2
 
+# dtype 압축 (gender/city/membership_level → category, 정수는 int64 유지)
+df, memory = compact_dtypes(df)
+print_memory_report(memory)
+
 print("\n✅ 샘플 데이터 생성 완료")
 print(f"   - 행 수: {len(df)}")
 print(f"   - 컬럼: {', '.join(df.columns)}")
@@ -92,6 +104,47 @@ Final Answer: [사용자가 이해할 수 있는 형태로 답변]
 - 에러 가능성 최소화
 """
 
+# 멀티 액션 모드 (선택): 한 응답에 독립적인 코드 여러 개를 묶어서 제안
+MULTI_ACTION_RULES = """
+**멀티 액션 모드 (위의 1번 규칙 대신 적용):**
+- 서로 독립적인 계산은 한 번의 응답에 여러 개의 Action Input으로 묶어 제안하세요.
+- 각 코드는 ```python ... ``` 블록 하나에 작성하고, 결과는 각각 'result' 변수에 저장하세요.
+- 각 블록은 다른 블록의 결과에 의존하지 않아야 하며, df를 수정하면 안 됩니다.
+- 모든 결과는 [Action 1], [Action 2] ... 형태의 Observation 하나로 전달됩니다.
+"""
+
+# %% 2-2. 계획-실행 모드 프롬프트 (LLM 호출 2번으로 끝내기)
+
+PLAN_SCRIPT_PROMPT = """
+**계획-실행 모드:** Thought/Action을 여러 번 주고받지 말고,
+아래 질문에 답하는 데 필요한 분석 전체를 하나의 Python 스크립트로 작성하세요.
+
+**스크립트 규칙:**
+1. ```python ... ``` 블록 하나만 출력 (설명 문장 없이)
+2. 단계마다 중간 결과를 step_이름 변수에 저장 (예: step_platinum_avg = ...)
+3. 질문에 대한 최종 결과는 result 변수에 저장
+4. import 금지 (pd, np, df는 이미 준비되어 있음)
+5. df를 수정하지 말고, 필요하면 복사본 사용
+
+**질문:** {question}
+"""
+
+PLAN_ANSWER_PROMPT = """
+스크립트를 로컬에서 실행한 결과입니다.
+
+Observation:
+{observation}
+
+위 결과만을 근거로 질문에 답하세요. 반드시 "Final Answer: [답변]" 형식으로 작성하세요.
+"""
+
+# 자동 수정 시 추가로 허용할 수 있는 안전한 내장 함수
+AUTOFIX_BUILTINS = {
+    "abs": abs, "any": any, "all": all, "range": range, "enumerate": enumerate,
+    "sorted": sorted, "zip": zip, "map": map, "filter": filter, "set": set,
+    "tuple": tuple, "bool": bool, "isinstance": isinstance, "reversed": reversed,
+}
+
 print("="*80)
 print("📝 Part 2: ReAct 시스템 프롬프트 정의")
 print("="*80)
@@ -111,17 +164,31 @@ class PandasPseudoAgent:
     사람이 중간에 코드를 검증하고 실행하는 협업 방식
     """
     
-    def __init__(self, chat_model: PotensChatModel, df: pd.DataFrame):
+    def __init__(
+        self,
+        chat_model: PotensChatModel,
+        df: pd.DataFrame,
+        observation_budget: int = 400,
+        multi_action: bool = False,
+        executor: Optional[ThreadPoolExecutor] = None,
+        profiler: Optional[RunProfiler] = None,
+    ):
         self.chat_model = chat_model
         self.df = df
         self.messages = []
         self.execution_count = 0
+        self.observation_budget = observation_budget  # Observation 하나의 토큰 예산
+        self.multi_action = multi_action  # True면 한 응답의 여러 코드를 병렬 실행
+        self.executor = executor
+        self.profiler = profiler or RunProfiler(enabled=False)  # 반복별 시간 분해 기록
         
         # 데이터프레임 정보를 포함한 시스템 프롬프트
         system_prompt = PANDAS_AGENT_PROMPT.format(
-            columns=', '.join(df.columns),
+            columns=', '.join(f"{col}({dtype})" for col, dtype in df.dtypes.items()),
             num_rows=len(df)
         )
+        if multi_action:
+            system_prompt += MULTI_ACTION_RULES
         self.messages.append(SystemMessage(content=system_prompt))
     
     def run(self, question: str, max_iterations: int = 5, auto_execute: bool = False):
@@ -148,10 +215,11 @@ class PandasPseudoAgent:
             print(f"\n{'─'*80}")
             print(f"🔄 ITERATION {i+1}/{max_iterations}")
             print(f"{'─'*80}")
+            self.profiler.set_iteration(i + 1)
             
             # Agent에게 다음 행동 요청
             print("\n💭 Agent가 생각 중...")
-            response = self.chat_model.invoke(self.messages)
+            response = self._invoke_llm()
             
             # 응답 출력 (verbose=True 효과)
             print(f"\n🤖 Agent 응답:")
@@ -161,9 +229,13 @@ class PandasPseudoAgent:
             
             self.messages.append(response)
             
+            # 응답 파싱 (Thought / Action Input / Final Answer를 한 번에)
+            with self.profiler.span("extract"):
+                parsed = parse_react(response.content)
+            
             # Final Answer 확인
-            if "Final Answer:" in response.content:
-                final_answer = self._extract_final_answer(response.content)
+            if parsed.final_answer is not None:
+                final_answer = parsed.final_answer
                 print("\n" + "="*80)
                 print("✅ 분석 완료!")
                 print("="*80)
@@ -171,11 +243,15 @@ class PandasPseudoAgent:
                 print(f"\n📈 총 실행 횟수: {self.execution_count}회")
                 return final_answer
             
-            # Action Input 추출
-            code = self._extract_code(response.content)
-            if code:
-                # 코드 실행 (자동 또는 수동)
-                result = self._execute_code(code, auto_execute)
+            # Action Input (멀티 액션 모드면 여러 개)
+            codes = parsed.codes if self.multi_action else parsed.codes[:1]
+            
+            if codes:
+                # 코드 실행 (자동 또는 수동, 여러 개면 병렬 실행 후 Observation 하나로 결합)
+                if len(codes) > 1:
+                    result = self._execute_actions(codes, auto_execute)
+                else:
+                    result = self._execute_code(codes[0], auto_execute)
                 
                 if result is None:  # 사용자가 건너뛰기 선택
                     observation = "실행이 건너뛰어졌습니다. 다른 방법을 시도하세요."
@@ -197,43 +273,6 @@ class PandasPseudoAgent:
         print("\n⚠️  최대 반복 횟수 도달")
         return "최대 반복 횟수 초과"
     
-    def _extract_code(self, response_text: str) -> Optional[str]:
-        """Agent 응답에서 Action Input 코드 추출"""
-        
-        # 패턴 1: Action Input: 이후 코드
-        if "Action Input:" in response_text:
-            # Action Input 이후부터 추출
-            after_action = response_text.split("Action Input:")[1]
-            lines = after_action.split("\n")
-            
-            code_lines = []
-            in_code = False
-            
-            for line in lines:
-                # 빈 줄 이후 첫 줄부터 코드 시작
-                if not in_code and line.strip():
-                    in_code = True
-                
-                if in_code:
-                    # 종료 조건
-                    if line.strip() == "" or \
-                       line.startswith("Observation") or \
-                       line.startswith("Thought") or \
-                       line.startswith("Final Answer"):
-                        break
-                    code_lines.append(line)
-            
-            if code_lines:
-                return "\n".join(code_lines).strip()
-        
-        # 패턴 2: ```python 블록
-        pattern = r"```python\s*(.*?)\s*```"
-        matches = re.findall(pattern, response_text, re.DOTALL)
-        if matches:
-            return matches[0].strip()
-        
-        return None
-    
     def _execute_code(self, code: str, auto_execute: bool):
         """코드 실행 (자동 또는 수동)"""
         
@@ -256,24 +295,72 @@ class PandasPseudoAgent:
                 print("⏭️  실행 건너뜀")
                 return None
         
-        # 코드 실행
-        try:
-            print("\n⏳ 실행 중...")
+        print("\n⏳ 실행 중...")
+        result = self._run_code(code)
+        if not result.startswith("에러:"):
+            self.execution_count += 1
+            print(f"✅ 실행 성공! (총 {self.execution_count}회)")
+        return result
+    
+    def _execute_actions(self, codes: List[str], auto_execute: bool) -> Optional[str]:
+        """
+        여러 코드를 스레드 풀에서 병렬 실행하고 하나의 Observation으로 결합
+        
+        수동 모드에서는 전체 코드를 보여준 뒤 한 번만 확인합니다.
+        
+        Returns:
+            결합된 Observation (사용자가 건너뛰면 None)
+        """
+        print(f"\n{'='*60}")
+        print(f"🔧 실행 준비 (멀티 액션 {len(codes)}개)")
+        print(f"{'='*60}")
+        for idx, code in enumerate(codes, 1):
+            print(f"[Action {idx}]")
+            print("─" * 60)
+            print(code)
+            print("─" * 60)
+        
+        if not auto_execute:
+            choice = input("\n▶️  모두 실행하시겠습니까? (y: 실행, n: 건너뛰기, e: 종료): ").lower()
             
+            if choice == 'e':
+                print("🛑 Agent 종료")
+                exit()
+            elif choice != 'y':
+                print("⏭️  실행 건너뜀")
+                return None
+        
+        print("\n⏳ 병렬 실행 중...")
+        # Observation 전체가 예산을 넘지 않도록 코드별 예산 분배
+        budget = max(self.observation_budget // len(codes), 100)
+        if self.executor is None:
+            self.executor = ThreadPoolExecutor(max_workers=4)
+        
+        def timed_run(code: str, submitted: float) -> str:
+            # 스레드 풀 대기 시간 기록 후 실행
+            self.profiler.record("queue", submitted, time.perf_counter())
+            return self._run_code(code, budget)
+        
+        futures = [self.executor.submit(timed_run, code, time.perf_counter()) for code in codes]
+        results = [future.result() for future in futures]
+        
+        succeeded = sum(1 for r in results if not r.startswith("에러:"))
+        self.execution_count += succeeded
+        print(f"✅ {succeeded}/{len(codes)}개 실행 성공! (총 {self.execution_count}회)")
+        
+        return "\n\n".join(
+            f"[Action {idx}]\n{result}" for idx, result in enumerate(results, 1)
+        )
+    
+    def _run_code(self, code: str, observation_budget: Optional[int] = None) -> str:
+        """안전한 실행 환경에서 코드를 실행하고 Observation 문자열 반환"""
+        try:
             # 안전한 실행 환경
-            safe_globals = {
-                "pd": pd,
-                "np": np,
-                "df": self.df,
-                "__builtins__": {
-                    "len": len, "sum": sum, "max": max, "min": min,
-                    "round": round, "print": print, "str": str,
-                    "int": int, "float": float, "list": list, "dict": dict,
-                }
-            }
+            safe_globals = self._safe_globals()
             
             local_vars = {}
-            exec(code, safe_globals, local_vars)
+            with self.profiler.span("exec", measure=True):
+                exec(code, safe_globals, local_vars)
             
             # 결과 추출
             if "result" in local_vars:
@@ -283,26 +370,179 @@ class PandasPseudoAgent:
             else:
                 result = "실행 완료 (출력 없음)"
             
-            self.execution_count += 1
-            print(f"✅ 실행 성공! (총 {self.execution_count}회)")
-            
-            # DataFrame/Series는 요약
-            if isinstance(result, pd.DataFrame):
-                return f"DataFrame({result.shape[0]}행 x {result.shape[1]}컬럼)\n상위 3개 행:\n{result.head(3).to_string()}"
-            elif isinstance(result, pd.Series):
-                return f"Series(길이 {len(result)})\n상위 5개:\n{result.head(5).to_string()}"
-            else:
-                return result
+            # 타입별 간결 인코딩 (DataFrame/Series는 상위·하위 행을 예산만큼)
+            with self.profiler.span("encode"):
+                return encode_observation(result, max_tokens=observation_budget or self.observation_budget)
                 
         except Exception as e:
             print(f"❌ 에러 발생!")
             return f"에러: {str(e)}"
     
+    def _invoke_llm(self):
+        """LLM 호출 (Observation을 지어내기 시작하면 중단, 프로파일러에 대기 시간과 크기 기록)"""
+        prompt_chars = sum(len(message.content) for message in self.messages)
+        with self.profiler.span("llm", prompt_chars=prompt_chars) as span_args:
+            response = self.chat_model.invoke(self.messages, stop=REACT_STOP)
+            span_args["response_chars"] = len(response.content)
+        return response
+    
+    def _safe_globals(self) -> Dict[str, Any]:
+        """코드 실행용 globals (허용된 내장 함수만)"""
+        return {
+            "pd": pd,
+            "np": np,
+            "df": self.df,
+            "__builtins__": {
+                "len": len, "sum": sum, "max": max, "min": min,
+                "round": round, "print": print, "str": str,
+                "int": int, "float": float, "list": list, "dict": dict,
+            }
+        }
+    
+    def run_planned(self, question: str, max_fixes: int = 3, fallback_iterations: int = 5):
+        """
+        계획-실행 모드: LLM 호출 2번으로 답변
+        
+        1. 첫 호출로 분석 전체를 담은 스크립트 하나를 받음 (단계별 결과는 step_* 변수)
+        2. 로컬에서 한 번 실행 (import 제거, 컬럼명 오타 등 사소한 에러는 자동 수정)
+        3. 두 번째 호출로 실행 결과를 Final Answer 문장으로 정리
+        
+        스크립트가 자동 수정 후에도 실패하면 기존 ReAct 방식(run)으로 전환합니다.
+        
+        Args:
+            question: 사용자 질문
+            max_fixes: 자동 수정 최대 시도 횟수
+            fallback_iterations: ReAct 방식 전환 시 최대 반복 횟수
+        """
+        print("\n" + "="*80)
+        print("🤖 Pandas Pseudo-Agent 시작 (계획-실행 모드)")
+        print("="*80)
+        print(f"❓ 질문: {question}")
+        print("="*80)
+        
+        initial_length = len(self.messages)
+        
+        # 1. 스크립트 생성 (LLM 호출 1)
+        print("\n💭 분석 스크립트 생성 중...")
+        self.messages.append(HumanMessage(content=PLAN_SCRIPT_PROMPT.format(question=question)))
+        response = self._invoke_llm()
+        self.messages.append(response)
+        
+        script = self._extract_script(response.content)
+        print("\n📝 생성된 스크립트:")
+        print("─" * 60)
+        print(script)
+        print("─" * 60)
+        
+        # 2. 로컬 실행 (+ 사소한 에러 자동 수정)
+        namespace, script, error = self._exec_script(script, max_fixes)
+        if error:
+            print(f"\n❌ 스크립트 실행 실패: {error}")
+            print("↩️  ReAct 방식으로 전환합니다.")
+            del self.messages[initial_length:]
+            return self.run(question, max_iterations=fallback_iterations, auto_execute=True)
+        
+        self.execution_count += 1
+        observation = self._summarize_outputs(namespace)
+        print(f"\n📊 Observation:\n{observation}")
+        
+        # 3. 답변 정리 (LLM 호출 2)
+        print("\n💭 최종 답변 작성 중...")
+        self.messages.append(HumanMessage(content=PLAN_ANSWER_PROMPT.format(observation=observation)))
+        response = self._invoke_llm()
+        self.messages.append(response)
+        
+        final_answer = self._extract_final_answer(response.content)
+        print("\n" + "="*80)
+        print("✅ 분석 완료! (LLM 호출 2회)")
+        print("="*80)
+        print(f"\n📊 최종 답변:\n{final_answer}")
+        return final_answer
+    
+    def _extract_script(self, response_text: str) -> str:
+        """응답에서 스크립트 추출 (코드 블록/Action Input 전부 이어붙임, 없으면 전체 텍스트)"""
+        codes = parse_react(response_text).codes
+        return "\n\n".join(codes) if codes else response_text.strip()
+    
+    def _exec_script(self, script: str, max_fixes: int) -> Tuple[Dict[str, Any], str, Optional[str]]:
+        """
+        스크립트를 실행하고, 사소한 에러는 로컬에서 고쳐 다시 실행
+        
+        자동 수정 대상:
+        - import 문, ReAct 형식 줄(Thought:/Action:) 제거, 들여쓰기 정리
+        - 존재하지 않는 컬럼명(KeyError) → 가장 비슷한 실제 컬럼명으로 교체
+        - 허용 목록에 있는 내장 함수 NameError → 해당 함수 허용
+        
+        Returns:
+            (실행 후 변수들, 최종 스크립트, 에러 메시지 또는 None)
+        """
+        script = self._clean_script(script)
+        extra_builtins = {}
+        error = None
+        
+        for attempt in range(max_fixes + 1):
+            safe_globals = self._safe_globals()
+            safe_globals["__builtins__"].update(extra_builtins)
+            reserved = set(safe_globals)
+            try:
+                # 스크립트 전체가 하나의 네임스페이스를 쓰도록 globals에서 실행
+                # (컴프리헨션/함수 안에서도 앞 단계의 step_* 변수를 참조 가능)
+                exec(script, safe_globals)
+                namespace = {k: v for k, v in safe_globals.items() if k not in reserved}
+                return namespace, script, None
+            except KeyError as e:
+                error = f"KeyError: {e}"
+                missing = str(e.args[0]) if e.args else ""
+                close = difflib.get_close_matches(missing, [str(c) for c in self.df.columns], n=1)
+                if not close:
+                    break
+                print(f"🔧 자동 수정: 컬럼 '{missing}' → '{close[0]}'")
+                script = re.sub(rf"(['\"]){re.escape(missing)}\1", rf"\g<1>{close[0]}\g<1>", script)
+            except NameError as e:
+                error = f"NameError: {e}"
+                match = re.search(r"name '(\w+)' is not defined", str(e))
+                if not match or match.group(1) not in AUTOFIX_BUILTINS:
+                    break
+                print(f"🔧 자동 수정: 내장 함수 '{match.group(1)}' 허용")
+                extra_builtins[match.group(1)] = AUTOFIX_BUILTINS[match.group(1)]
+            except Exception as e:
+                error = f"{type(e).__name__}: {e}"
+                break
+        
+        return {}, script, error
+    
+    def _clean_script(self, script: str) -> str:
+        """import 문과 ReAct 형식 줄을 제거하고 들여쓰기 정리"""
+        lines = []
+        for line in script.split("\n"):
+            stripped = line.strip()
+            if re.match(r"^(import\s+(pandas|numpy)\b|from\s+(pandas|numpy)\b)", stripped):
+                continue
+            if re.match(r"^(Thought|Action|Action Input|Final Answer)\s*:", stripped):
+                continue
+            lines.append(line)
+        return textwrap.dedent("\n".join(lines)).strip()
+    
+    def _summarize_outputs(self, namespace: Dict[str, Any]) -> str:
+        """step_* 변수와 result를 이름과 함께 Observation으로 정리 (예산 분배)"""
+        names = [name for name in namespace if name.startswith("step_")]
+        if "result" in namespace:
+            names.append("result")
+        if not names:
+            names = [name for name in namespace if not name.startswith("_")]
+        if not names:
+            return "실행 완료 (출력 없음)"
+        
+        budget = max(self.observation_budget * 2 // len(names), 80)
+        return "\n\n".join(
+            f"[{name}]\n{encode_observation(namespace[name], max_tokens=budget)}"
+            for name in names
+        )
+    
     def _extract_final_answer(self, response_text: str) -> str:
-        """Final Answer 추출"""
-        if "Final Answer:" in response_text:
-            return response_text.split("Final Answer:")[1].strip()
-        return response_text
+        """Final Answer 추출 (없으면 응답 전체)"""
+        final_answer = parse_react(response_text).final_answer
+        return final_answer if final_answer is not None else response_text
     
     def show_conversation(self):
         """대화 이력 출력"""
@@ -379,6 +619,33 @@ result3 = agent3.run(
 # 대화 이력 확인
 agent3.show_conversation()
 
+# %% 4-5. 실습 4: 멀티 액션 모드 (LLM 호출 횟수 줄이기)
+
+print("\n" + "="*80)
+print("📝 실습 4: 멀티 액션 모드")
+print("="*80)
+print("💡 독립적인 계산 여러 개를 한 번의 응답으로 받아 병렬 실행합니다.")
+
+agent4 = PandasPseudoAgent(chat_model, df, multi_action=True)
+result4 = agent4.run(
+    question="전체 평균 나이, 도시별 평균 구매액, 등급별 고객 수를 알려주세요",
+    max_iterations=3,
+    auto_execute=True
+)
+
+# %% 4-6. 실습 5: 계획-실행 모드 (LLM 호출 2회)
+
+print("\n" + "="*80)
+print("📝 실습 5: 계획-실행 모드")
+print("="*80)
+print("💡 분석 전체를 스크립트 하나로 받아 로컬에서 실행하고, 답변만 한 번 더 요청합니다.")
+
+agent5 = PandasPseudoAgent(chat_model, df)
+result5 = agent5.run_planned(
+    question="Platinum 등급 고객의 평균 구매액과 전체 평균 구매액을 비교해주세요"
+)
+agent5.show_conversation()
+
 # %% [markdown]
 # ---
 # # Part 5: 다양한 질문으로 실험
@@ -17,6 +17,8 @@ import streamlit as st
 import pandas as pd
 import numpy as np
 
+from columnar_cache import read_csv_cached
+
 # ============================================================================
 # Part 1: 페이지 설정 및 제목
 # ============================================================================
@@ -308,7 +310,8 @@ uploaded_file = st.file_uploader(
 )
 
 if uploaded_file is not None:
-    df_uploaded = pd.read_csv(uploaded_file)
+    # 같은 파일은 rerun마다 다시 파싱하지 않고 컬럼 캐시(.columnar_cache)에서 로드
+    df_uploaded = read_csv_cached(uploaded_file)
     
     st.success(f"✅ '{uploaded_file.name}' 파일이 업로드되었습니다!")
     
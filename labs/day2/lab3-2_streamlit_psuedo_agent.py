@@ -11,12 +11,16 @@
 
 import streamlit as st
 import pandas as pd
-import re
 import sys
+import uuid
 from io import StringIO
 
 from langchain_core.messages import HumanMessage, AIMessage, SystemMessage
-from potens_wrapper import PotensChatModel
+from potens_wrapper import PotensChatModel, REACT_STOP
+from observation_encoder import encode_observation
+from react_parser import parse_react
+from agent_runtime import AgentRuntime, PRIORITY_INTERACTIVE
+from columnar_cache import read_csv_cached
 
 # ============================================================================
 # Part 1: 페이지 설정
@@ -41,6 +45,25 @@ def get_chat_model():
 
 chat_model = get_chat_model()
 
+@st.cache_resource
+def get_runtime():
+    # 모든 브라우저 세션이 공유하는 작업 런타임 (LLM 호출을 우선순위 작업으로 스케줄링)
+    return AgentRuntime(chat_model=get_chat_model(), max_workers=4, default_tenant_limit=1)
+
+runtime = get_runtime()
+
+def ask_agent():
+    """현재 대화로 LLM 호출 (대화형 작업으로 제출해 대량 작업보다 먼저 실행, 세션당 1개씩)"""
+    job_id = runtime.submit(
+        chat_model.invoke,
+        list(st.session_state.messages),
+        stop=REACT_STOP,
+        tenant=st.session_state.session_id,
+        priority=PRIORITY_INTERACTIVE,
+        name="chat",
+    )
+    return runtime.result(job_id)
+
 # ============================================================================
 # Part 3: 세션 상태 초기화
 # ============================================================================
@@ -75,6 +98,9 @@ if "df" not in st.session_state:
 if "pending_code" not in st.session_state:
     st.session_state.pending_code = None
 
+if "session_id" not in st.session_state:
+    st.session_state.session_id = uuid.uuid4().hex[:8]
+
 if "debug_mode" not in st.session_state:
     st.session_state.debug_mode = False
 
@@ -92,7 +118,8 @@ with st.sidebar:
     )
     
     if uploaded_file is not None:
-        st.session_state.df = pd.read_csv(uploaded_file)
+        # 업로드 바이트 해시로 컬럼 캐시 조회 (rerun마다 CSV를 다시 파싱하지 않음)
+        st.session_state.df = read_csv_cached(uploaded_file)
         st.success(f"✅ 파일 로드 완료: {uploaded_file.name}")
         
         with st.expander("📊 데이터 미리보기"):
@@ -140,65 +167,17 @@ for msg in st.session_state.messages[1:]:
 # ============================================================================
 
 def extract_code(response_text):
-    """Agent 응답에서 코드 추출 (강화 버전)"""
+    """Agent 응답에서 첫 번째 Action Input 코드 추출 (공용 ReAct 파서 사용)"""
     
     if st.session_state.debug_mode:
         with st.expander("🔍 디버그: 원본 응답"):
             st.code(response_text)
     
-    # 패턴 1: ```python ... ``` 블록 먼저 시도
-    pattern = r"```(?:python)?\s*(.*?)\s*```"
-    matches = re.findall(pattern, response_text, re.DOTALL)
-    if matches:
-        code = matches[0].strip()
-        # 주석 제거 (선택사항)
-        code = "\n".join(line for line in code.split("\n") if not line.strip().startswith("#"))
-        if code:
-            if st.session_state.debug_mode:
-                st.success("✅ 코드 블록에서 추출")
-            return code
-    
-    # 패턴 2: Action Input: 이후
-    if "Action Input:" in response_text:
-        after_action_input = response_text.split("Action Input:")[1]
-        lines = after_action_input.split("\n")
-        
-        code_lines = []
-        in_code_block = False
-        
-        for i, line in enumerate(lines):
-            stripped = line.strip()
-            
-            # 코드 블록 시작 감지
-            if stripped.startswith("```"):
-                in_code_block = not in_code_block
-                continue
-            
-            # 종료 조건
-            if not in_code_block:
-                if stripped.startswith("Observation") or \
-                   stripped.startswith("Thought") or \
-                   stripped.startswith("Final Answer") or \
-                   stripped.startswith("Action:"):
-                    break
-                
-                # 빈 줄이고 이미 코드가 있으면 종료
-                if not stripped and code_lines:
-                    break
-            
-            # 첫 줄이면서 코드가 있으면 추가
-            if i == 0 and stripped and not stripped.startswith("```"):
-                code_lines.append(line)
-            # 코드 블록 안이거나 일반 코드
-            elif stripped or in_code_block:
-                code_lines.append(line)
-        
-        if code_lines:
-            code = "\n".join(code_lines).strip()
-            if code:
-                if st.session_state.debug_mode:
-                    st.success("✅ Action Input에서 추출")
-                return code
+    parsed = parse_react(response_text, strip_comments=True)
+    if parsed.codes:
+        if st.session_state.debug_mode:
+            st.success(f"✅ 코드 추출 (Action Input {len(parsed.codes)}개 중 첫 번째)")
+        return parsed.codes[0]
     
     if st.session_state.debug_mode:
         st.warning("⚠️ 코드를 찾을 수 없습니다")
@@ -293,18 +272,9 @@ def safe_exec(code, context):
         
         return error_msg
 
-def format_result(result_value):
-    """결과를 포맷팅 (PyArrow 에러 방지)"""
-    if isinstance(result_value, pd.DataFrame):
-        df_str = f"DataFrame ({result_value.shape[0]}행 x {result_value.shape[1]}컬럼)\n"
-        df_str += result_value.head(10).to_string()
-        return df_str
-    elif isinstance(result_value, pd.Series):
-        series_str = f"Series (길이 {len(result_value)})\n"
-        series_str += result_value.head(10).to_string()
-        return series_str
-    else:
-        return str(result_value)
+def format_result(result_value, max_tokens=400):
+    """결과를 포맷팅 (PyArrow 에러 방지, 토큰 예산 내 간결 인코딩)"""
+    return encode_observation(result_value, max_tokens=max_tokens)
 
 # ============================================================================
 # Part 7: Pending Code 실행 UI
@@ -348,7 +318,7 @@ if st.session_state.pending_code:
                         
                         # Agent에게 다음 행동 요청
                         with st.spinner("Agent 응답 대기..."):
-                            response = chat_model.invoke(st.session_state.messages)
+                            response = ask_agent()
                             st.session_state.messages.append(response)
                         
                         st.session_state.pending_code = None
@@ -374,7 +344,7 @@ if st.session_state.pending_code:
                 )
                 
                 with st.spinner("Agent 응답 대기..."):
-                    response = chat_model.invoke(st.session_state.messages)
+                    response = ask_agent()
                     st.session_state.messages.append(response)
                 
                 st.session_state.pending_code = None
@@ -396,7 +366,7 @@ if user_input := st.chat_input("분석 요청을 입력하세요..."):
     
     with st.chat_message("assistant"):
         with st.spinner("생각 중..."):
-            response = chat_model.invoke(st.session_state.messages)
+            response = ask_agent()
             st.write(response.content)
     
     st.session_state.messages.append(response)
@@ -12,12 +12,24 @@
 import pandas as pd
 import numpy as np
 import re
-import sys
+import time
 from io import StringIO
-from typing import Dict, Any
+from typing import Callable, Dict, Any, List, Optional, Tuple
+from concurrent.futures import Future, ThreadPoolExecutor
 
 from langchain_core.messages import HumanMessage, AIMessage, SystemMessage
-from potens_wrapper import PotensChatModel
+from potens_wrapper import PotensChatModel, REACT_STOP
+from data_profile import load_or_build_profile, summarize_profile
+from observation_encoder import encode_observation, estimate_tokens, truncate_text
+from agent_checkpoint import AgentCheckpoint
+from agent_profiler import RunProfiler
+from react_parser import ACTION_INPUT, ReActParser, parse_react
+from agent_runtime import AgentRuntime, PRIORITY_BULK
+from data_workspace import DataWorkspace
+from approx_query import ApproxEngine
+from partitioned_engine import PartitionedFrame
+from columnar_cache import read_csv_cached
+from dtype_compaction import compact_dtypes, print_memory_report
 
 # %% [markdown]
 # # Part 1: EDA Agent 시스템 프롬프트
@@ -68,6 +80,84 @@ Final Answer:
 - 각 분석은 이전 Observation을 기반으로 진행
 """
 
+# %% 1-2. 병렬 다중 가설 모드 프롬프트 (플래너 / 브랜치 / 병합)
+
+EDA_PLANNER_PROMPT = """
+당신은 탐색적 데이터 분석(EDA) 설계자입니다.
+
+아래 목표와 데이터 정보를 보고, 서로 독립적으로 검증할 수 있는 가설을 정확히 {num_branches}개 제안하세요.
+(예: "지역별 평점 차이", "프리미엄 여부와 구매액", "연령대별 구매 횟수")
+
+**출력 형식 (다른 설명 없이 이 형식만):**
+가설 1: (검증할 가설 한 줄)
+가설 2: (검증할 가설 한 줄)
+...
+
+**목표:** {goal}
+
+**데이터 정보:**
+{data_info}
+"""
+
+# %% 1-3. 멀티 액션 모드 규칙 (한 응답에 여러 Action Input)
+
+EDA_MULTI_ACTION_RULES = """
+**멀티 액션 모드 (위의 '한 번에 하나' 규칙보다 우선):**
+- 서로 독립적인 분석은 한 번의 응답에 여러 개의 Action Input으로 묶어 제안하세요.
+  (예: shape/결측치/describe/groupby 2개 → 한 응답에 5개)
+- 각 코드는 ```python ... ``` 블록 하나에 작성하세요.
+- 각 블록은 다른 블록의 결과에 의존하지 않아야 하며, df를 수정하면 안 됩니다.
+- 모든 블록의 결과는 [Action 1], [Action 2] ... 형태의 Observation 하나로 전달됩니다.
+"""
+
+EDA_APPROX_RULES = """
+**근사 모드:**
+- df는 전체 데이터의 층화 표본입니다. 결과는 표본 크기와 신뢰구간이 붙은 근사값으로 제공됩니다.
+- 결과는 result 변수에 숫자 하나 또는 그룹별 숫자 Series로 저장하세요
+  (예: result = df.groupby('region')['rating'].mean())
+- 합계·개수(len, sum, count)는 표본 기준이므로 비교에는 평균·비율·중앙값을 쓰세요.
+- 전체 데이터로 정확히 계산해야 하면 코드 첫 줄에 exact = True 를 쓰세요.
+"""
+
+EDA_PARTITIONED_RULES = """
+**대용량 파티션 모드:**
+- df는 파일을 파티션으로 나눠 병렬 처리하는 지연 DataFrame입니다 (전체가 메모리에 없음).
+- 필터는 df.query("age > 30") 형태로 쓰세요 (df[df['age'] > 30]은 전체를 읽어서 느립니다).
+- 빠른 연산: len(df), df.shape, df.columns, df.dtypes, df.head(), df.describe(), df.isnull().sum(),
+  df['col'].value_counts(), df['col'].mean()/sum()/min()/max()/std()/nunique(),
+  df.groupby('key')['col'].agg(['mean', 'sum', 'count', 'min', 'max', 'std'])
+- df를 수정하지 말고, 결과는 집계된 Series/DataFrame으로 result에 저장하세요.
+"""
+
+EDA_BRANCH_SYSTEM_PROMPT = EDA_SYSTEM_PROMPT + """
+**브랜치 모드 (위 규칙보다 우선):**
+- 당신은 여러 병렬 분석 중 하나로, 주어진 가설 하나만 검증합니다.
+- 2~3번 코드를 실행해 가설을 확인하면 바로 Final Answer를 제시하세요.
+- Final Answer에는 이 가설에 대한 인사이트 1개만 작성하세요.
+"""
+
+EDA_MERGE_PROMPT = """
+여러 분석가가 같은 데이터에서 각자 하나의 가설을 검증했습니다.
+
+**전체 목표:** {goal}
+
+**가설별 분석 결과:**
+{findings}
+
+위 결과만을 근거로 (새로운 수치를 만들지 말고) 목표에 맞는 최종 인사이트를 정리하세요.
+
+**출력 형식:**
+Final Answer: 
+## 인사이트 1: [제목]
+- 발견: [분석 결과에 있는 구체적 수치]
+- 의미: [비즈니스적 해석]
+- 제안: [실행 가능한 액션]
+
+## 인사이트 2: ...
+
+## 인사이트 3: ...
+"""
+
 print("✅ EDA Agent 시스템 프롬프트 정의 완료")
 
 # %% [markdown]
@@ -81,11 +171,85 @@ class EDAAgent:
     자율적으로 EDA를 수행하는 Agent (완전 개선 버전)
     """
     
-    def __init__(self, chat_model: PotensChatModel, df: pd.DataFrame):
+    def __init__(
+        self,
+        chat_model: PotensChatModel,
+        df: Optional[pd.DataFrame] = None,
+        profile: Optional[Dict[str, Any]] = None,
+        profile_budget: int = 1500,
+        system_prompt: str = EDA_SYSTEM_PROMPT,
+        verbose: bool = True,
+        name: str = "",
+        observation_budget: int = 500,
+        multi_action: bool = False,
+        executor: Optional[ThreadPoolExecutor] = None,
+        checkpoint: Optional[AgentCheckpoint] = None,
+        profiler: Optional[RunProfiler] = None,
+        stream_actions: bool = False,
+        workspace: Optional[DataWorkspace] = None,
+        approx: Optional[ApproxEngine] = None,
+        print_fn: Callable[..., None] = print,
+    ):
+        """
+        Args:
+            chat_model: POTENS ChatModel
+            df: 분석할 DataFrame (workspace만 쓰면 생략 가능, 대용량 파일은 PartitionedFrame)
+            profile: data_profile.load_or_build_profile() 결과 (있으면 첫 메시지에 요약 포함)
+            profile_budget: 프로파일 요약 최대 글자 수
+            system_prompt: 시스템 프롬프트 (병렬 모드 브랜치는 EDA_BRANCH_SYSTEM_PROMPT)
+            verbose: False면 진행 로그 출력 생략 (병렬 브랜치용)
+            name: 로그 앞에 붙일 이름 (예: "브랜치 1")
+            observation_budget: Observation 하나의 토큰 예산
+            multi_action: True면 한 응답의 여러 Action Input을 병렬 실행 (LLM 호출 횟수 감소)
+            executor: 코드 실행용 스레드 풀 (멀티 액션 모드에서 공유, 없으면 필요할 때 생성)
+            checkpoint: 세션 체크포인트 (있으면 매 단계 기록, resume()으로 이어서 실행)
+            profiler: 실행 프로파일러 (있으면 반복별 LLM/추출/실행/인코딩 시간 기록)
+            stream_actions: True면 응답을 스트리밍으로 받으며 완성된 Action Input부터 바로 실행
+            workspace: 여러 데이터셋 워크스페이스 (스키마만 프롬프트에 넣고, 코드가 참조할 때 로드)
+            approx: 근사 엔진 (있으면 코드를 먼저 표본에서 실행하고 신뢰구간이 넓을 때만 전체 계산)
+            print_fn: 진행 로그 출력 함수 (AgentRuntime 작업이면 runtime.print → 작업 "log" 이벤트)
+        """
+        if df is None and workspace is None:
+            raise ValueError("df 또는 workspace 중 하나는 필요합니다.")
         self.chat_model = chat_model
         self.df = df
-        self.messages = [SystemMessage(content=EDA_SYSTEM_PROMPT)]
+        self.profile = profile
+        self.profile_budget = profile_budget
+        self.verbose = verbose
+        self.name = name
+        self.observation_budget = observation_budget
+        self.multi_action = multi_action
+        self.executor = executor
+        self.checkpoint = checkpoint
+        self.profiler = profiler or RunProfiler(enabled=False)
+        self.stream_actions = stream_actions
+        self.workspace = workspace
+        self.approx = approx
+        self.print_fn = print_fn
+        if multi_action:
+            system_prompt = system_prompt + EDA_MULTI_ACTION_RULES
+        if approx is not None:
+            system_prompt = system_prompt + EDA_APPROX_RULES
+        if isinstance(df, PartitionedFrame):
+            system_prompt = system_prompt + EDA_PARTITIONED_RULES
+        self.messages = [SystemMessage(content=system_prompt)]
         self.execution_history = []
+        self.branch_results = []
+    
+    def _log_data(self):
+        """분석 대상 데이터 로그 (df 크기, 워크스페이스 데이터셋 목록)"""
+        if self.df is not None:
+            self._log(f"📊 데이터: {self.df.shape[0]}행 x {self.df.shape[1]}컬럼")
+        if self.workspace:
+            self._log(f"🗂️ 워크스페이스: {', '.join(self.workspace.names)}")
+    
+    def _log(self, text: str = ""):
+        """진행 로그 출력 (verbose=False면 생략, 이름이 있으면 접두어 추가)"""
+        if not self.verbose:
+            return
+        if self.name:
+            text = "\n".join(f"[{self.name}] {line}" for line in text.split("\n"))
+        self.print_fn(text)
     
     def run(self, goal: str, max_iterations: int = 10):
         """
@@ -98,16 +262,19 @@ class EDAAgent:
         Returns:
             최종 인사이트
         """
-        print("="*80)
-        print("🤖 EDA Agent 시작")
-        print("="*80)
-        print(f"📊 데이터: {self.df.shape[0]}행 x {self.df.shape[1]}컬럼")
-        print(f"🎯 목표: {goal}")
-        print(f"🔄 최대 반복: {max_iterations}회")
-        print("="*80)
+        self._log("="*80)
+        self._log("🤖 EDA Agent 시작")
+        self._log("="*80)
+        self._log_data()
+        self._log(f"🎯 목표: {goal}")
+        self._log(f"🔄 최대 반복: {max_iterations}회")
+        self._log("="*80)
         
         # 초기 메시지: 목표 + 데이터 정보
         data_info = self._get_data_info()
+        profile_note = ""
+        if self.profile:
+            profile_note = "(기본 구조/분포/상관관계는 위 프로파일로 이미 파악되었으니 이 단계는 건너뛰세요.)"
         initial_message = f"""
             **목표:** {goal}
 
@@ -115,84 +282,380 @@ class EDAAgent:
             {data_info}
 
             위 목표를 달성하기 위해 단계별로 분석을 시작하세요.
+            {profile_note}
             """
         self.messages.append(HumanMessage(content=initial_message))
         
-        # 반복 실행
-        for i in range(max_iterations):
-            print(f"\n{'─'*80}")
-            print(f"🔄 반복 {i+1}/{max_iterations}")
-            print(f"{'─'*80}")
-            
-            # Agent에게 다음 행동 요청
-            response = None
-            max_retries = 3
-            
-            for attempt in range(max_retries):
-                try:
-                    print(f"\n⏳ Agent에게 요청 중... (시도 {attempt + 1}/{max_retries})")
-                    response = self.chat_model.invoke(self.messages)
-                    break  # 성공하면 루프 탈출
-                    
-                except Exception as e:
-                    error_msg = str(e)
-                    print(f"\n⚠️ API 에러 발생: {error_msg[:100]}...")
-                    
-                    if attempt < max_retries - 1:
-                        import time
-                        wait_time = (attempt + 1) * 2  # 2초, 4초, 6초
-                        print(f"   {wait_time}초 후 재시도...")
-                        time.sleep(wait_time)
-                    else:
-                        print(f"\n❌ {max_retries}번 시도 후 실패")
-                        return f"API 에러로 인한 조기 종료. 현재까지 {len(self.execution_history)}개 코드 실행 완료."
+        if self.checkpoint:
+            self.checkpoint.reset(meta={"goal": goal, "max_iterations": max_iterations})
+            for message in self.messages:
+                self.checkpoint.record_message(message)
+            self.checkpoint.commit()
+        
+        return self._react_loop(0, max_iterations)
+    
+    def resume(self, max_iterations: Optional[int] = None):
+        """
+        체크포인트에서 세션을 복원해 이어서 실행
+        
+        완료된 LLM 호출과 코드 실행은 다시 하지 않습니다.
+        (마지막 AI 응답의 코드가 실행 전이었다면 그 코드부터 실행)
+        
+        Args:
+            max_iterations: 최대 반복 횟수 (없으면 처음 run()에 준 값)
+        
+        Returns:
+            최종 인사이트
+        """
+        if self.checkpoint is None or not self.checkpoint.exists():
+            raise ValueError("복원할 체크포인트가 없습니다. checkpoint를 지정하고 run()을 먼저 실행하세요.")
+        
+        state = self.checkpoint.load()
+        if state["final"] is not None:
+            self._log("✅ 이미 완료된 세션입니다. 저장된 최종 답변을 반환합니다.")
+            return state["final"]
+        
+        self.messages = state["messages"]
+        self.execution_history = state["history"]
+        max_iterations = max_iterations or state["meta"].get("max_iterations", 10)
+        # Observation까지 받은 단계만 완료 (마지막 AI 응답의 코드가 실행 전이면 그 단계부터 다시)
+        completed = sum(
+            1 for message, following in zip(self.messages, self.messages[1:])
+            if isinstance(message, AIMessage)
+            and isinstance(following, HumanMessage) and following.content.startswith("Observation:")
+        )
+        
+        self._log("="*80)
+        self._log(f"♻️ EDA Agent 세션 복원: {self.checkpoint.session_id}")
+        self._log(f"   완료된 LLM 호출 {completed}회, 코드 실행 {len(self.execution_history)}회")
+        self._log("="*80)
+        
+        return self._react_loop(completed, max_iterations)
+    
+    def _react_loop(self, start_iteration: int, max_iterations: int):
+        """Thought → Action → Observation 반복 (run/resume 공통, 어떻게 끝나든 체크포인트를 닫음)"""
+        try:
+            return self._react_steps(start_iteration, max_iterations)
+        finally:
+            if self.checkpoint:
+                self.checkpoint.close()
+    
+    def _react_steps(self, start_iteration: int, max_iterations: int):
+        for i in range(start_iteration, max_iterations):
+            self._log(f"\n{'─'*80}")
+            self._log(f"🔄 반복 {i+1}/{max_iterations}")
+            self._log(f"{'─'*80}")
+            self.profiler.set_iteration(i + 1)
             
-            if not response:
-                continue
+            parsed, futures = None, None
+            if isinstance(self.messages[-1], AIMessage):
+                # 복원된 세션: 응답은 받았지만 실행 전이었던 단계
+                response = self.messages[-1]
+            else:
+                # Agent에게 다음 행동 요청
+                prompt_chars = sum(len(message.content) for message in self.messages)
+                with self.profiler.span("llm", prompt_chars=prompt_chars) as span_args:
+                    response = None
+                    if self.stream_actions:
+                        response, parsed, futures = self._stream_and_submit(self.messages)
+                    if response is None:
+                        response = self._invoke_with_retry(self.messages)
+                    span_args["response_chars"] = len(response.content) if response else 0
+                if response is None:
+                    return f"API 에러로 인한 조기 종료. 현재까지 {len(self.execution_history)}개 코드 실행 완료."
                 
-            print(f"\n🤖 Agent 응답:\n{response.content[:500]}...")
+                self.messages.append(response)
+                if self.checkpoint:
+                    self.checkpoint.record_message(response)
+                    self.checkpoint.commit()
+                
+            self._log(f"\n🤖 Agent 응답:\n{response.content[:500]}...")
+            
+            # 응답 파싱 (스트리밍 모드에서는 받으면서 이미 파싱됨)
+            if parsed is None:
+                with self.profiler.span("extract"):
+                    parsed = parse_react(response.content, strip_comments=True)
             
-            self.messages.append(response)
+            # Final Answer 확인 (미리 제출한 실행 결과는 버림)
+            if parsed.final_answer is not None:
+                final_answer = parsed.final_answer
+                if self.checkpoint:
+                    self.checkpoint.record_final(final_answer)
+                self._log("\n" + "="*80)
+                self._log("✅ EDA 완료!")
+                self._log("="*80)
+                return final_answer
             
-            # Final Answer 확인
-            if "Final Answer:" in response.content:
-                print("\n" + "="*80)
-                print("✅ EDA 완료!")
-                print("="*80)
-                return self._extract_final_answer(response.content)
+            # Action Input 실행
+            codes = parsed.codes if self.multi_action else parsed.codes[:1]
             
-            # Action Input 추출 및 실행
-            code = self._extract_code(response.content)
-            if code:
-                print(f"\n📝 실행할 코드:\n{code}")
+            if codes:
+                for idx, code in enumerate(codes, 1):
+                    label = f" [Action {idx}]" if len(codes) > 1 else ""
+                    self._log(f"\n📝 실행할 코드{label}:\n{code}")
+                
+                # 코드 실행 (여러 개면 스레드 풀에서 병렬 실행, 스트리밍 중 제출했으면 결과만 수집)
+                if futures:
+                    results = [future.result() for future in futures]
+                else:
+                    results = self._execute_actions(codes)
                 
-                # 코드 실행
-                result = self._safe_exec(code)
-                print(f"\n📊 실행 결과:\n{result}")
+                for code, result in zip(codes, results):
+                    # 실행 이력 저장
+                    self.execution_history.append({
+                        "iteration": i + 1,
+                        "code": code,
+                        "result": result
+                    })
                 
-                # 실행 이력 저장
-                self.execution_history.append({
-                    "iteration": i + 1,
-                    "code": code,
-                    "result": result
-                })
+                if len(codes) == 1:
+                    observation = results[0]
+                else:
+                    observation = "\n\n".join(
+                        f"[Action {idx}]\n{result}" for idx, result in enumerate(results, 1)
+                    )
+                self._log(f"\n📊 실행 결과:\n{observation}")
                 
                 # Observation 추가
                 self.messages.append(
-                    HumanMessage(content=f"Observation: {result}")
+                    HumanMessage(content=f"Observation: {observation}")
                 )
+                if self.checkpoint:
+                    self.checkpoint.record_step(i + 1, codes, results, observation)
+                    self.checkpoint.commit()
             else:
-                print("\n⚠️ Action Input을 찾을 수 없습니다.")
+                self._log("\n⚠️ Action Input을 찾을 수 없습니다.")
                 break
         
-        print("\n⚠️ 최대 반복 횟수 도달")
+        self._log("\n⚠️ 최대 반복 횟수 도달")
         return "최대 반복 횟수 초과. Final Answer를 받지 못했습니다."
     
+    def _execute_actions(self, codes: List[str]) -> List[str]:
+        """
+        여러 Action Input 코드를 실행 (2개 이상이면 스레드 풀에서 병렬 실행)
+        
+        Observation 전체가 예산을 넘지 않도록 코드별 예산을 나눠서 적용
+        
+        Returns:
+            codes와 같은 순서의 실행 결과 목록
+        """
+        if len(codes) == 1:
+            return [self._safe_exec(codes[0])]
+        
+        budget = max(self.observation_budget // len(codes), 100)
+        futures = [self._submit_exec(code, budget) for code in codes]
+        return [future.result() for future in futures]
+    
+    def _submit_exec(self, code: str, budget: int) -> Future:
+        """코드 하나를 스레드 풀에 제출 (대기 시간은 프로파일러에 기록)"""
+        if self.executor is None:
+            self.executor = ThreadPoolExecutor(max_workers=4)
+        
+        def timed_exec(submitted: float) -> str:
+            self.profiler.record("queue", submitted, time.perf_counter())
+            return self._safe_exec(code, budget)
+        
+        return self.executor.submit(timed_exec, time.perf_counter())
+    
+    def _stream_and_submit(self, messages) -> Tuple[Optional[AIMessage], Optional[ReActParser], List[Future]]:
+        """
+        응답을 스트리밍으로 받으며 파싱하고, 완성된 Action Input을 즉시 스레드 풀에 제출
+        
+        응답이 다 내려오기 전에 앞쪽 코드가 실행되기 시작합니다.
+        멀티 액션이면 코드 개수를 미리 알 수 없으므로 코드별 Observation 예산은 전체의 1/3로 고정하고,
+        단일 액션이면 전체 예산을 그대로 씁니다.
+        
+        Returns:
+            (AIMessage, 파서, 제출된 실행 Future 목록). 스트리밍이 실패하면 (None, None, [])
+        """
+        parser = ReActParser(strip_comments=True)
+        futures: List[Future] = []
+        chunks: List[str] = []
+        limit = None if self.multi_action else 1
+        budget = self.observation_budget if limit == 1 else max(self.observation_budget // 3, 100)
+        
+        def submit(events):
+            for event in events:
+                if event.kind == ACTION_INPUT and (limit is None or len(futures) < limit):
+                    futures.append(self._submit_exec(event.text, budget))
+        
+        try:
+            self._log("\n⏳ Agent에게 요청 중... (스트리밍)")
+            for chunk in self.chat_model.stream(messages, stop=REACT_STOP):
+                chunks.append(chunk.content)
+                submit(parser.feed(chunk.content))
+            submit(parser.close())
+        except Exception as e:
+            self._log(f"\n⚠️ 스트리밍 실패, 일반 호출로 재시도: {str(e)[:100]}")
+            for future in futures:
+                future.cancel()
+            return None, None, []
+        
+        return AIMessage(content="".join(chunks)), parser, futures
+    
+    def _invoke_with_retry(self, messages, max_retries: int = 3):
+        """
+        LLM 호출 (실패 시 2초, 4초 간격으로 재시도)
+        
+        Returns:
+            AIMessage 응답, max_retries번 모두 실패하면 None
+        """
+        for attempt in range(max_retries):
+            try:
+                self._log(f"\n⏳ Agent에게 요청 중... (시도 {attempt + 1}/{max_retries})")
+                return self.chat_model.invoke(messages, stop=REACT_STOP)
+                
+            except Exception as e:
+                error_msg = str(e)
+                self._log(f"\n⚠️ API 에러 발생: {error_msg[:100]}...")
+                
+                if attempt < max_retries - 1:
+                    wait_time = (attempt + 1) * 2  # 2초, 4초
+                    self._log(f"   {wait_time}초 후 재시도...")
+                    time.sleep(wait_time)
+                else:
+                    self._log(f"\n❌ {max_retries}번 시도 후 실패")
+        return None
+    
+    def run_parallel(
+        self,
+        goal: str,
+        num_branches: int = 3,
+        max_iterations: int = 4,
+        executor: Optional[ThreadPoolExecutor] = None,
+    ):
+        """
+        병렬 다중 가설 모드: 플래너 → 가설별 브랜치 동시 실행 → 병합
+        
+        1. 플래너 호출 1번으로 목표를 num_branches개의 독립 가설로 분할
+        2. 가설마다 서브 Agent를 만들어 동시에 실행 (df, 프로파일, LLM 클라이언트 공유)
+        3. 병합 호출 1번으로 브랜치 결과를 최종 인사이트로 정리
+        
+        전체 소요 시간은 (플래너 + 가장 긴 브랜치 + 병합) 수준으로 줄어듭니다.
+        
+        Args:
+            goal: 분석 목표
+            num_branches: 가설(브랜치) 개수
+            max_iterations: 브랜치별 최대 반복 횟수
+            executor: 브랜치를 실행할 스레드 풀 (없으면 num_branches 크기로 생성)
+        
+        Returns:
+            최종 인사이트
+        """
+        self._log("="*80)
+        self._log("🤖 EDA Agent 시작 (병렬 다중 가설 모드)")
+        self._log("="*80)
+        self._log_data()
+        self._log(f"🎯 목표: {goal}")
+        self._log(f"🌿 브랜치: {num_branches}개 x 최대 {max_iterations}회")
+        self._log("="*80)
+        
+        # 1. 플래너: 목표를 독립 가설로 분할
+        planner_prompt = EDA_PLANNER_PROMPT.format(
+            num_branches=num_branches,
+            goal=goal,
+            data_info=self._get_data_info(),
+        )
+        plan = self._invoke_with_retry([HumanMessage(content=planner_prompt)])
+        if plan is None:
+            return "API 에러로 인한 조기 종료 (플래너 호출 실패)."
+        
+        hypotheses = self._parse_hypotheses(plan.content)[:num_branches]
+        if not hypotheses:
+            self._log("\n⚠️ 가설을 찾을 수 없어 단일 체인 모드로 실행합니다.")
+            return self.run(goal, max_iterations=max_iterations * num_branches)
+        
+        self._log("\n📋 가설 목록:")
+        for idx, hypothesis in enumerate(hypotheses, 1):
+            self._log(f"   {idx}. {hypothesis}")
+        
+        # 2. 브랜치 동시 실행
+        def run_branch(idx: int, hypothesis: str):
+            branch = EDAAgent(
+                self.chat_model,
+                self.df,
+                profile=self.profile,
+                profile_budget=self.profile_budget,
+                system_prompt=EDA_BRANCH_SYSTEM_PROMPT,
+                verbose=False,
+                name=f"브랜치 {idx}",
+                observation_budget=self.observation_budget,
+                multi_action=self.multi_action,
+                executor=self.executor,
+                workspace=self.workspace,
+                approx=self.approx,
+            )
+            branch_goal = f"{goal}\n\n**이 브랜치에서 검증할 가설:** {hypothesis}"
+            answer = branch.run(branch_goal, max_iterations=max_iterations)
+            self._log(f"\n✅ 브랜치 {idx} 완료 ({len(branch.execution_history)}회 실행)")
+            return branch, answer
+        
+        own_executor = executor is None
+        if own_executor:
+            executor = ThreadPoolExecutor(max_workers=len(hypotheses))
+        try:
+            futures = [
+                executor.submit(run_branch, idx, hypothesis)
+                for idx, hypothesis in enumerate(hypotheses, 1)
+            ]
+            outcomes = [future.result() for future in futures]
+        finally:
+            if own_executor:
+                executor.shutdown(wait=False)
+        
+        # 브랜치 결과와 실행 이력 수집
+        self.branch_results = []
+        for idx, (hypothesis, (branch, answer)) in enumerate(zip(hypotheses, outcomes), 1):
+            self.branch_results.append({
+                "branch": idx,
+                "hypothesis": hypothesis,
+                "answer": answer,
+            })
+            for item in branch.execution_history:
+                self.execution_history.append({**item, "branch": idx})
+        
+        # 3. 병합: 브랜치 결과를 최종 인사이트로
+        findings = "\n\n".join(
+            f"### 가설 {item['branch']}: {item['hypothesis']}\n{item['answer']}"
+            for item in self.branch_results
+        )
+        merge_prompt = EDA_MERGE_PROMPT.format(goal=goal, findings=findings)
+        merged = self._invoke_with_retry([HumanMessage(content=merge_prompt)])
+        if merged is None:
+            return f"API 에러로 병합 실패. 브랜치 결과:\n\n{findings}"
+        
+        self.messages.append(HumanMessage(content=merge_prompt))
+        self.messages.append(merged)
+        
+        self._log("\n" + "="*80)
+        self._log("✅ EDA 완료! (병렬 모드)")
+        self._log("="*80)
+        return self._extract_final_answer(merged.content)
+    
+    def _parse_hypotheses(self, plan_text: str) -> List[str]:
+        """플래너 응답에서 '가설 N: ...' 또는 'N. ...' 형식의 가설 목록 추출"""
+        pattern = r"^\s*(?:[-*]\s*)?(?:가설\s*)?\d+\s*[.):：]\s*(.+?)\s*$"
+        return [m.strip() for m in re.findall(pattern, plan_text, re.MULTILINE) if m.strip()]
+    
     def _get_data_info(self) -> str:
-        """데이터 기본 정보 생성 (간결 버전)"""
+        """데이터 기본 정보 생성 (간결 버전, 워크스페이스가 있으면 데이터셋 스키마 추가)"""
+        if self.df is None:
+            return self.workspace.schema_summary(max_chars=self.profile_budget)
+        
+        info = self._get_df_info()
+        if self.workspace:
+            info += "\n\n" + self.workspace.schema_summary(max_chars=self.profile_budget)
+        return info
+    
+    def _get_df_info(self) -> str:
+        """df 기본 정보"""
+        # 캐시된 프로파일이 있으면 재계산 없이 예산 내 요약 사용
+        if self.profile:
+            return summarize_profile(self.profile, max_chars=self.profile_budget)
+        
         info_lines = [
             f"- Shape: {self.df.shape[0]}행 x {self.df.shape[1]}컬럼",
-            f"- 컬럼: {', '.join(self.df.columns.tolist())}",
+            f"- 컬럼: {', '.join(f'{col}({dtype})' for col, dtype in self.df.dtypes.items())}",
         ]
         
         # 타입은 요약만
@@ -212,66 +675,7 @@ class EDAAgent:
         
         return "\n".join(info_lines)
     
-    def _extract_code(self, response_text: str) -> str:
-        """
-        Agent 응답에서 코드 추출 (완전 개선 버전)
-        
-        지원하는 형식:
-        1. ```python ... ```
-        2. ``` ... ```
-        3. Action Input: code
-        4. Action Input:\ncode
-        """
-        # 패턴 1: 코드 블록 먼저 시도
-        pattern = r"```(?:python)?\s*(.*?)\s*```"
-        matches = re.findall(pattern, response_text, re.DOTALL)
-        if matches:
-            code = matches[0].strip()
-            # 주석 제거 (선택사항)
-            code_lines = [line for line in code.split("\n") 
-                         if line.strip() and not line.strip().startswith("#")]
-            if code_lines:
-                return "\n".join(code_lines)
-        
-        # 패턴 2: Action Input: 이후
-        if "Action Input:" in response_text:
-            after_action_input = response_text.split("Action Input:")[1]
-            lines = after_action_input.split("\n")
-            
-            code_lines = []
-            in_code_block = False
-            
-            for i, line in enumerate(lines):
-                stripped = line.strip()
-                
-                # 코드 블록 마커
-                if stripped.startswith("```"):
-                    in_code_block = not in_code_block
-                    continue
-                
-                # 종료 조건
-                if not in_code_block:
-                    if stripped.startswith("Observation") or \
-                       stripped.startswith("Thought") or \
-                       stripped.startswith("Final Answer") or \
-                       stripped.startswith("Action:"):
-                        break
-                    
-                    if not stripped and code_lines:
-                        break
-                
-                # 첫 줄 처리
-                if i == 0 and stripped and not stripped.startswith("```"):
-                    code_lines.append(line)
-                elif stripped or in_code_block:
-                    code_lines.append(line)
-            
-            if code_lines:
-                return "\n".join(code_lines).strip()
-        
-        return None
-    
-    def _safe_exec(self, code: str) -> Any:
+    def _safe_exec(self, code: str, observation_budget: Optional[int] = None) -> Any:
         """
         코드를 안전하게 실행 (완전 개선 버전)
         
@@ -281,7 +685,12 @@ class EDAAgent:
         3. 에러 처리 강화
         4. 불필요한 import 제거
         5. 중복 출력 방지
+        
+        Args:
+            code: 실행할 코드
+            observation_budget: 결과 토큰 예산 (없으면 self.observation_budget)
         """
+        budget = observation_budget or self.observation_budget
         try:
             # 불필요한 import 제거 (이미 globals에 있음)
             code = code.replace("import pandas as pd", "").strip()
@@ -291,32 +700,30 @@ class EDAAgent:
             if not code:
                 return "⚠️ 실행할 코드가 없습니다 (import만 있었음)"
             
-            # stdout 캡처
-            old_stdout = sys.stdout
-            sys.stdout = captured_output = StringIO()
+            # 근사 모드: 표본 + 신뢰구간으로 충분하면 전체 계산 생략
+            if self.approx is not None:
+                exact, code = self.approx.split_exact_request(code)
+                if not exact and not self.approx.is_full:
+                    observation = self._approx_exec(code, budget)
+                    if observation is not None:
+                        return observation
+                self.approx.stats["exact"] += 1
             
-            safe_globals = {
-                "pd": pd,
-                "np": np,
-                "df": self.df,
-                "__builtins__": {
-                    "len": len, "sum": sum, "max": max, "min": min,
-                    "round": round, "print": print, "str": str,
-                    "int": int, "float": float, "list": list, "dict": dict,
-                    "abs": abs, "any": any, "all": all,
-                    "range": range, "enumerate": enumerate, "sorted": sorted,
-                    "zip": zip, "map": map, "filter": filter,
-                    "set": set, "tuple": tuple, "bool": bool,
-                }
-            }
+            # print 출력 캡처 (sys.stdout을 바꾸지 않으므로 병렬 브랜치에서도 안전)
+            captured_output = StringIO()
+            
+            def captured_print(*args, **kwargs):
+                kwargs["file"] = captured_output
+                print(*args, **kwargs)
+            
+            safe_globals = self._exec_globals(code, self.df, captured_print)
             
             local_vars = {}
             
-            # 코드 실행
-            exec(code, safe_globals, local_vars)
+            # 코드 실행 (wall/CPU 시간, 최대 메모리 측정)
+            with self.profiler.span("exec", measure=True):
+                exec(code, safe_globals, local_vars)
             
-            # stdout 복원
-            sys.stdout = old_stdout
             printed_output = captured_output.getvalue()
             
             # 결과 수집
@@ -324,10 +731,8 @@ class EDAAgent:
             
             # 1. print 출력 (최우선)
             if printed_output.strip():
-                # 너무 긴 출력은 잘라내기 (타임아웃 방지)
-                output = printed_output.strip()
-                if len(output) > 2000:
-                    output = output[:1000] + "\n... (중략) ...\n" + output[-1000:]
+                # 너무 긴 출력은 줄 단위로 앞/뒤만 남기기 (토큰 예산)
+                output = truncate_text(printed_output.strip(), budget)
                 results.append(output)
                 
                 # print가 있으면 변수 결과는 생략 (중복 방지)
@@ -341,61 +746,100 @@ class EDAAgent:
                 else:
                     result_value = local_vars[list(local_vars.keys())[-1]]
                 
-                formatted = self._format_result(result_value)
+                # print 출력이 있으면 남은 예산만 사용
+                remaining = budget - sum(estimate_tokens(r) for r in results)
+                formatted = self._format_result(result_value, max_tokens=max(remaining, 50))
                 results.append(formatted)
             
             # 3. 표현식 평가 (변수도 없고 출력도 없으면)
             elif not results:
                 try:
                     result_value = eval(code, safe_globals, {})
-                    results.append(self._format_result(result_value))
+                    results.append(self._format_result(result_value, max_tokens=budget))
                 except:
                     pass
             
             # 결과 반환
             if results:
-                final_result = "\n\n".join(results)
-                # 최종 결과도 길이 제한 (타임아웃 방지)
-                if len(final_result) > 2000:
-                    final_result = final_result[:1000] + "\n\n... (결과가 너무 길어 중략) ...\n\n" + final_result[-1000:]
-                return final_result
+                return "\n\n".join(results)
             else:
                 return "✅ 실행 완료"
                 
         except Exception as e:
-            sys.stdout = old_stdout
             error_msg = str(e)
             # 에러 메시지도 길이 제한
             if len(error_msg) > 500:
                 error_msg = error_msg[:500] + "..."
             return f"❌ 에러: {error_msg}"
     
-    def _format_result(self, result_value):
-        """결과 포맷팅 (간결 버전)"""
-        if isinstance(result_value, pd.DataFrame):
-            # 간결한 요약만
-            summary = f"DataFrame({result_value.shape[0]}행 x {result_value.shape[1]}컬럼)"
-            # 작은 DataFrame만 내용 표시
-            if result_value.shape[0] <= 5 and result_value.shape[1] <= 5:
-                summary += f"\n{result_value.to_string()}"
-            return summary
-        elif isinstance(result_value, pd.Series):
-            summary = f"Series(길이 {len(result_value)})"
-            if len(result_value) <= 10:
-                summary += f"\n{result_value.to_string()}"
-            return summary
-        else:
-            result_str = str(result_value)
-            # 긴 결과는 잘라내기
-            if len(result_str) > 1000:
-                result_str = result_str[:500] + "\n...(중략)..." + result_str[-500:]
-            return result_str
+    def _exec_globals(self, code: str, frame: Optional[pd.DataFrame], print_fn) -> Dict[str, Any]:
+        """코드 실행용 globals (허용된 내장 함수만, 워크스페이스 데이터셋은 참조된 것만)"""
+        safe_globals = {
+            "pd": pd,
+            "np": np,
+            "df": frame,
+            "__builtins__": {
+                "len": len, "sum": sum, "max": max, "min": min,
+                "round": round, "print": print_fn, "str": str,
+                "int": int, "float": float, "list": list, "dict": dict,
+                "abs": abs, "any": any, "all": all,
+                "range": range, "enumerate": enumerate, "sorted": sorted,
+                "zip": zip, "map": map, "filter": filter,
+                "set": set, "tuple": tuple, "bool": bool,
+            }
+        }
+        if self.workspace:
+            # 코드가 참조하는 데이터셋만 로드해서 변수로 제공
+            safe_globals.update(self.workspace.namespace(code))
+        return safe_globals
+    
+    def _evaluate(self, code: str, frame: pd.DataFrame) -> Any:
+        """frame을 df로 코드를 실행하고 결과 값 반환 (print 출력은 버림, 근사 모드용)"""
+        safe_globals = self._exec_globals(code, frame, lambda *args, **kwargs: None)
+        local_vars = {}
+        exec(code, safe_globals, local_vars)
+        if "result" in local_vars:
+            return local_vars["result"]
+        if local_vars:
+            return local_vars[list(local_vars.keys())[-1]]
+        return eval(code, safe_globals, {})
+    
+    def _approx_exec(self, code: str, budget: int) -> Optional[str]:
+        """
+        표본에서 실행하고 부트스트랩 신뢰구간을 붙인 Observation 생성
+        
+        Returns:
+            Observation 문자열. 숫자 결과가 아니거나, 행 수에 따라 달라지는 결과(len/sum/count)이거나,
+            표본에서 치우치는 연산(max/min/nunique)이거나, 표본에서 에러가 나거나,
+            신뢰구간이 너무 넓으면 None (호출 측이 전체 데이터로 정확히 계산)
+        """
+        if self.approx.is_biased(code):
+            return None
+        try:
+            with self.profiler.span("exec", measure=True, approx=True):
+                estimate = self.approx.estimate(lambda frame: self._evaluate(code, frame))
+        except Exception:
+            return None
+        if estimate is None:
+            return None
+        if not estimate["precise"]:
+            self._log(f"\n🎯 신뢰구간이 넓어(±{estimate['rel_width']:.1%}) 전체 데이터로 다시 계산합니다.")
+            return None
+        
+        self.approx.stats["approximate"] += 1
+        header = self.approx.header(estimate)
+        remaining = max(budget - estimate_tokens(header), 50)
+        return header + "\n" + self._format_result(self.approx.describe(estimate), max_tokens=remaining)
+    
+    def _format_result(self, result_value, max_tokens: Optional[int] = None):
+        """결과 포맷팅 (타입별 간결 인코딩, 토큰 예산 내)"""
+        with self.profiler.span("encode"):
+            return encode_observation(result_value, max_tokens=max_tokens or self.observation_budget)
     
     def _extract_final_answer(self, response_text: str) -> str:
-        """Final Answer 추출"""
-        if "Final Answer:" in response_text:
-            return response_text.split("Final Answer:")[1].strip()
-        return response_text
+        """Final Answer 추출 (없으면 응답 전체)"""
+        final_answer = parse_react(response_text).final_answer
+        return final_answer if final_answer is not None else response_text
     
     def show_history(self):
         """실행 이력 표시"""
@@ -403,7 +847,8 @@ class EDAAgent:
         print("📜 실행 이력")
         print("="*80)
         for item in self.execution_history:
-            print(f"\n[{item['iteration']}회차]")
+            branch = f"브랜치 {item['branch']} / " if "branch" in item else ""
+            print(f"\n[{branch}{item['iteration']}회차]")
             print(f"코드: {item['code'][:100]}...")
             print(f"결과: {str(item['result'])[:100]}...")
 
@@ -413,6 +858,9 @@ class EDAAgent:
 
 # %% 3-1. 샘플 데이터 생성
 
+# 같은 패턴의 대용량 데이터는 synthetic_data.py로 생성할 수 있습니다.
+#   python synthetic_data.py ecommerce --rows 10000000 --out data/ecommerce_10m.parquet
+
 # 전자상거래 매출 데이터 생성
 # np.random.seed(42)
 
@@ -440,15 +888,24 @@ class EDAAgent:
 
 # %% 3-1. 데이터 파일 로드
 
-df = pd.read_csv("sample_ecommerce.csv")
+# 두 번째 실행부터는 CSV 파싱 없이 .columnar_cache의 Feather 파일을 메모리 맵으로 로드
+df = read_csv_cached("sample_ecommerce.csv")
+
+# 저카디널리티 문자열 → category, 날짜 문자열 → datetime64 (정수는 오버플로 방지를 위해 int64 유지)
+df, memory = compact_dtypes(df)
+print_memory_report(memory)
 print(f"데이터 로드 완료: {df.shape[0]}행 x {df.shape[1]}컬럼")
 print(f"컬럼: {df.columns.tolist()}")
 
+# 프로파일 로드 (Agent가 쓰는 압축된 df의 dtype 기준, 파일 내용과 dtype이 같으면 .profile_cache에서 즉시 로드)
+profile = load_or_build_profile("sample_ecommerce.csv", df=df)
+print(f"프로파일 준비 완료: {profile['sha256'][:12]}")
+
 # %% 3-2. EDA Agent 실행
 
 # Agent 초기화
 chat_model = PotensChatModel()
-eda_agent = EDAAgent(chat_model, df)
+eda_agent = EDAAgent(chat_model, df, profile=profile)
 
 # 실행
 insights = eda_agent.run(
@@ -464,4 +921,143 @@ print(insights)
 
 # %% 3-3. 실행 이력 확인
 
-eda_agent.show_history()
\ No newline at end of file
+eda_agent.show_history()
+# %% 3-4. 병렬 다중 가설 모드 실행
+
+# 플래너가 목표를 가설 3개로 나누고, 브랜치가 동시에 분석한 뒤 병합합니다.
+# (순차 8회 반복 대비, 가장 긴 브랜치 깊이만큼의 시간만 소요)
+parallel_agent = EDAAgent(chat_model, df, profile=profile)
+parallel_insights = parallel_agent.run_parallel(
+    goal="매출 증대를 위한 실행 가능한 비즈니스 인사이트 3개를 찾아주세요",
+    num_branches=3,
+    max_iterations=4
+)
+
+print("\n" + "="*80)
+print("📊 최종 인사이트 (병렬 모드)")
+print("="*80)
+print(parallel_insights)
+
+parallel_agent.show_history()
+
+# %% 3-5. 멀티 액션 모드 실행
+
+# 한 응답에 독립적인 분석 코드 여러 개를 받아 병렬 실행 → LLM 호출 횟수 감소
+multi_agent = EDAAgent(chat_model, df, profile=profile, multi_action=True)
+multi_insights = multi_agent.run(
+    goal="매출 증대를 위한 실행 가능한 비즈니스 인사이트 3개를 찾아주세요",
+    max_iterations=4
+)
+print(multi_insights)
+multi_agent.show_history()
+
+# %% 3-6. 체크포인트 + 세션 복원
+
+# 매 단계가 .agent_checkpoints/eda-ecommerce.jsonl에 기록됩니다.
+checkpoint = AgentCheckpoint("eda-ecommerce")
+durable_agent = EDAAgent(chat_model, df, profile=profile, checkpoint=checkpoint)
+durable_insights = durable_agent.run(
+    goal="매출 증대를 위한 실행 가능한 비즈니스 인사이트 3개를 찾아주세요",
+    max_iterations=8
+)
+
+# (커널 재시작/중단 후) 같은 세션 ID로 새 Agent를 만들고 이어서 실행
+restored_agent = EDAAgent(chat_model, df, profile=profile, checkpoint=AgentCheckpoint("eda-ecommerce"))
+print(restored_agent.resume())
+
+# %% 3-7. 실행 프로파일 (LLM-bound vs compute-bound)
+
+# 반복별 LLM 대기 / 큐 대기 / 코드 추출 / 실행 / 인코딩 시간과 메모리 기록
+profiler = RunProfiler()
+profiled_agent = EDAAgent(chat_model, df, profile=profile, multi_action=True, profiler=profiler)
+profiled_agent.run(
+    goal="매출 증대를 위한 실행 가능한 비즈니스 인사이트 3개를 찾아주세요",
+    max_iterations=4
+)
+profiler.print_summary()
+profiler.save_chrome_trace("eda_trace.json")  # chrome://tracing 또는 ui.perfetto.dev
+profiler.close()
+
+# %% 3-8. 스트리밍 실행 (응답을 받으면서 완성된 코드부터 실행)
+
+streaming_agent = EDAAgent(chat_model, df, profile=profile, multi_action=True, stream_actions=True)
+print(streaming_agent.run(
+    goal="매출 증대를 위한 실행 가능한 비즈니스 인사이트 3개를 찾아주세요",
+    max_iterations=4
+))
+
+# %% 3-9. 작업 런타임으로 여러 EDA 실행 (대량 작업 우선순위)
+
+# 여러 목표를 작업으로 제출하면 공유 워커 풀에서 테넌트 한도(batch: 2개)만큼씩 실행됩니다.
+runtime = AgentRuntime(chat_model=chat_model, max_workers=4, tenant_limits={"batch": 2})
+goals = [
+    "매출 증대를 위한 실행 가능한 비즈니스 인사이트 3개를 찾아주세요",
+    "고객 세그먼트별 구매 패턴의 차이를 분석해주세요",
+    "이상치나 데이터 품질 문제를 찾아주세요",
+]
+job_ids = [
+    runtime.submit(
+        lambda goal=goal: EDAAgent(runtime.chat_model, df, profile=profile, executor=runtime.executor,
+                                   print_fn=runtime.print).run(goal, max_iterations=6),
+        tenant="batch", priority=PRIORITY_BULK, name=goal[:20],
+    )
+    for goal in goals
+]
+
+# 첫 작업의 진행 로그를 실시간으로 보기
+for event in runtime.stream(job_ids[0]):
+    if event["type"] == "log":
+        print(event["data"])
+
+for job_id in job_ids:
+    print(runtime.result(job_id))
+print(runtime.list_jobs())
+runtime.shutdown()
+
+# %% 3-10. 여러 데이터셋 워크스페이스 (필요할 때만 로드)
+
+# 데이터 폴더의 CSV를 이름으로 등록만 하고, 코드가 sample_hr 등을 참조할 때 로드합니다.
+# (3-1과 같은 폴더 기준)
+workspace = DataWorkspace(memory_budget_mb=64)
+workspace.register_directory(".")
+print(workspace.schema_summary())
+
+workspace_agent = EDAAgent(chat_model, workspace=workspace)
+print(workspace_agent.run(
+    goal="sample_hr와 sample_ecommerce 데이터의 연령 분포를 비교하고 차이를 설명해주세요",
+    max_iterations=6
+))
+print(workspace.report())
+
+# %% 3-11. 근사 우선 모드 (표본 + 신뢰구간)
+
+# 층화 표본에서 먼저 계산하고, 신뢰구간 상대 반폭이 5%를 넘거나 exact = True면 전체 데이터로 계산합니다.
+# (sample_ecommerce.csv는 작아서 표본 크기를 줄여 동작만 확인)
+approx = ApproxEngine.from_frame(df, sample_size=300, strata="region", max_rel_width=0.05)
+approx_agent = EDAAgent(chat_model, df, profile=profile, approx=approx)
+print(approx_agent.run(
+    goal="어느 지역의 평점이 더 높은지, 프리미엄 고객이 구매 금액을 2배 더 쓰는지 확인해주세요",
+    max_iterations=6
+))
+print(approx.stats)
+
+# %% 3-12. 대용량 파일 파티션 병렬 모드
+
+# 파일을 메모리에 올리지 않고 파티션(여기서는 4KB씩)으로 나눠 워커 풀에서 집계합니다.
+# 결과는 pandas와 같은 모양이라 Observation도 메모리 모드와 같습니다.
+# 이 데모는 스레드 풀을 씁니다: 프로세스 풀(use_processes=True)은 spawn 방식(Windows/macOS)에서
+# 워커가 이 파일을 다시 import해 위의 LLM 셀까지 다시 실행하므로,
+# 별도 스크립트의 `if __name__ == "__main__":` 아래에서만 사용하세요.
+big_df = PartitionedFrame.from_path("sample_ecommerce.csv", partition_bytes=4096, max_workers=4,
+                                    use_processes=False)
+print(big_df, big_df.shape)
+print(big_df.query("age >= 40").groupby("region")["total_amount"].agg(["mean", "count"]))
+print(df[df["age"] >= 40].groupby("region")["total_amount"].agg(["mean", "count"]))
+
+partitioned_agent = EDAAgent(chat_model, big_df)
+print(partitioned_agent.run(
+    goal="지역별, 프리미엄 여부별 구매 금액 차이를 분석해주세요",
+    max_iterations=6
+))
+print(big_df.stats)
+big_df.close()
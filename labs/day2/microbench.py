@@ -0,0 +1,262 @@
+# %% 0. 파일 헤더 및 설명
+"""
+Agent 핫패스 마이크로벤치마크 (기준선 비교로 회귀 감지)
+
+매 반복마다 실행되는 코드 추출, Observation 포맷팅, exec 환경 구성, stdout 캡처,
+_messages_to_prompt를 큰 입력(50턴 대화, 100KB 응답, 500만 행 결과 프레임)으로 측정합니다.
+
+- 대상: potens_wrapper.py, lab4_eda_agent.py, lab2_pandas_psuedo_agent.py, lab3-2_streamlit_psuedo_agent.py
+  (랩 스크립트는 agent_benchmark.load_lab으로 정의만 로드)
+- 워밍업 후 반복 측정 (중앙값/최솟값/표준편차), 메모리는 별도 1회 실행에서 tracemalloc 최대값
+- --save-baseline으로 기준선 저장, --baseline으로 비교해 임계값 이상 느려지거나
+  메모리를 더 쓰면 종료 코드 1 (CI에서 실패 처리)
+
+사용법:
+    python microbench.py --save-baseline microbench_baseline.json
+    python microbench.py --baseline microbench_baseline.json --threshold 0.25
+    python microbench.py --quick --filter parse          # 작은 입력, 이름에 parse가 들어간 것만
+"""
+
+import sys
+import json
+import time
+import argparse
+import statistics
+import tracemalloc
+from types import SimpleNamespace
+from typing import Any, Callable, Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+from langchain_core.messages import AIMessage, HumanMessage, SystemMessage
+
+from potens_wrapper import PotensChatModel, REACT_STOP, _iter_until_stop
+from react_parser import parse_react
+from agent_benchmark import load_lab
+
+DEFAULT_THRESHOLD = 0.25
+
+# 이보다 작은 차이는 측정 잡음으로 보고 회귀로 치지 않음
+MIN_TIME_DELTA_MS = 0.05
+MIN_MEMORY_DELTA_KB = 64
+
+# %% 1. 측정
+
+def measure(fn: Callable[[], Any], warmup: int = 3, repeat: int = 20, track_memory: bool = True) -> Dict[str, float]:
+    """
+    함수 하나의 실행 시간과 최대 메모리 측정
+
+    Args:
+        fn: 인자 없는 함수
+        warmup: 측정 전 버리는 실행 횟수 (캐시/지연 초기화 영향 제거)
+        repeat: 측정 실행 횟수
+        track_memory: True면 tracemalloc으로 1회 더 실행해 최대 메모리 측정 (시간 측정과 분리)
+
+    Returns:
+        {"median_ms", "min_ms", "stdev_ms", "peak_kb"}
+    """
+    for _ in range(warmup):
+        fn()
+
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        timings.append((time.perf_counter() - start) * 1000)
+
+    peak_kb = 0.0
+    if track_memory:
+        started = not tracemalloc.is_tracing()
+        if started:
+            tracemalloc.start()
+        tracemalloc.reset_peak()
+        before = tracemalloc.get_traced_memory()[0]
+        fn()
+        peak_kb = (tracemalloc.get_traced_memory()[1] - before) / 1024
+        if started:
+            tracemalloc.stop()
+
+    return {
+        "median_ms": round(statistics.median(timings), 4),
+        "min_ms": round(min(timings), 4),
+        "stdev_ms": round(statistics.stdev(timings), 4) if len(timings) > 1 else 0.0,
+        "peak_kb": round(peak_kb, 1),
+    }
+
+# %% 2. 입력 데이터
+
+def make_history(turns: int) -> List[Any]:
+    """시스템 프롬프트 + turns번의 (ReAct 응답, Observation) 대화"""
+    messages = [SystemMessage(content="당신은 데이터 분석 전문가입니다.\n" * 40)]
+    for i in range(turns):
+        messages.append(AIMessage(content=(
+            f"Thought: {i}번째 분석으로 지역별 평균 구매액을 확인합니다.\n"
+            "Action: python_repl\nAction Input:\n```python\n"
+            "result = df.groupby('region')['total_amount'].agg(['mean', 'count'])\n```"
+        )))
+        messages.append(HumanMessage(content="Observation: " + "서울 | 364223.3 | 308\n" * 20))
+    return messages
+
+
+def make_response(kb: int) -> str:
+    """약 kb KB 크기의 ReAct 응답 (생각/코드 블록 반복 + Final Answer)"""
+    block = (
+        "Thought: 연령대별 구매 횟수를 비교합니다. 평균과 분산을 함께 봅니다.\n"
+        "Action: python_repl\nAction Input:\n```python\n"
+        "counts = df.groupby(df['age'] // 10 * 10)['purchase_count'].agg(['mean', 'std'])\n"
+        "# 주석 줄\nresult = counts\n```\n"
+    )
+    repeat = max(1, kb * 1024 // len(block.encode("utf-8")))
+    return block * repeat + "Final Answer: 40대의 구매 횟수가 가장 많습니다."
+
+
+def make_frame(rows: int, seed: int = 0) -> pd.DataFrame:
+    """rows행 결과 프레임 (숫자, 범주, 문자열 컬럼)"""
+    rng = np.random.default_rng(seed)
+    return pd.DataFrame({
+        "customer_id": np.arange(rows),
+        "age": rng.integers(20, 70, rows),
+        "region": pd.Categorical(rng.choice(["서울", "경기", "부산", "대구", "기타"], rows)),
+        "total_amount": rng.exponential(300_000, rows),
+        "avg_rating": rng.uniform(1, 5, rows).round(2),
+    })
+
+
+def _chunks(text: str, size: int = 64) -> List[str]:
+    return [text[i:i + size] for i in range(0, len(text), size)]
+
+# %% 3. 벤치마크 목록
+
+def build_benchmarks(turns: int = 50, response_kb: int = 100, rows: int = 5_000_000) -> Dict[str, Callable[[], Any]]:
+    """
+    {이름: 인자 없는 함수} (입력은 미리 만들어 두고 측정 대상 호출만 포함)
+
+    이름에 입력 크기를 넣어 크기가 다른 기준선과는 비교되지 않게 합니다.
+    """
+    lab4 = load_lab("lab4_eda_agent.py")
+    lab2 = load_lab("lab2_pandas_psuedo_agent.py")
+    lab32 = load_lab("lab3-2_streamlit_psuedo_agent.py")
+    # Streamlit 세션 밖에서 실행하므로 디버그 출력만 끈 세션 상태로 교체
+    lab32["st"] = SimpleNamespace(session_state=SimpleNamespace(debug_mode=False))
+
+    history = make_history(turns)
+    response = make_response(response_kb)
+    response_chunks = _chunks(response)
+    frame = make_frame(rows)
+    small = frame.head(1000)
+
+    chat_model = PotensChatModel(api_key="microbench")
+    eda_agent = lab4["EDAAgent"](None, small, verbose=False)
+    pandas_agent = lab2["PandasPseudoAgent"](None, small)
+    print_code = "for i in range(1000):\n    print(i)"
+
+    return {
+        # potens_wrapper
+        f"potens._messages_to_prompt[{turns}turns]": lambda: chat_model._messages_to_prompt(history),
+        f"potens._iter_until_stop[{response_kb}KB]": lambda: "".join(_iter_until_stop(response_chunks, REACT_STOP)),
+        # 코드 추출
+        f"react_parser.parse_react[{response_kb}KB]": lambda: parse_react(response, strip_comments=True),
+        f"lab2._extract_script[{response_kb}KB]": lambda: pandas_agent._extract_script(response),
+        f"lab3-2.extract_code[{response_kb}KB]": lambda: lab32["extract_code"](response),
+        # Observation 포맷팅
+        f"lab4._format_result[{rows}rows]": lambda: eda_agent._format_result(frame),
+        f"lab4._format_result.series[{rows}rows]": lambda: eda_agent._format_result(frame["total_amount"]),
+        f"lab3-2.format_result[{rows}rows]": lambda: lab32["format_result"](frame),
+        # exec 환경 구성 / 실행
+        "lab4._exec_globals": lambda: eda_agent._exec_globals("result = 1", small, print),
+        "lab2._safe_globals": lambda: pandas_agent._safe_globals(),
+        "lab4._safe_exec[result=1]": lambda: eda_agent._safe_exec("result = 1"),
+        "lab2._run_code[result=1]": lambda: pandas_agent._run_code("result = 1"),
+        # stdout 캡처
+        "lab4._safe_exec[print x1000]": lambda: eda_agent._safe_exec(print_code),
+        "lab3-2.safe_exec[print x1000]": lambda: lab32["safe_exec"](print_code, {"df": small}),
+    }
+
+# %% 4. 기준선 비교
+
+def compare(results: Dict[str, Dict[str, float]], baseline: Dict[str, Dict[str, float]],
+            threshold: float = DEFAULT_THRESHOLD) -> List[str]:
+    """기준선보다 threshold 이상 느려지거나 메모리를 더 쓴 항목 설명 목록"""
+    regressions = []
+    for name, result in results.items():
+        base = baseline.get(name)
+        if base is None:
+            continue
+        if result["median_ms"] > base["median_ms"] * (1 + threshold) \
+                and result["median_ms"] - base["median_ms"] > MIN_TIME_DELTA_MS:
+            ratio = result["median_ms"] / base["median_ms"] if base["median_ms"] else float("inf")
+            regressions.append(f"{name}: {base['median_ms']:.3f}ms → {result['median_ms']:.3f}ms ({ratio:.2f}배)")
+        if result["peak_kb"] > base["peak_kb"] * (1 + threshold) \
+                and result["peak_kb"] - base["peak_kb"] > MIN_MEMORY_DELTA_KB:
+            regressions.append(f"{name}: 메모리 {base['peak_kb']:.0f}KB → {result['peak_kb']:.0f}KB")
+    return regressions
+
+
+def print_results(results: Dict[str, Dict[str, float]], baseline: Optional[Dict[str, Dict[str, float]]] = None):
+    width = max(len(name) for name in results)
+    header = f"{'benchmark':<{width}} {'median(ms)':>11} {'min(ms)':>10} {'stdev':>8} {'peak(KB)':>10}"
+    if baseline:
+        header += f" {'vs base':>8}"
+    print(header)
+    print("-" * len(header))
+    for name, r in results.items():
+        line = f"{name:<{width}} {r['median_ms']:>11.3f} {r['min_ms']:>10.3f} {r['stdev_ms']:>8.3f} {r['peak_kb']:>10.1f}"
+        if baseline and name in baseline and baseline[name]["median_ms"]:
+            line += f" {r['median_ms'] / baseline[name]['median_ms']:>7.2f}x"
+        print(line)
+
+# %% 5. CLI
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Agent 핫패스 마이크로벤치마크")
+    parser.add_argument("--filter", help="이름에 이 문자열이 들어간 벤치마크만 실행")
+    parser.add_argument("--quick", action="store_true", help="작은 입력 (10턴, 10KB, 10만 행)")
+    parser.add_argument("--warmup", type=int, default=3)
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--no-memory", action="store_true", help="메모리 측정 생략")
+    parser.add_argument("--save-baseline", help="결과를 기준선 JSON으로 저장")
+    parser.add_argument("--baseline", help="비교할 기준선 JSON")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD,
+                        help=f"허용하는 느려짐 비율 (기본 {DEFAULT_THRESHOLD})")
+    args = parser.parse_args(argv)
+
+    sizes = {"turns": 10, "response_kb": 10, "rows": 100_000} if args.quick else {}
+    print("⏳ 입력 데이터 준비 중...")
+    benchmarks = build_benchmarks(**sizes)
+    if args.filter:
+        benchmarks = {name: fn for name, fn in benchmarks.items() if args.filter in name}
+    if not benchmarks:
+        parser.error("실행할 벤치마크가 없습니다")
+
+    results = {}
+    for name, fn in benchmarks.items():
+        print(f"▶️ {name}")
+        results[name] = measure(fn, warmup=args.warmup, repeat=args.repeat, track_memory=not args.no_memory)
+
+    baseline = None
+    if args.baseline:
+        with open(args.baseline, "r", encoding="utf-8") as f:
+            baseline = json.load(f)["results"]
+
+    print()
+    print_results(results, baseline)
+
+    if args.save_baseline:
+        with open(args.save_baseline, "w", encoding="utf-8") as f:
+            json.dump({"python": sys.version.split()[0], "pandas": pd.__version__, "results": results},
+                      f, ensure_ascii=False, indent=2)
+        print(f"\n💾 기준선 저장: {args.save_baseline}")
+
+    if baseline is not None:
+        regressions = compare(results, baseline, args.threshold)
+        if regressions:
+            print(f"\n❌ 기준선 대비 {args.threshold:.0%} 넘게 나빠진 핫패스:")
+            for message in regressions:
+                print(f"   - {message}")
+            return 1
+        print(f"\n✅ 기준선 대비 회귀 없음 (허용 {args.threshold:.0%})")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,332 @@
+# %% 0. 파일 헤더 및 설명
+"""
+타입별 간결한 Observation 인코더 (토큰 예산 기반)
+
+str(result), to_string(), 1000/2000자 앞뒤 자르기 대신
+결과 타입에 맞게 짧게 렌더링하여 프롬프트 토큰을 아끼기 위한 모듈입니다.
+
+- DataFrame / Series / numpy 배열 / dict / list / 스칼라 지원
+- DataFrame·Series는 CSV 형태로, 상위 k행 + 하위 k행을 예산이 허락하는 만큼 채움
+- 실수는 반올림, 잘린 행/컬럼/글자는 "(N행 생략)"처럼 명시
+- 숫자 중간에서 잘리는 일 없이 줄 단위로만 생략
+
+사용법:
+    from observation_encoder import encode_observation
+
+    observation = encode_observation(result, max_tokens=400)
+"""
+
+import math
+from typing import Any, List, Optional, Tuple
+
+import pandas as pd
+import numpy as np
+
+DEFAULT_MAX_TOKENS = 400
+# 매우 큰 결과(수백만 행)에서도 렌더링 비용이 일정하도록, 앞/뒤 후보 행 수 상한
+MAX_CANDIDATE_ROWS = 200
+
+# %% 1. 토큰 추정 및 숫자 포맷
+
+def estimate_tokens(text: str) -> int:
+    """
+    토큰 수 대략 추정 (영문/숫자 약 4자당 1토큰, 한글 등 비ASCII 약 1.5자당 1토큰)
+    """
+    ascii_count = sum(1 for ch in text if ord(ch) < 128)
+    other_count = len(text) - ascii_count
+    return math.ceil(ascii_count / 4 + other_count / 1.5)
+
+
+def format_number(value: Any, digits: int = 2) -> str:
+    """숫자를 짧게 표현 (정수는 그대로, 실수는 반올림 후 불필요한 0 제거)"""
+    if isinstance(value, (bool, np.bool_)):
+        return str(bool(value))
+    if isinstance(value, (int, np.integer)):
+        return str(int(value))
+    if isinstance(value, (float, np.floating)):
+        value = float(value)
+        if math.isnan(value):
+            return "NaN"
+        if math.isinf(value):
+            return "inf" if value > 0 else "-inf"
+        if value.is_integer():
+            return str(int(value))
+        if abs(value) >= 1:
+            return f"{value:.{digits}f}".rstrip("0").rstrip(".")
+        return f"{value:.{digits + 1}g}"
+    return str(value)
+
+
+def _format_cell(value: Any, digits: int, max_chars: int = 40) -> str:
+    """CSV 셀 하나를 포맷 (쉼표/줄바꿈이 있으면 따옴표 처리, 긴 문자열은 자름)"""
+    if value is None or (not isinstance(value, str) and pd.api.types.is_scalar(value) and pd.isna(value)):
+        return ""
+    text = format_number(value, digits)
+    if len(text) > max_chars:
+        text = text[:max_chars - 1] + "…"
+    if any(ch in text for ch in ",\"\n"):
+        text = '"' + text.replace('"', "'").replace("\n", " ") + '"'
+    return text
+
+
+# %% 2. 행 선택 (상위 k + 하위 k를 예산 내에서 채우기)
+
+def _fill_rows(
+    header_lines: List[str],
+    head_lines: List[str],
+    tail_lines: List[str],
+    total_rows: int,
+    max_tokens: int,
+    unit: str = "행",
+) -> str:
+    """
+    헤더 + 앞쪽/뒤쪽 행을 번갈아 추가하며 예산을 최대한 채움
+
+    Args:
+        header_lines: 항상 포함할 줄 (요약, 컬럼명)
+        head_lines: 앞쪽 행 후보 (순서대로)
+        tail_lines: 뒤쪽 행 후보 (마지막 행부터 역순, head_lines와 겹치지 않음)
+        total_rows: 전체 행 수 (생략 개수 계산용)
+        max_tokens: 토큰 예산
+        unit: 생략 표시 단위 ("행", "줄")
+    """
+    used = sum(estimate_tokens(line) + 1 for line in header_lines)
+    # 생략 표시 줄의 비용을 미리 확보
+    used += estimate_tokens(f"... ({total_rows}{unit} 생략) ...") + 1
+
+    head: List[str] = []
+    tail: List[str] = []
+    while True:
+        # 앞쪽 우선, 같은 개수가 되도록 번갈아 추가
+        if len(head) <= len(tail) and len(head) < len(head_lines):
+            target, line = head, head_lines[len(head)]
+        elif len(tail) < len(tail_lines):
+            target, line = tail, tail_lines[len(tail)]
+        elif len(head) < len(head_lines):
+            target, line = head, head_lines[len(head)]
+        else:
+            break
+
+        cost = estimate_tokens(line) + 1
+        if used + cost > max_tokens:
+            break
+        used += cost
+        target.append(line)
+
+    lines = list(header_lines) + head
+    omitted = total_rows - len(head) - len(tail)
+    if omitted > 0:
+        lines.append(f"... ({omitted}{unit} 생략) ...")
+    lines.extend(reversed(tail))
+    return "\n".join(lines)
+
+
+def _candidate_positions(n: int) -> Tuple[List[int], List[int]]:
+    """앞쪽/뒤쪽 후보 행 위치 (뒤쪽은 마지막 행부터 역순, 겹치지 않게)"""
+    k = min(n, MAX_CANDIDATE_ROWS)
+    head = list(range(k))
+    tail = [n - 1 - i for i in range(min(k, n - k))] if n > k else []
+    return head, tail
+
+
+# %% 3. 타입별 인코더
+
+def _encode_dataframe(df: pd.DataFrame, max_tokens: int, digits: int) -> str:
+    """DataFrame → 요약 한 줄 + CSV 헤더 + 상위/하위 행"""
+    n_rows, n_cols = df.shape
+    show_index = not isinstance(df.index, pd.RangeIndex)
+
+    # 컬럼이 너무 많으면 예산의 1/3 안에서 앞쪽 컬럼만 표시
+    columns = [str(c) for c in df.columns]
+    kept = []
+    budget = max(max_tokens // 3, 1)
+    used = 0
+    for col in columns:
+        cost = estimate_tokens(col) + 1
+        if kept and used + cost > budget:
+            break
+        kept.append(col)
+        used += cost
+    sub = df.iloc[:, :len(kept)]
+
+    summary = f"DataFrame({n_rows}행 x {n_cols}컬럼)"
+    if len(kept) < n_cols:
+        summary += f" (앞 {len(kept)}개 컬럼만 표시, {n_cols - len(kept)}개 생략)"
+    header = ",".join(([str(df.index.name or "")] if show_index else []) + kept)
+
+    head_pos, tail_pos = _candidate_positions(n_rows)
+
+    def row_lines(positions: List[int]) -> List[str]:
+        block = sub.iloc[positions]
+        lines = []
+        for idx, row in zip(block.index, block.itertuples(index=False, name=None)):
+            values = [_format_cell(v, digits) for v in row]
+            if show_index:
+                values.insert(0, _format_cell(idx, digits))
+            lines.append(",".join(values))
+        return lines
+
+    return _fill_rows(
+        [summary, header],
+        row_lines(head_pos),
+        row_lines(tail_pos),
+        n_rows,
+        max_tokens,
+    )
+
+
+def _encode_series(series: pd.Series, max_tokens: int, digits: int) -> str:
+    """Series → 요약 한 줄 + "인덱스,값" 행"""
+    n = len(series)
+    name = f", name={series.name}" if series.name is not None else ""
+    summary = f"Series(길이 {n}{name}, dtype={series.dtype})"
+
+    head_pos, tail_pos = _candidate_positions(n)
+
+    def row_lines(positions: List[int]) -> List[str]:
+        block = series.iloc[positions]
+        return [
+            f"{_format_cell(idx, digits)},{_format_cell(value, digits)}"
+            for idx, value in zip(block.index, block.tolist())
+        ]
+
+    return _fill_rows(
+        [summary],
+        row_lines(head_pos),
+        row_lines(tail_pos),
+        n,
+        max_tokens,
+    )
+
+
+def _encode_array(arr: np.ndarray, max_tokens: int, digits: int) -> str:
+    """numpy 배열 → 1차원은 값 목록, 2차원은 DataFrame처럼, 그 이상은 평탄화"""
+    summary = f"ndarray(shape={arr.shape}, dtype={arr.dtype})"
+    budget = max_tokens - estimate_tokens(summary) - 1
+    if arr.ndim == 2:
+        body = _encode_dataframe(pd.DataFrame(arr), budget, digits)
+        # DataFrame 요약 줄 대신 ndarray 요약 사용
+        return summary + "\n" + body.split("\n", 1)[1]
+
+    flat = arr.ravel()
+    if flat.size <= MAX_CANDIDATE_ROWS * 2:
+        return summary + "\n" + _encode_sequence(flat.tolist(), budget, digits)
+    candidates = flat[:MAX_CANDIDATE_ROWS].tolist() + flat[-MAX_CANDIDATE_ROWS:].tolist()
+    return summary + "\n" + _encode_sequence(candidates, budget, digits, total=int(flat.size))
+
+
+def _encode_sequence(values: List[Any], max_tokens: int, digits: int, total: Optional[int] = None) -> str:
+    """
+    리스트/튜플/1차원 배열 → "[a, b, c, ...(N개 생략)..., y, z]" (앞/뒤를 예산만큼)
+
+    total이 len(values)보다 크면 values는 (앞쪽 후보 + 뒤쪽 후보)를 이어 붙인 것으로 간주
+    """
+    if total is None or total == len(values):
+        total = len(values)
+        head_src, tail_src = values, values[::-1]
+    else:
+        half = len(values) // 2
+        head_src, tail_src = values[:half], values[half:][::-1]
+
+    def cell(value: Any) -> str:
+        return repr(value) if isinstance(value, str) else _format_cell(value, digits)
+
+    used = estimate_tokens(f"[...({total}개 생략)...]")
+    head: List[str] = []
+    tail: List[str] = []
+    while len(head) + len(tail) < total:
+        if len(head) <= len(tail) and len(head) < len(head_src):
+            target, value = head, head_src[len(head)]
+        elif len(tail) < len(tail_src):
+            target, value = tail, tail_src[len(tail)]
+        else:
+            break
+        text = cell(value)
+        cost = estimate_tokens(text) + 1
+        if used + cost > max_tokens:
+            break
+        used += cost
+        target.append(text)
+
+    omitted = total - len(head) - len(tail)
+    parts = head + ([f"...({omitted}개 생략)..."] if omitted > 0 else []) + list(reversed(tail))
+    return "[" + ", ".join(parts) + "]"
+
+
+def _encode_dict(data: dict, max_tokens: int, digits: int) -> str:
+    """dict → "key: value" 줄 (값은 각자 작은 예산으로 인코딩)"""
+    lines = [f"dict(키 {len(data)}개)"]
+    used = estimate_tokens(lines[0]) + 1
+    per_value = max(max_tokens // max(len(data), 1), 20)
+    for idx, (key, value) in enumerate(data.items()):
+        rendered = encode_observation(value, max_tokens=per_value, digits=digits)
+        line = f"{key}: {rendered}"
+        cost = estimate_tokens(line) + 1
+        if used + cost > max_tokens:
+            lines.append(f"... ({len(data) - idx}개 키 생략)")
+            break
+        lines.append(line)
+        used += cost
+    return "\n".join(lines)
+
+
+def truncate_text(text: str, max_tokens: int = DEFAULT_MAX_TOKENS) -> str:
+    """
+    긴 텍스트(print 출력 등)를 줄 단위로 앞/뒤만 남기고 생략 표시
+
+    줄 하나가 예산보다 길면 그 줄만 글자 단위로 자름
+    """
+    if estimate_tokens(text) <= max_tokens:
+        return text
+    lines = text.split("\n")
+    if len(lines) == 1:
+        keep = max(max_tokens * 2, 10)
+        # 숫자 중간에서 자르지 않도록 마지막 공백/쉼표 위치에서 자름
+        cut = max(text.rfind(" ", 0, keep), text.rfind(",", 0, keep))
+        if cut > keep // 2:
+            keep = cut
+        return text[:keep] + f" ...({len(text) - keep}자 생략)"
+
+    head_pos, tail_pos = _candidate_positions(len(lines))
+    return _fill_rows(
+        [],
+        [lines[p] for p in head_pos],
+        [lines[p] for p in tail_pos],
+        len(lines),
+        max_tokens,
+        unit="줄",
+    )
+
+
+# %% 4. 공통 진입점
+
+def encode_observation(value: Any, max_tokens: int = DEFAULT_MAX_TOKENS, digits: int = 2) -> str:
+    """
+    실행 결과를 타입에 맞게 간결한 문자열로 인코딩
+
+    Args:
+        value: 코드 실행 결과 (DataFrame, Series, ndarray, dict, list, 스칼라, 문자열 등)
+        max_tokens: 토큰 예산 (대략적인 추정 기준)
+        digits: 실수 반올림 자릿수
+
+    Returns:
+        Observation으로 보낼 문자열
+    """
+    if isinstance(value, pd.DataFrame):
+        return _encode_dataframe(value, max_tokens, digits)
+    if isinstance(value, pd.Series):
+        return _encode_series(value, max_tokens, digits)
+    if isinstance(value, pd.Index):
+        return _encode_series(value.to_series(index=range(len(value))), max_tokens, digits).replace(
+            "Series(", "Index(", 1)
+    if isinstance(value, np.ndarray):
+        return _encode_array(value, max_tokens, digits)
+    if isinstance(value, dict):
+        return _encode_dict(value, max_tokens, digits)
+    if isinstance(value, (list, tuple, set)):
+        return _encode_sequence(list(value), max_tokens, digits)
+    if isinstance(value, str):
+        return truncate_text(value, max_tokens)
+    if isinstance(value, (int, float, np.integer, np.floating, np.bool_)):
+        return format_number(value, digits)
+    return truncate_text(str(value), max_tokens)
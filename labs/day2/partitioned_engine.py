@@ -0,0 +1,651 @@
+# %% 0. 파일 헤더 및 설명
+"""
+메모리보다 큰 CSV/Parquet용 파티션 병렬 실행 엔진
+
+pd.read_csv는 파일 전체를 메모리에 올리고, Agent가 만든 코드는 코어 하나에서만 실행됩니다.
+이 모듈은 데이터셋을 파티션(CSV는 줄 경계 기준 바이트 구간, Parquet은 row group)으로 나누고,
+분해 가능한 연산을 프로세스 풀에서 파티션별로 실행한 뒤 결과를 합칩니다.
+
+지원 연산 (결과는 pandas와 같은 모양의 Series/DataFrame):
+- 필터: df.query("age > 30")  (여러 번 이어서 가능, 지연 실행)
+- 컬럼 선택: df[["a", "b"]], df["a"]
+- 그룹 집계: df.groupby(by)[col].agg(sum/count/size/min/max/mean/var/std), .mean() 등
+- df[col].value_counts(), .sum()/.mean()/.min()/.max()/.count()/.std()/.var()/.nunique()
+- len(df), df.shape, df.columns, df.dtypes, df.head(), df.isnull().sum(), df.describe() (큰 파티션의 분위수는 스케치 근사)
+
+그 외 연산은 (필요한 컬럼만) 전체를 DataFrame으로 합친 뒤 pandas로 실행합니다 (stats["fallbacks"]).
+
+주의:
+- CSV 파티션은 줄바꿈 기준으로 나누므로, 따옴표 안에 줄바꿈이 있는 CSV는 지원하지 않습니다.
+- 프로세스 풀을 쓰므로 스크립트에서는 `if __name__ == "__main__":` 아래에서 실행하세요.
+
+사용법:
+    from partitioned_engine import PartitionedFrame
+
+    df = PartitionedFrame.from_path("transactions_2025.csv")   # 파일은 아직 읽지 않음
+    df.query("region == '서울'").groupby("is_premium")["total_amount"].mean()
+    agent = EDAAgent(chat_model, df)
+"""
+
+import io
+import os
+import glob
+from itertools import repeat
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Any, Dict, List, Optional, Sequence, Union
+
+import numpy as np
+import pandas as pd
+
+DEFAULT_PARTITION_BYTES = 64 * 1024 * 1024
+
+# 파티션 결과를 합쳐서 정확히 계산할 수 있는 집계
+DECOMPOSABLE_AGGS = {"sum", "count", "size", "min", "max", "mean", "var", "std"}
+NUMERIC_AGGS = {"sum", "mean", "var", "std"}
+
+# describe() 분위수 스케치 크기 (파티션의 값이 이보다 많으면 이 개수의 분위수 점으로 요약)
+QUANTILE_SKETCH_POINTS = 1000
+
+# %% 1. 파티션 읽기 / 부분 연산 (워커 프로세스에서 실행)
+
+def _read_partition(spec: Dict[str, Any], columns: Optional[List[str]] = None) -> pd.DataFrame:
+    """파티션 하나를 DataFrame으로 읽기"""
+    if spec["kind"] == "csv":
+        with open(spec["path"], "rb") as f:
+            f.seek(spec["start"])
+            data = f.read(spec["end"] - spec["start"])
+        return pd.read_csv(
+            io.BytesIO(data), header=None, names=spec["names"], usecols=columns, **spec["read_kwargs"]
+        )
+    import pyarrow.parquet as pq
+    parquet = pq.ParquetFile(spec["path"])
+    return parquet.read_row_group(spec["row_group"], columns=columns).to_pandas()
+
+
+def _partial_groupby(frame: pd.DataFrame, by: List[str], columns: List[str], aggs: List[str]) -> pd.DataFrame:
+    """그룹별 부분 통계 (열: (컬럼, 통계) MultiIndex)"""
+    grouped = frame.groupby(by, sort=False)
+    parts = {("__size__", "size"): grouped.size()}
+    for col in columns:
+        series = grouped[col]
+        if {"count", "mean", "var", "std"} & set(aggs):
+            parts[(col, "count")] = series.count()
+        if {"sum", "mean", "var", "std"} & set(aggs):
+            parts[(col, "sum")] = series.sum()
+        if {"var", "std"} & set(aggs):
+            parts[(col, "m2")] = series.var(ddof=0) * series.count()
+        if "min" in aggs:
+            parts[(col, "min")] = series.min()
+        if "max" in aggs:
+            parts[(col, "max")] = series.max()
+    return pd.DataFrame(parts)
+
+
+def _partial_moments(frame: pd.DataFrame) -> pd.DataFrame:
+    """숫자 컬럼별 count/sum/m2/min/max (describe/std 합치기용)"""
+    numeric = frame.select_dtypes("number")
+    count = numeric.count()
+    return pd.DataFrame({
+        "count": count,
+        "sum": numeric.sum(),
+        "m2": numeric.var(ddof=0) * count,
+        "min": numeric.min(),
+        "max": numeric.max(),
+    })
+
+
+def _partial_column(frame: pd.DataFrame, column: str) -> Dict[str, Any]:
+    """컬럼 하나의 count/min/max (+숫자면 sum). 문자열/날짜 컬럼도 dtype 그대로 합칠 수 있게 스칼라로 반환"""
+    series = frame[column].dropna()
+    part = {"count": len(series), "min": None, "max": None}
+    if len(series):
+        part["min"], part["max"] = series.min(), series.max()
+    if pd.api.types.is_numeric_dtype(series):
+        part["sum"] = series.sum()
+    return part
+
+
+def _partial_quantile_sketch(frame: pd.DataFrame, columns: List[str],
+                             points: int = QUANTILE_SKETCH_POINTS) -> Dict[str, tuple]:
+    """
+    숫자 컬럼별 분위수 스케치 (값, 가중치)
+
+    값이 points개 이하면 정렬한 원본(가중치 1)을, 더 많으면 균등 분위수 points개(가중치 = 행 수 / points)를
+    돌려주므로 파티션 크기와 상관없이 워커 → 메인으로 넘어오는 양이 일정합니다.
+    """
+    sketch = {}
+    for col in columns:
+        values = frame[col].dropna().to_numpy(dtype=float)
+        if len(values) <= points:
+            sketch[col] = (np.sort(values), np.ones(len(values)))
+        else:
+            sketch[col] = (np.quantile(values, np.linspace(0, 1, points)), np.full(points, len(values) / points))
+    return sketch
+
+
+_PARTIAL_OPS = {
+    "collect": lambda frame: frame,
+    "count": lambda frame: len(frame),
+    "head": lambda frame, n: frame.head(n),
+    "nulls": lambda frame: frame.isnull().sum(),
+    "value_counts": lambda frame, column, dropna: frame[column].value_counts(dropna=dropna),
+    "unique": lambda frame, column: frame[column].dropna().unique(),
+    "moments": _partial_moments,
+    "column": _partial_column,
+    "quantiles": _partial_quantile_sketch,
+    "groupby": _partial_groupby,
+}
+
+
+def _run_task(spec: Dict[str, Any], filters: List[str], columns: Optional[List[str]],
+              op: str, args: Dict[str, Any]) -> Any:
+    """워커: 파티션 읽기 → 필터 → 컬럼 선택 → 부분 연산"""
+    frame = _read_partition(spec, None if filters else columns)
+    for expr in filters:
+        frame = frame.query(expr)
+    if columns is not None:
+        frame = frame[columns]
+    return _PARTIAL_OPS[op](frame, **args)
+
+# %% 2. 데이터셋 (파티션 목록 + 워커 풀)
+
+class PartitionedDataset:
+    """파티션으로 나눈 파일 하나(또는 Parquet 여러 개)와 파티션 병렬 실행용 풀"""
+
+    def __init__(
+        self,
+        path: str,
+        partition_bytes: int = DEFAULT_PARTITION_BYTES,
+        max_workers: Optional[int] = None,
+        use_processes: bool = True,
+        **read_kwargs,
+    ):
+        """
+        Args:
+            path: CSV 파일, Parquet 파일, 또는 Parquet 파일들이 있는 디렉토리
+            partition_bytes: CSV 파티션 하나의 대략적인 크기
+            max_workers: 워커 수 (기본: CPU 수)
+            use_processes: False면 스레드 풀 사용 (디버깅/작은 파일용)
+            **read_kwargs: pd.read_csv 추가 인자 (sep, encoding 등)
+        """
+        self.path = path
+        self.max_workers = max_workers or os.cpu_count() or 2
+        self.use_processes = use_processes
+        self.stats = {"tasks": 0, "fallbacks": 0}
+        self._pool = None
+        self._row_counts: Dict[tuple, int] = {}
+
+        if os.path.isdir(path) or path.endswith((".parquet", ".pq")):
+            self.specs = self._parquet_specs(path)
+        else:
+            self.specs = self._csv_specs(path, partition_bytes, read_kwargs)
+        self._head: Optional[pd.DataFrame] = None
+
+    @staticmethod
+    def _csv_specs(path: str, partition_bytes: int, read_kwargs: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """헤더 다음부터 partition_bytes마다 다음 줄바꿈 위치에서 자르기"""
+        names = pd.read_csv(path, nrows=0, **read_kwargs).columns.tolist()
+        size = os.path.getsize(path)
+        with open(path, "rb") as f:
+            f.readline()
+            offsets = [f.tell()]
+            while offsets[-1] + partition_bytes < size:
+                f.seek(offsets[-1] + partition_bytes)
+                f.readline()
+                if f.tell() >= size:
+                    break
+                offsets.append(f.tell())
+        offsets.append(size)
+        return [
+            {"kind": "csv", "path": path, "start": start, "end": end, "names": names, "read_kwargs": read_kwargs}
+            for start, end in zip(offsets, offsets[1:]) if end > start
+        ]
+
+    @staticmethod
+    def _parquet_specs(path: str) -> List[Dict[str, Any]]:
+        """Parquet row group마다 파티션 하나"""
+        import pyarrow.parquet as pq
+        files = sorted(glob.glob(os.path.join(path, "*.parquet"))) if os.path.isdir(path) else [path]
+        return [
+            {"kind": "parquet", "path": file, "row_group": group}
+            for file in files
+            for group in range(pq.ParquetFile(file).num_row_groups)
+        ]
+
+    def head(self) -> pd.DataFrame:
+        """첫 파티션 앞부분 (컬럼/타입 확인용, 한 번만 읽음)"""
+        if self._head is None:
+            self._head = _read_partition(self.specs[0]).head(1000) if self.specs else pd.DataFrame()
+        return self._head
+
+    def row_count(self, filters: Sequence[str]) -> int:
+        """필터 적용 후 행 수 (같은 필터는 한 번만 계산)"""
+        key = tuple(filters)
+        if key not in self._row_counts:
+            self._row_counts[key] = sum(self.map("count", list(filters)))
+        return self._row_counts[key]
+
+    def map(self, op: str, filters: List[str], project: Optional[List[str]] = None,
+            **args) -> List[Any]:
+        """
+        모든 파티션에 부분 연산 실행 (파티션 순서대로 결과 반환)
+
+        Args:
+            op: _PARTIAL_OPS 이름
+            filters: query() 식 목록
+            project: 읽은 뒤 남길 컬럼 (None이면 전부). 연산 인자(**args)의 columns와 구분
+            **args: 부분 연산 인자
+        """
+        if self._pool is None:
+            pool_cls = ProcessPoolExecutor if self.use_processes else ThreadPoolExecutor
+            self._pool = pool_cls(max_workers=self.max_workers)
+        self.stats["tasks"] += len(self.specs)
+        return list(self._pool.map(
+            _run_task, self.specs, repeat(list(filters)), repeat(project), repeat(op), repeat(args)
+        ))
+
+    def close(self):
+        if self._pool is not None:
+            self._pool.shutdown()
+            self._pool = None
+
+# %% 3. 지연 DataFrame
+
+class PartitionedFrame:
+    """
+    DataFrame처럼 쓰는 지연 객체 (필터/컬럼 선택은 기록만 하고, 집계할 때 파티션 병렬 실행)
+
+    지원하지 않는 속성/메서드는 필요한 데이터를 합쳐 pandas DataFrame에 위임합니다.
+    """
+
+    def __init__(self, dataset: PartitionedDataset, filters: Sequence[str] = (),
+                 columns: Optional[List[str]] = None):
+        self._dataset = dataset
+        self._filters = list(filters)
+        self._columns = columns
+
+    @classmethod
+    def from_path(cls, path: str, **kwargs) -> "PartitionedFrame":
+        """CSV/Parquet 경로로 생성 (kwargs는 PartitionedDataset 인자)"""
+        return cls(PartitionedDataset(path, **kwargs))
+
+    # ---- 메타정보 ----
+
+    @property
+    def columns(self) -> pd.Index:
+        head = self._dataset.head()
+        return pd.Index(self._columns) if self._columns is not None else head.columns
+
+    @property
+    def dtypes(self) -> pd.Series:
+        return self._dataset.head()[list(self.columns)].dtypes
+
+    def __len__(self) -> int:
+        return self._dataset.row_count(self._filters)
+
+    @property
+    def shape(self):
+        return (len(self), len(self.columns))
+
+    def head(self, n: int = 5) -> pd.DataFrame:
+        # 앞 파티션부터 순서대로 읽다가 n행이 모이면 중단
+        parts = []
+        for spec in self._dataset.specs:
+            parts.append(_run_task(spec, self._filters, self._columns, "head", {"n": n}))
+            if sum(len(p) for p in parts) >= n:
+                break
+        return pd.concat(parts).head(n) if parts else pd.DataFrame(columns=self.columns)
+
+    @property
+    def stats(self) -> Dict[str, int]:
+        """실행한 파티션 작업 수 / 전체 로드(대체 경로) 횟수"""
+        return self._dataset.stats
+
+    def close(self):
+        """워커 풀 종료"""
+        self._dataset.close()
+
+    def __repr__(self) -> str:
+        return (f"PartitionedFrame({os.path.basename(self._dataset.path)}, "
+                f"{len(self._dataset.specs)} partitions, filters={self._filters})")
+
+    # ---- 지연 변환 ----
+
+    def query(self, expr: str) -> "PartitionedFrame":
+        return PartitionedFrame(self._dataset, self._filters + [expr], self._columns)
+
+    def __getitem__(self, key):
+        if isinstance(key, str):
+            return PartitionedColumn(self, key)
+        if isinstance(key, list) and all(isinstance(k, str) for k in key):
+            return PartitionedFrame(self._dataset, self._filters, list(key))
+        # 불리언 마스크 등은 전체를 합쳐서 처리
+        return self.materialize()[key]
+
+    def groupby(self, by: Union[str, List[str]], **kwargs) -> "PartitionedGroupBy":
+        if kwargs:
+            return self.materialize().groupby(by, **kwargs)
+        return PartitionedGroupBy(self, [by] if isinstance(by, str) else list(by))
+
+    # ---- 분해 가능한 연산 ----
+
+    def isnull(self) -> "_NullCounts":
+        return _NullCounts(self)
+
+    isna = isnull
+
+    def describe(self) -> pd.DataFrame:
+        """
+        숫자 컬럼 describe (count/mean/std/min/max는 파티션 통계 합산)
+
+        분위수는 파티션별 스케치(_partial_quantile_sketch)를 합쳐 계산하므로 전체 데이터를 모으지 않습니다.
+        모든 파티션이 QUANTILE_SKETCH_POINTS행 이하면 pandas와 같은 값이고, 그보다 크면 근사값입니다.
+        """
+        numeric = [c for c in self.columns if pd.api.types.is_numeric_dtype(self.dtypes[c])]
+        moments = _combine_moments(self._dataset.map("moments", self._filters, numeric))
+        sketches = self._dataset.map("quantiles", self._filters, numeric, columns=numeric)
+        quartiles = _combine_quantiles(sketches, numeric, [0.25, 0.5, 0.75])
+        table = pd.DataFrame({
+            "count": moments["count"].astype(float),
+            "mean": moments["mean"],
+            "std": moments["std"],
+            "min": moments["min"],
+            "25%": quartiles.loc[0.25],
+            "50%": quartiles.loc[0.5],
+            "75%": quartiles.loc[0.75],
+            "max": moments["max"],
+        }).T
+        return table[numeric]
+
+    def materialize(self, columns: Optional[List[str]] = None) -> pd.DataFrame:
+        """필터/컬럼 선택을 적용해 파티션을 읽어 하나의 DataFrame으로 합치기 (대체 경로)"""
+        self._dataset.stats["fallbacks"] += 1
+        parts = self._dataset.map("collect", self._filters, columns or self._columns)
+        return pd.concat(parts, ignore_index=True)
+
+    def __getattr__(self, name: str):
+        # 지원하지 않는 pandas 기능은 전체 DataFrame에 위임
+        if name.startswith("_"):
+            raise AttributeError(name)
+        return getattr(self.materialize(), name)
+
+
+class _NullCounts:
+    """df.isnull().sum() 전용 (컬럼별 결측치 개수를 파티션별로 세어 합산)"""
+
+    def __init__(self, frame: PartitionedFrame):
+        self._frame = frame
+
+    def sum(self) -> pd.Series:
+        parts = self._frame._dataset.map("nulls", self._frame._filters, self._frame._columns)
+        return pd.concat(parts, axis=1).sum(axis=1).astype("int64")
+
+    def __getattr__(self, name: str):
+        if name.startswith("_"):
+            raise AttributeError(name)
+        return getattr(self._frame.materialize().isnull(), name)
+
+
+class PartitionedColumn:
+    """PartitionedFrame의 컬럼 하나 (Series처럼 사용)"""
+
+    def __init__(self, frame: PartitionedFrame, name: str):
+        self._frame = frame
+        self.name = name
+
+    def _map(self, op: str, **args) -> List[Any]:
+        return self._frame._dataset.map(op, self._frame._filters, [self.name], **args)
+
+    def value_counts(self, normalize: bool = False, dropna: bool = True) -> pd.Series:
+        counts = pd.concat(self._map("value_counts", column=self.name, dropna=dropna))
+        counts = counts.groupby(level=0, dropna=False).sum().sort_values(ascending=False, kind="stable")
+        if normalize:
+            counts = (counts / counts.sum()).rename("proportion")
+        return counts
+
+    def _is_numeric(self) -> bool:
+        return pd.api.types.is_numeric_dtype(self._frame.dtypes[self.name])
+
+    def _moments(self) -> pd.Series:
+        return _combine_moments(self._map("moments")).loc[self.name]
+
+    def _reduce(self) -> Dict[str, Any]:
+        """파티션별 count/min/max/sum 합치기 (스칼라 그대로 합쳐서 int/문자열/날짜 타입 유지)"""
+        parts = self._map("column", column=self.name)
+        mins = [p["min"] for p in parts if p["min"] is not None]
+        maxs = [p["max"] for p in parts if p["max"] is not None]
+        result = {
+            "count": sum(p["count"] for p in parts),
+            "min": min(mins) if mins else np.nan,
+            "max": max(maxs) if maxs else np.nan,
+        }
+        if parts and "sum" in parts[0]:
+            result["sum"] = sum(p["sum"] for p in parts)
+        return result
+
+    def count(self) -> int:
+        return int(self._reduce()["count"])
+
+    def sum(self):
+        reduced = self._reduce()
+        if "sum" not in reduced:
+            # 문자열 이어붙이기 등 숫자가 아닌 sum은 pandas에 위임
+            return self.materialize().sum()
+        return reduced["sum"]
+
+    def mean(self) -> float:
+        if not self._is_numeric():
+            return self.materialize().mean()
+        return float(self._moments()["mean"])
+
+    def std(self) -> float:
+        if not self._is_numeric():
+            return self.materialize().std()
+        return float(self._moments()["std"])
+
+    def var(self) -> float:
+        if not self._is_numeric():
+            return self.materialize().var()
+        return float(self._moments()["std"]) ** 2
+
+    def min(self):
+        return self._reduce()["min"]
+
+    def max(self):
+        return self._reduce()["max"]
+
+    def unique(self) -> np.ndarray:
+        parts = self._map("unique", column=self.name)
+        return pd.unique(np.concatenate(parts)) if parts else np.array([])
+
+    def nunique(self) -> int:
+        return len(self.unique())
+
+    def describe(self) -> pd.Series:
+        if not pd.api.types.is_numeric_dtype(self._frame.dtypes[self.name]):
+            return self.materialize().describe()
+        return self._frame[[self.name]].describe()[self.name]
+
+    def materialize(self) -> pd.Series:
+        return self._frame.materialize([self.name])[self.name]
+
+    def __getattr__(self, name: str):
+        if name.startswith("_"):
+            raise AttributeError(name)
+        return getattr(self.materialize(), name)
+
+    def __len__(self) -> int:
+        return len(self._frame)
+
+    # 비교/산술 연산은 Series로 합친 뒤 계산 (필터는 df.query 권장)
+    def __eq__(self, other): return self.materialize() == other
+    def __ne__(self, other): return self.materialize() != other
+    def __lt__(self, other): return self.materialize() < other
+    def __le__(self, other): return self.materialize() <= other
+    def __gt__(self, other): return self.materialize() > other
+    def __ge__(self, other): return self.materialize() >= other
+
+# %% 4. 그룹 집계
+
+class PartitionedGroupBy:
+    """df.groupby(by)[cols] 지연 객체 (분해 가능한 집계는 파티션별 부분 통계를 합산)"""
+
+    def __init__(self, frame: PartitionedFrame, by: List[str], selection: Union[str, List[str], None] = None):
+        self._frame = frame
+        self._by = by
+        self._selection = selection
+
+    def __getitem__(self, key: Union[str, List[str]]) -> "PartitionedGroupBy":
+        return PartitionedGroupBy(self._frame, self._by, key)
+
+    def _value_columns(self, funcs: List[str]) -> List[str]:
+        if self._selection is not None:
+            return [self._selection] if isinstance(self._selection, str) else list(self._selection)
+        columns = [c for c in self._frame.columns if c not in self._by]
+        if set(funcs) & NUMERIC_AGGS:
+            # pandas의 numeric_only=True처럼 숫자 컬럼만
+            dtypes = self._frame.dtypes
+            columns = [c for c in columns if pd.api.types.is_numeric_dtype(dtypes[c])]
+        return columns
+
+    def agg(self, func: Union[str, List[str], Dict[str, Union[str, List[str]]]]):
+        """sum/count/size/min/max/mean/var/std 조합 (str, list, {컬럼: 함수})"""
+        if isinstance(func, dict):
+            plan = {col: [f] if isinstance(f, str) else list(f) for col, f in func.items()}
+        else:
+            funcs = [func] if isinstance(func, str) else list(func)
+            plan = {col: funcs for col in self._value_columns(funcs)}
+
+        all_funcs = {f for fs in plan.values() for f in fs}
+        if not all(isinstance(f, str) for f in all_funcs) or not all_funcs <= DECOMPOSABLE_AGGS:
+            return self._fallback().agg(func)
+
+        partials = self._frame._dataset.map(
+            "groupby", self._frame._filters, project=self._by + list(plan),
+            by=self._by, columns=list(plan), aggs=sorted(all_funcs),
+        )
+        stats = _combine_group_stats(partials, self._by, list(plan))
+
+        # pandas와 같은 모양으로 조립
+        if isinstance(func, str):
+            if isinstance(self._selection, str):
+                return _rename_axis(stats[(self._selection, func)].rename(self._selection), self._by)
+            return _rename_axis(pd.DataFrame({col: stats[(col, func)] for col in plan}), self._by)
+        if isinstance(func, list) and isinstance(self._selection, str):
+            return _rename_axis(pd.DataFrame({f: stats[(self._selection, f)] for f in func}), self._by)
+        if isinstance(func, dict) and all(isinstance(f, str) for f in func.values()):
+            return _rename_axis(pd.DataFrame({col: stats[(col, f)] for col, f in func.items()}), self._by)
+        table = pd.DataFrame({(col, f): stats[(col, f)] for col, fs in plan.items() for f in fs})
+        return _rename_axis(table, self._by)
+
+    aggregate = agg
+
+    def sum(self): return self.agg("sum")
+    def count(self): return self.agg("count")
+    def mean(self): return self.agg("mean")
+    def min(self): return self.agg("min")
+    def max(self): return self.agg("max")
+    def var(self): return self.agg("var")
+    def std(self): return self.agg("std")
+
+    def size(self) -> pd.Series:
+        partials = self._frame._dataset.map(
+            "groupby", self._frame._filters, project=list(self._by), by=self._by, columns=[], aggs=["size"],
+        )
+        stats = _combine_group_stats(partials, self._by, [])
+        return _rename_axis(stats[("__size__", "size")].rename(None), self._by)
+
+    def _fallback(self):
+        columns = self._by + self._value_columns([])
+        grouped = self._frame.materialize(columns).groupby(self._by)
+        return grouped if self._selection is None else grouped[self._selection]
+
+    def __getattr__(self, name: str):
+        # median, nunique, apply 등은 필요한 컬럼만 합쳐서 pandas로 계산
+        if name.startswith("_"):
+            raise AttributeError(name)
+        return getattr(self._fallback(), name)
+
+# %% 5. 부분 결과 합치기
+
+def _combine_moments(parts: List[pd.DataFrame]) -> pd.DataFrame:
+    """컬럼별 (count, sum, m2, min, max) 부분 통계 → count/sum/mean/std/min/max"""
+    table = pd.concat(parts)
+    grouped = table.groupby(level=0, sort=False)
+    count = grouped["count"].sum()
+    total = grouped["sum"].sum()
+    mean = total / count
+    partial_mean = table["sum"] / table["count"]
+    spread = (table["count"] * (partial_mean - mean.reindex(table.index)) ** 2).fillna(0)
+    m2 = (table["m2"].fillna(0) + spread).groupby(level=0, sort=False).sum()
+    return pd.DataFrame({
+        "count": count,
+        "sum": total,
+        "mean": mean,
+        "std": np.sqrt(m2 / (count - 1)),
+        "min": grouped["min"].min(),
+        "max": grouped["max"].max(),
+    })
+
+
+def _combine_quantiles(parts: List[Dict[str, tuple]], columns: List[str], qs: List[float]) -> pd.DataFrame:
+    """
+    파티션별 분위수 스케치 → 분위수 표 (index: qs, columns: 컬럼)
+
+    모든 스케치가 원본 값(가중치 1)이면 np.quantile로 pandas와 같은 값을, 아니면 가중 누적 순위를 보간한 근사값을 계산
+    """
+    table = {}
+    for col in columns:
+        values = np.concatenate([p[col][0] for p in parts]) if parts else np.array([])
+        weights = np.concatenate([p[col][1] for p in parts]) if parts else np.array([])
+        if len(values) == 0:
+            table[col] = [np.nan] * len(qs)
+        elif np.all(weights == 1):
+            table[col] = np.quantile(values, qs)
+        else:
+            order = np.argsort(values, kind="stable")
+            values, weights = values[order], weights[order]
+            ranks = np.cumsum(weights) - weights / 2
+            table[col] = np.interp(np.asarray(qs) * weights.sum(), ranks, values)
+    return pd.DataFrame(table, index=qs)
+
+
+def _combine_group_stats(parts: List[pd.DataFrame], by: List[str], columns: List[str]) -> Dict[tuple, pd.Series]:
+    """파티션별 그룹 부분 통계 → {(컬럼, 집계): 그룹 인덱스 Series}"""
+    table = pd.concat(parts)
+    levels = list(range(len(by)))
+
+    def combine(key: tuple, how: str) -> pd.Series:
+        # MultiIndex 컬럼은 grouped[(컬럼, 통계)]로 고를 수 없으므로 Series를 그룹으로 묶음
+        return getattr(table[key].groupby(level=levels), how)()
+
+    stats = {("__size__", "size"): combine(("__size__", "size"), "sum")}
+
+    for col in columns:
+        present = {stat for (c, stat) in table.columns if c == col}
+        if "count" in present:
+            stats[(col, "count")] = combine((col, "count"), "sum")
+        if "sum" in present:
+            stats[(col, "sum")] = combine((col, "sum"), "sum")
+        if "min" in present:
+            stats[(col, "min")] = combine((col, "min"), "min")
+        if "max" in present:
+            stats[(col, "max")] = combine((col, "max"), "max")
+        if {"sum", "count"} <= present:
+            stats[(col, "mean")] = stats[(col, "sum")] / stats[(col, "count")]
+        if "m2" in present:
+            count = table[(col, "count")]
+            group_mean = stats[(col, "mean")].reindex(table.index)
+            spread = (count * (table[(col, "sum")] / count - group_mean) ** 2).fillna(0)
+            m2 = (table[(col, "m2")].fillna(0) + spread).groupby(level=levels).sum()
+            stats[(col, "var")] = m2 / (stats[(col, "count")] - 1)
+            stats[(col, "std")] = np.sqrt(stats[(col, "var")])
+    return stats
+
+
+def _rename_axis(result, by: List[str]):
+    """그룹 인덱스 이름을 pandas groupby 결과와 같게 (정렬 포함)"""
+    result = result.sort_index()
+    if len(by) == 1:
+        return result.rename_axis(by[0])
+    return result.rename_axis(by)
@@ -0,0 +1,312 @@
+# %% 0. 파일 헤더 및 설명
+"""
+DataFrame 컬럼 단위 PII 스캐너 + 벡터화 마스킹
+
+SecurePandasAgent는 Observation에서 값을 숨길 뿐, 분석/내보내기 전에 name, customer_name,
+customer_id, 전화번호, 이메일 같은 PII 컬럼을 찾아 가리는 기능은 없습니다.
+셀마다 Presidio를 돌리면 수백만 행에 몇 시간이 걸리므로, 이 모듈은
+
+1. 스캔: 컬럼마다 최대 sample_size개 값만 뽑아
+   - 컬럼 이름 힌트 (name, 이름, *_id, phone, email, 주소 ...)
+   - 한국어 PII 정규식 (day1/korean_pii.py) → str.contains / str.fullmatch 비율 + 체크섬 검증
+   - (선택) Presidio NER을 ner_sample개 값에만 실행
+   으로 컬럼을 분류하고,
+2. 마스킹: 컬럼 전체를 한 번에 처리
+   - 값 전체가 PII인 컬럼 → 가명화 또는 삭제
+     가명화는 가명화 볼트(day1/pii_vault.py)의 키와 토큰 형식(CUST_7f3a...)을 그대로 써서,
+     같은 값은 같은 토큰이라 groupby/join이 유지되고 LLM 응답의 토큰도 볼트로 재식별됩니다.
+   - 텍스트 안에 PII가 섞인 컬럼 → 정규식 치환(<KR_PHONE> 등)
+   - 둘 다 고유값에만 계산한 뒤 pd.factorize 코드로 펼쳐 수백만 행도 수 초 안에 처리
+
+사용법:
+    from pii_dataframe import scan_dataframe, mask_dataframe
+
+    report = scan_dataframe(df)                 # 컬럼별 분류 결과 (DataFrame)
+    masked, report = mask_dataframe(df)          # 스캔 + 마스킹
+    masked, report = mask_dataframe(df, actions={"customer_id": "keep"})
+    masked, report = mask_dataframe(df, vault=vault)    # 미들웨어와 같은 볼트 공유
+"""
+
+import os
+import sys
+import re
+from typing import Dict, List, Optional, Tuple
+
+import pandas as pd
+
+DAY1_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "day1")
+if DAY1_DIR not in sys.path:
+    sys.path.append(DAY1_DIR)
+
+from korean_pii import PATTERNS, luhn_valid, rrn_score  # noqa: E402
+from pii_vault import DEFAULT_VAULT_PATH, TOKEN_PREFIXES, PiiVault  # noqa: E402
+
+DEFAULT_SAMPLE_SIZE = 1000
+DEFAULT_NER_SAMPLE = 50
+DEFAULT_MIN_RATIO = 0.3      # 샘플 중 이 비율 이상 맞으면 PII 컬럼
+FULL_MATCH_RATIO = 0.8       # 값 전체가 PII인 비율이 이 이상이면 컬럼 단위(가명화/삭제)
+
+# 컬럼 이름 힌트 (소문자 기준, 위에서부터 먼저 맞는 것)
+NAME_HINTS = [
+    ("KR_RRN", re.compile(r"rrn|ssn|주민")),
+    ("CREDIT_CARD", re.compile(r"card_?(no|num)|카드번호")),
+    ("KR_PHONE", re.compile(r"phone|mobile|tel|전화|연락처|휴대")),
+    ("EMAIL_ADDRESS", re.compile(r"e-?mail|이메일|메일")),
+    ("KR_ADDRESS", re.compile(r"address|addr|주소")),
+    ("PERSON", re.compile(r"(^|_)name$|^name|이름|성명|고객명")),
+    ("IDENTIFIER", re.compile(r"(^|_)id$|_no$|아이디|고객번호|사번")),
+]
+
+# 한국어 이름 (성씨 + 2~3자, 복성은 + 1~2자). 두 글자 값("서울", "기타")은 이름으로 보지 않음
+_KR_SURNAMES = "[김이박최정강조윤장임한오서신권황안송류전홍고문양손배백허유남심노하곽성차주우구민진나지엄채원천방공현함변염여추도소석선설마길연위표명기반왕금옥육인맹제모탁국어은편용예경봉사부]"
+KR_NAME_PATTERN = rf"(?:(?:남궁|황보|제갈|선우|독고)[가-힣]{{1,2}}|{_KR_SURNAMES}[가-힣]{{2,3}})"
+
+# 성씨로 시작하지만 이름이 아닌 흔한 값 (지역, 부서, 직급, 범주 이름 등)
+NON_NAME_WORDS = {
+    "서울시", "부산시", "대구시", "인천시", "광주시", "대전시", "울산시", "세종시", "제주도", "경기도",
+    "강원도", "충청도", "전라도", "경상도", "서울특별시", "부산광역시", "대구광역시", "인천광역시",
+    "광주광역시", "대전광역시", "울산광역시", "제주특별자치도", "경기남부", "경기북부",
+    "마케팅", "인사팀", "개발팀", "영업팀", "기획팀", "재무팀", "고객센터", "고객지원", "운영팀",
+    "사원급", "대리급", "과장급", "차장급", "부장급", "이사급", "임원급", "정규직", "계약직",
+    "미분류", "미지정", "미입력", "해당없음", "일반회원", "우수회원", "신규회원", "휴면회원",
+}
+
+# 이름 컬럼으로 보려면 샘플(행 단위) 중 고유값 비율이 이 이상이어야 함 (지역/부서 같은 범주는 낮음)
+MIN_NAME_UNIQUE_RATIO = 0.5
+
+# 체크섬으로 한 번 더 거르는 엔티티
+VALIDATORS = {
+    "KR_RRN": lambda value: rrn_score(value) is not None,
+    "CREDIT_CARD": luhn_valid,
+}
+
+# 분류별 기본 처리: pseudonymize(가명화), redact(삭제), substitute(텍스트 내 치환), keep
+DEFAULT_ACTIONS = {
+    "PERSON": "pseudonymize",
+    "IDENTIFIER": "pseudonymize",
+    "EMAIL_ADDRESS": "pseudonymize",
+    "KR_PHONE": "redact",
+    "KR_RRN": "redact",
+    "CREDIT_CARD": "redact",
+    "KR_ADDRESS": "redact",
+}
+
+# %% 1. 컬럼 스캔 (샘플만)
+
+def _sample(series: pd.Series, sample_size: int, seed: int) -> pd.Series:
+    """
+    결측치를 뺀 행 단위 문자열 샘플
+
+    category도 범주 목록이 아니라 실제 행 값에서 뽑아, 고유값 비율이 행 수 대비 카디널리티를 반영합니다.
+    """
+    values = series.dropna()
+    if len(values) > sample_size:
+        values = values.sample(sample_size, random_state=seed)
+    return values.astype(str)
+
+
+def _pattern_ratios(sample: pd.Series, entity: str, pattern: str) -> Tuple[float, float]:
+    """(값에 포함된 비율, 값 전체가 일치하는 비율) — 체크섬 대상은 검증 통과분만"""
+    found = sample.str.extract(f"({pattern})", expand=False)
+    hits = found.notna()
+    if entity in VALIDATORS and hits.any():
+        hits = hits & found.map(lambda v: isinstance(v, str) and VALIDATORS[entity](v))
+    full = hits & (found.str.len() == sample.str.strip().str.len())
+    return float(hits.mean()), float(full.mean())
+
+
+def _ner_entity(sample: pd.Series, ner_sample: int, min_ratio: float, language: str) -> Tuple[Optional[str], float]:
+    """Presidio NER을 샘플 일부에만 실행해 가장 흔한 엔티티 (Presidio가 없으면 건너뜀)"""
+    try:
+        from pii_engines import get_analyzer
+        analyzer = get_analyzer(language)
+    except ImportError:
+        return None, 0.0
+
+    values = sample.head(ner_sample)
+    counts: Dict[str, int] = {}
+    for value in values:
+        for entity in {r.entity_type for r in analyzer.analyze(text=value, language=language)}:
+            counts[entity] = counts.get(entity, 0) + 1
+    if not counts:
+        return None, 0.0
+    entity, count = max(counts.items(), key=lambda item: item[1])
+    ratio = count / len(values)
+    return (entity, ratio) if ratio >= min_ratio else (None, 0.0)
+
+
+def classify_column(
+    series: pd.Series,
+    sample_size: int = DEFAULT_SAMPLE_SIZE,
+    min_ratio: float = DEFAULT_MIN_RATIO,
+    use_ner: bool = False,
+    ner_sample: int = DEFAULT_NER_SAMPLE,
+    language: str = "en",
+    seed: int = 0,
+) -> Dict[str, object]:
+    """
+    컬럼 하나 분류
+
+    Returns:
+        {"entity", "source"(name/pattern/ner), "ratio", "scope"(column/text)}
+        PII가 아니면 entity=None
+    """
+    name = str(series.name).lower()
+    hinted = next((entity for entity, pattern in NAME_HINTS if pattern.search(name)), None)
+    is_text = series.dtype == object or pd.api.types.is_string_dtype(series) \
+        or isinstance(series.dtype, pd.CategoricalDtype)
+
+    if not is_text:
+        # 숫자 컬럼은 이름으로만 판단 (customer_id 등)
+        if hinted in ("IDENTIFIER", "KR_PHONE", "CREDIT_CARD", "KR_RRN"):
+            return {"entity": hinted, "source": "name", "ratio": 1.0, "scope": "column"}
+        return {"entity": None, "source": None, "ratio": 0.0, "scope": None}
+
+    sample = _sample(series, sample_size, seed)
+    if sample.empty:
+        return {"entity": hinted, "source": "name" if hinted else None, "ratio": 0.0, "scope": "column"}
+
+    best = (None, 0.0, 0.0)
+    for entity, pattern in PATTERNS.items():
+        ratio, full = _pattern_ratios(sample, entity, pattern)
+        if ratio > best[1]:
+            best = (entity, ratio, full)
+    entity, ratio, full = best
+    if entity and ratio >= min_ratio:
+        scope = "column" if full >= FULL_MATCH_RATIO else "text"
+        return {"entity": entity, "source": "pattern", "ratio": round(ratio, 3), "scope": scope}
+
+    # 한국어 이름: 값 전체가 이름 형식이고 (흔한 단어 제외) 행 수 대비 고유값이 많은 컬럼
+    stripped = sample.str.strip()
+    name_ratio = float((stripped.str.fullmatch(KR_NAME_PATTERN) & ~stripped.isin(NON_NAME_WORDS)).mean())
+    if name_ratio >= FULL_MATCH_RATIO and stripped.nunique() / len(stripped) >= MIN_NAME_UNIQUE_RATIO:
+        return {"entity": "PERSON", "source": "pattern", "ratio": round(name_ratio, 3), "scope": "column"}
+
+    if hinted:
+        return {"entity": hinted, "source": "name", "ratio": 1.0, "scope": "column"}
+
+    if use_ner:
+        entity, ratio = _ner_entity(sample, ner_sample, min_ratio, language)
+        if entity:
+            return {"entity": entity, "source": "ner", "ratio": round(ratio, 3), "scope": "text"}
+    return {"entity": None, "source": None, "ratio": 0.0, "scope": None}
+
+
+def scan_dataframe(
+    df: pd.DataFrame,
+    sample_size: int = DEFAULT_SAMPLE_SIZE,
+    min_ratio: float = DEFAULT_MIN_RATIO,
+    use_ner: bool = False,
+    **kwargs,
+) -> pd.DataFrame:
+    """
+    모든 컬럼 분류 (행 수와 무관하게 컬럼당 샘플만 검사)
+
+    Args:
+        df: 검사할 DataFrame
+        sample_size: 컬럼당 샘플 값 수
+        min_ratio: PII로 판단할 최소 일치 비율
+        use_ner: 정규식/이름으로 분류되지 않은 텍스트 컬럼에 Presidio NER 실행 (샘플 일부만)
+        **kwargs: classify_column() 추가 인자 (ner_sample, language, seed)
+
+    Returns:
+        컬럼별 entity, source, ratio, scope, action 표 (PII 컬럼만)
+    """
+    rows = {}
+    for col in df.columns:
+        info = classify_column(df[col], sample_size, min_ratio, use_ner, **kwargs)
+        if info["entity"]:
+            action = "substitute" if info["scope"] == "text" else DEFAULT_ACTIONS.get(info["entity"], "redact")
+            rows[col] = {**info, "action": action}
+    return pd.DataFrame.from_dict(
+        rows, orient="index", columns=["entity", "source", "ratio", "scope", "action"]
+    )
+
+# %% 2. 벡터화 마스킹
+
+def _token_entity(column: str, entity: str) -> str:
+    """볼트 토큰 엔티티: 알려진 엔티티(PERSON → CUST_...)는 그대로, 식별자 등은 컬럼 이름 (CUSTOMER_ID_...)"""
+    if entity in TOKEN_PREFIXES:
+        return entity
+    name = re.sub(r"[^A-Z0-9]+", "_", str(column).upper()).strip("_")
+    return name if re.match(r"[A-Z]", name) else "ID"
+
+
+def pseudonymize(series: pd.Series, vault: PiiVault, entity: str = "PII") -> pd.Series:
+    """
+    가명화 볼트 토큰으로 치환 (같은 값 → 같은 토큰, 결측치 유지)
+
+    고유값에만 vault.tokenize()를 호출하고 factorize 코드로 펼칩니다.
+    """
+    codes, uniques = pd.factorize(series)
+    tokens = pd.Index([vault.tokenize(str(v), entity) for v in uniques])
+    result = pd.Series(tokens.take(codes), index=series.index, dtype=object)
+    return result.where(codes != -1)
+
+
+def substitute(series: pd.Series, entities: Optional[List[str]] = None) -> pd.Series:
+    """텍스트 안의 한국어 PII를 <엔티티> 로 치환 (고유값에만 정규식 적용)"""
+    codes, uniques = pd.factorize(series.astype(object))
+    replaced = pd.Series(uniques.astype(str), dtype=object)
+    for entity, pattern in PATTERNS.items():
+        if entities is None or entity in entities:
+            replaced = replaced.str.replace(pattern, f"<{entity}>", regex=True)
+    result = pd.Series(pd.Index(replaced).take(codes), index=series.index, dtype=object)
+    return result.where(codes != -1)
+
+
+def mask_dataframe(
+    df: pd.DataFrame,
+    report: Optional[pd.DataFrame] = None,
+    actions: Optional[Dict[str, str]] = None,
+    vault: Optional[PiiVault] = None,
+    vault_path: str = DEFAULT_VAULT_PATH,
+    **scan_kwargs,
+) -> Tuple[pd.DataFrame, pd.DataFrame]:
+    """
+    PII 컬럼 마스킹 (원본은 수정하지 않음)
+
+    Args:
+        df: 원본 DataFrame
+        report: scan_dataframe() 결과 (None이면 스캔)
+        actions: 컬럼별 처리 덮어쓰기 {"customer_id": "keep", "name": "redact", ...}
+        vault: 가명화 볼트 (None이면 vault_path로 열고 끝나면 닫음)
+        vault_path: 볼트 경로 (키는 PII_VAULT_KEY 또는 <볼트>.key)
+        **scan_kwargs: scan_dataframe() 추가 인자
+
+    Returns:
+        (마스킹된 DataFrame, 실제 적용한 action이 담긴 report)
+    """
+    if report is None:
+        report = scan_dataframe(df, **scan_kwargs)
+    report = report.copy()
+    for col, action in (actions or {}).items():
+        if col in report.index:
+            report.loc[col, "action"] = action
+    owns_vault = vault is None and (report["action"] == "pseudonymize").any()
+    if owns_vault:
+        vault = PiiVault(vault_path)
+
+    masked = df.copy()
+    try:
+        for col, row in report.iterrows():
+            if row["action"] == "pseudonymize":
+                masked[col] = pseudonymize(df[col], vault, _token_entity(col, row["entity"]))
+            elif row["action"] == "redact":
+                masked[col] = pd.Series(f"<{row['entity']}>", index=df.index, dtype=object).where(df[col].notna())
+            elif row["action"] == "substitute":
+                masked[col] = substitute(df[col])
+    finally:
+        if owns_vault:
+            vault.close()
+    return masked, report
+
+
+def print_pii_report(report: pd.DataFrame):
+    """스캔/마스킹 결과 출력"""
+    if report.empty:
+        print("✅ PII 컬럼이 발견되지 않았습니다.")
+        return
+    print(f"🔒 PII 컬럼 {len(report)}개:")
+    for col, row in report.iterrows():
+        print(f"   - {col}: {row['entity']} ({row['source']}, {row['ratio']:.0%}) → {row['action']}")
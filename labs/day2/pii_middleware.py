@@ -0,0 +1,179 @@
+# %% 0. 파일 헤더 및 설명
+"""
+멀티턴 대화용 증분 PII 마스킹 미들웨어 (PotensChatModel 옵션)
+
+PotensChatModel 앞에서 매 턴마다 대화 이력 전체를 다시 분석하면 턴이 늘수록 비용이 제곱으로 늘어납니다.
+이 미들웨어는
+
+- 메시지 내용의 해시를 키로 마스킹 결과를 캐시 → 새로 추가된 메시지만 Presidio로 분석
+- 가명화 볼트(day1/pii_vault.py)로 치환 → 같은 고객은 모든 턴에서 같은 토큰 (CUST_7f3a...)
+- (선택) LLM 응답의 토큰을 원래 값으로 재식별해 사용자에게 표시하고,
+  재식별된 응답이 다음 턴 이력으로 돌아오면 원래 마스킹 응답을 캐시에서 바로 꺼냄 (재분석 없음)
+
+을 처리해, 50턴 대화에서도 턴당 마스킹 비용이 일정합니다 (새 메시지 1~2개 분석 + 해시 조회).
+
+사용법:
+    from potens_wrapper import PotensChatModel
+    from pii_middleware import PiiMaskingMiddleware
+
+    chat_model = PotensChatModel(pii_middleware=PiiMaskingMiddleware(reidentify_output=True))
+    chat_model.invoke(messages)                     # LLM에는 토큰만 전달
+    print(chat_model.pii_middleware.stats)
+"""
+
+import os
+import sys
+import time
+import hashlib
+import threading
+from collections import OrderedDict
+from typing import Dict, Iterable, Iterator, List, Optional
+
+from langchain_core.messages import BaseMessage
+
+DAY1_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "day1")
+if DAY1_DIR not in sys.path:
+    sys.path.append(DAY1_DIR)
+
+from pii_vault import DEFAULT_VAULT_PATH, PiiVault  # noqa: E402
+
+DEFAULT_MAX_CACHE = 10_000   # 캐시할 메시지 수 (초과 시 오래된 것부터 제거)
+
+# 스트리밍 중 조각 끝에 걸린 미완성 토큰 (CUST_7f3 ...) 길이 상한
+MAX_TOKEN_CHARS = 64
+
+# %% 1. 미들웨어
+
+class PiiMaskingMiddleware:
+    """
+    메시지별 마스킹 결과를 캐시하는 PII 마스킹 미들웨어
+
+    Args:
+        vault: 가명화 볼트 (None이면 vault_path로 생성)
+        vault_path: 볼트 경로
+        language: Presidio 분석 언어
+        reidentify_output: LLM 응답의 토큰을 원래 값으로 되돌려 반환
+        max_cache: 캐시할 메시지 수
+    """
+
+    def __init__(
+        self,
+        vault: Optional[PiiVault] = None,
+        vault_path: str = DEFAULT_VAULT_PATH,
+        language: str = "en",
+        reidentify_output: bool = False,
+        max_cache: int = DEFAULT_MAX_CACHE,
+    ):
+        self.vault = vault or PiiVault(vault_path)
+        self.language = language
+        self.reidentify_output = reidentify_output
+        self.max_cache = max_cache
+        self._cache: "OrderedDict[str, str]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.stats: Dict[str, float] = {"hits": 0, "misses": 0, "analyze_seconds": 0.0, "last_turn_ms": 0.0}
+
+    @staticmethod
+    def _digest(text: str) -> str:
+        return hashlib.sha1(text.encode("utf-8")).hexdigest()
+
+    def _remember(self, digest: str, masked: str):
+        with self._lock:
+            self._cache[digest] = masked
+            self._cache.move_to_end(digest)
+            while len(self._cache) > self.max_cache:
+                self._cache.popitem(last=False)
+
+    def mask_text(self, text: str) -> str:
+        """텍스트 하나 마스킹 (같은 내용은 한 번만 분석)"""
+        if not text:
+            return text
+        digest = self._digest(text)
+        with self._lock:
+            masked = self._cache.get(digest)
+            if masked is not None:
+                self._cache.move_to_end(digest)
+                self.stats["hits"] += 1
+                return masked
+
+        started = time.perf_counter()
+        masked = self.vault.mask(text, language=self.language)
+        self.vault.flush()
+        with self._lock:
+            self.stats["misses"] += 1
+            self.stats["analyze_seconds"] += time.perf_counter() - started
+        self._remember(digest, masked)
+        return masked
+
+    def mask_messages(self, messages: List[BaseMessage]) -> List[BaseMessage]:
+        """
+        메시지 목록 마스킹 (원본은 그대로, 내용이 바뀐 메시지만 복사)
+
+        문자열이 아닌 content(멀티모달 블록 등)는 그대로 둡니다.
+        """
+        started = time.perf_counter()
+        masked_messages = []
+        for message in messages:
+            content = message.content
+            if isinstance(content, str):
+                masked = self.mask_text(content)
+                if masked != content:
+                    message = message.model_copy(update={"content": masked})
+            masked_messages.append(message)
+        self.stats["last_turn_ms"] = round((time.perf_counter() - started) * 1000, 2)
+        return masked_messages
+
+    # ----- 응답 재식별 -----
+
+    def unmask(self, masked_output: str) -> str:
+        """
+        LLM 응답의 토큰을 원래 값으로 (reidentify_output=False면 그대로)
+
+        재식별한 응답이 다음 턴에 AIMessage로 돌아오면 다시 분석하지 않도록
+        재식별 결과 → 원래 마스킹 응답을 캐시에 넣어 둡니다.
+        """
+        if not self.reidentify_output or not masked_output:
+            return masked_output
+        plain = self.vault.reidentify(masked_output)
+        self._remember(self._digest(plain), masked_output)
+        return plain
+
+    def iter_unmask(self, pieces: Iterable[str]) -> Iterator[str]:
+        """
+        스트리밍 응답 재식별 (조각 경계에 걸친 토큰은 완성될 때까지 보류)
+
+        조각을 모두 내보낸 뒤 전체 응답으로 unmask()와 같은 캐시 등록을 합니다.
+        """
+        if not self.reidentify_output:
+            yield from pieces
+            return
+
+        masked_parts = []
+        buffer = ""
+        for piece in pieces:
+            masked_parts.append(piece)
+            buffer += piece
+            hold = self._partial_token_length(buffer)
+            ready, buffer = buffer[:len(buffer) - hold], buffer[len(buffer) - hold:]
+            if ready:
+                yield self.vault.reidentify(ready)
+        if buffer:
+            yield self.vault.reidentify(buffer)
+
+        masked_output = "".join(masked_parts)
+        self._remember(self._digest(self.vault.reidentify(masked_output)), masked_output)
+
+    @staticmethod
+    def _partial_token_length(text: str) -> int:
+        """끝부분이 토큰 일부일 수 있는 글자 수 (영문 대문자/숫자/_ 로 이어진 꼬리)"""
+        tail = 0
+        for ch in reversed(text[-MAX_TOKEN_CHARS:]):
+            if ch.isascii() and (ch.isalnum() or ch == "_"):
+                tail += 1
+            else:
+                break
+        return tail
+
+    def clear(self):
+        """캐시 비우기 (볼트 매핑은 유지)"""
+        with self._lock:
+            self._cache.clear()
@@ -12,19 +12,148 @@ POTENS API를 LangChain에서 사용하기 위한 Custom Wrapper
     
 모듈로 사용:
     from potens_wrapper import PotensLLM, PotensChatModel
+
+Stop 시퀀스 (ReAct Agent):
+    chat_model.invoke(messages, stop=REACT_STOP)
+    - 응답을 스트리밍으로 받다가 stop 시퀀스가 나오면 연결을 끊어 생성을 중단
+    - 모델이 "Observation:"을 지어내며 다음 단계까지 쓰는 것을 막아 응답이 짧아짐
+
+PII 마스킹 (선택):
+    PotensChatModel(pii_middleware=PiiMaskingMiddleware())
+    - 전송 전에 메시지를 가명화 토큰으로 치환 (새 메시지만 분석, pii_middleware.py)
 """
 
 import os
+import json
 import requests
-from typing import Any, List, Optional, Dict
+from typing import Any, Dict, Iterable, Iterator, List, Optional
 from dotenv import load_dotenv
 
 from langchain_core.language_models.llms import LLM
 from langchain_core.language_models.chat_models import BaseChatModel
-from langchain_core.messages import BaseMessage, HumanMessage, AIMessage, SystemMessage
-from langchain_core.outputs import ChatResult, ChatGeneration
+from langchain_core.messages import BaseMessage, HumanMessage, AIMessage, AIMessageChunk, SystemMessage
+from langchain_core.outputs import ChatResult, ChatGeneration, ChatGenerationChunk
 from langchain_core.callbacks import CallbackManagerForLLMRun
 
+# ReAct Agent용 stop 시퀀스: Action Input 다음에 모델이 Observation을 지어내기 시작하면 중단
+REACT_STOP = ["\nObservation:"]
+
+# %% 0-1. 공통 요청 / stop 처리
+
+def _find_stop(text: str, stop: List[str]) -> Optional[int]:
+    """text에서 가장 먼저 나오는 stop 시퀀스의 위치 (없으면 None)"""
+    positions = [text.find(s) for s in stop if s]
+    positions = [p for p in positions if p >= 0]
+    return min(positions) if positions else None
+
+
+def _iter_until_stop(pieces: Iterable[str], stop: Optional[List[str]]) -> Iterator[str]:
+    """
+    텍스트 조각 스트림을 흘려보내다 stop 시퀀스가 나오면 그 앞까지만 내보내고 종료
+    
+    조각 경계에 걸친 stop 시퀀스를 놓치지 않도록 (가장 긴 stop 길이 - 1)자만큼은 보류합니다.
+    """
+    stop = [s for s in (stop or []) if s]
+    if not stop:
+        yield from pieces
+        return
+    
+    hold = max(len(s) for s in stop) - 1
+    buffer = ""
+    for piece in pieces:
+        buffer += piece
+        cut = _find_stop(buffer, stop)
+        if cut is not None:
+            if cut:
+                yield buffer[:cut]
+            return
+        if len(buffer) > hold:
+            yield buffer[:len(buffer) - hold]
+            buffer = buffer[len(buffer) - hold:]
+    if buffer:
+        yield buffer
+
+
+def _iter_response_text(response: requests.Response) -> Iterator[str]:
+    """
+    POTENS 응답을 텍스트 조각으로 변환
+    
+    - text/event-stream: "data: ..." 줄마다 한 조각 (JSON이면 message 필드)
+    - 그 외(JSON): 전체 message를 한 조각으로
+    """
+    if "text/event-stream" not in response.headers.get("Content-Type", ""):
+        yield response.json().get('message', 'Error: No message in response')
+        return
+    
+    for line in response.iter_lines(decode_unicode=True):
+        if not line or not line.startswith("data:"):
+            continue
+        data = line[len("data:"):].strip()
+        if data == "[DONE]":
+            break
+        try:
+            payload = json.loads(data)
+        except ValueError:
+            yield data
+            continue
+        if isinstance(payload, dict):
+            yield payload.get("message") or payload.get("delta") or ""
+        else:
+            yield str(payload)
+
+
+def _stream_text(
+    model: Any,
+    prompt: str,
+    system_prompt: Optional[str] = None,
+    stop: Optional[List[str]] = None,
+    stream: bool = True,
+) -> Iterator[str]:
+    """
+    POTENS API 호출 결과를 텍스트 조각으로 생성 (PotensLLM / PotensChatModel 공통)
+    
+    stop 시퀀스를 만나거나 호출 측이 반복을 멈추면 응답 연결을 닫아 남은 생성을 취소합니다.
+    
+    Args:
+        model: api_key, api_url, temperature, max_tokens, forward_generation_params를 가진 모델
+        prompt: 사용자 프롬프트
+        system_prompt: 시스템 프롬프트
+        stop: stop 시퀀스 목록 (클라이언트에서 적용)
+        stream: True면 스트리밍 응답 요청
+    """
+    headers = {
+        "Authorization": f"Bearer {model.api_key}",
+        "Content-Type": "application/json"
+    }
+    
+    body: Dict[str, Any] = {"prompt": prompt}
+    if system_prompt:
+        body["system_prompt"] = system_prompt
+    if stream:
+        body["stream"] = True
+    if model.forward_generation_params:
+        body["temperature"] = model.temperature
+        body["max_tokens"] = model.max_tokens
+    
+    response = requests.post(model.api_url, headers=headers, json=body, timeout=60, stream=stream)
+    if response.status_code in (400, 422) and model.forward_generation_params:
+        # 생성 파라미터 없이 한 번 더 시도하고, 그게 성공할 때만 이후 요청부터 제외
+        # (다른 이유의 400이면 설정을 바꾸지 않음, stream 요청은 그대로 유지)
+        retry_body = {key: value for key, value in body.items() if key not in ("temperature", "max_tokens")}
+        retry = requests.post(model.api_url, headers=headers, json=retry_body, timeout=60, stream=stream)
+        if retry.ok:
+            response.close()
+            response = retry
+            model.forward_generation_params = False
+        else:
+            retry.close()
+    
+    try:
+        response.raise_for_status()
+        yield from _iter_until_stop(_iter_response_text(response), stop)
+    finally:
+        response.close()
+
 # %% 1. 기본 LLM Wrapper (간단한 텍스트 입출력)
 
 class PotensLLM(LLM):
@@ -38,6 +167,8 @@ class PotensLLM(LLM):
     api_url: str = "https://ai.potens.ai/api/chat"
     temperature: float = 0.7
     max_tokens: int = 2000
+    forward_generation_params: bool = True  # temperature/max_tokens 전송 (서버가 거부하면 자동으로 끔)
+    streaming: bool = False                 # True면 스트리밍으로 받아 stop 시퀀스에서 즉시 중단
     
     def __init__(self, **kwargs):
         super().__init__(**kwargs)
@@ -64,35 +195,17 @@ class PotensLLM(LLM):
         
         Args:
             prompt: 사용자 입력
-            stop: 생성 중지 토큰 (현재 미지원)
+            stop: 생성 중지 시퀀스 (클라이언트에서 적용, streaming=True면 그 시점에 연결 종료)
             run_manager: LangChain 콜백 매니저
         
         Returns:
             LLM 응답 텍스트
         """
-        headers = {
-            "Authorization": f"Bearer {self.api_key}",
-            "Content-Type": "application/json"
-        }
-        
-        body = {"prompt": prompt}
-        
         # kwargs에서 system_prompt 추출
-        if "system_prompt" in kwargs:
-            body["system_prompt"] = kwargs["system_prompt"]
+        system_prompt = kwargs.get("system_prompt")
         
         try:
-            response = requests.post(
-                self.api_url,
-                headers=headers,
-                json=body,
-                timeout=60
-            )
-            response.raise_for_status()
-            
-            api_response = response.json()
-            return api_response.get('message', 'Error: No message in response')
-            
+            return "".join(_stream_text(self, prompt, system_prompt, stop, stream=self.streaming or bool(stop)))
         except requests.RequestException as e:
             return f"API Error: {str(e)}"
 
@@ -113,6 +226,9 @@ class PotensChatModel(BaseChatModel):
     api_url: str = "https://ai.potens.ai/api/chat"
     temperature: float = 0.7
     max_tokens: int = 2000
+    forward_generation_params: bool = True  # temperature/max_tokens 전송 (서버가 거부하면 자동으로 끔)
+    streaming: bool = False                 # True면 스트리밍으로 받아 stop 시퀀스에서 즉시 중단
+    pii_middleware: Optional[Any] = None    # PiiMaskingMiddleware: 전송 전 PII 가명화 (None이면 사용 안 함)
     
     def __init__(self, **kwargs):
         super().__init__(**kwargs)
@@ -138,33 +254,20 @@ class PotensChatModel(BaseChatModel):
         
         Args:
             messages: [SystemMessage, HumanMessage, AIMessage, ...]
+            stop: 생성 중지 시퀀스 (예: REACT_STOP, 클라이언트에서 적용)
         
         Returns:
             ChatResult with AIMessage
         """
-        # 메시지를 POTENS API 형식으로 변환
+        # 메시지를 POTENS API 형식으로 변환 (PII 미들웨어가 있으면 마스킹된 메시지로)
+        if self.pii_middleware is not None:
+            messages = self.pii_middleware.mask_messages(messages)
         prompt, system_prompt = self._messages_to_prompt(messages)
         
-        headers = {
-            "Authorization": f"Bearer {self.api_key}",
-            "Content-Type": "application/json"
-        }
-        
-        body = {"prompt": prompt}
-        if system_prompt:
-            body["system_prompt"] = system_prompt
-        
         try:
-            response = requests.post(
-                self.api_url,
-                headers=headers,
-                json=body,
-                timeout=60
-            )
-            response.raise_for_status()
-            
-            api_response = response.json()
-            content = api_response.get('message', 'Error: No message in response')
+            content = "".join(_stream_text(self, prompt, system_prompt, stop, stream=self.streaming or bool(stop)))
+            if self.pii_middleware is not None:
+                content = self.pii_middleware.unmask(content)
             
             # ChatGeneration 객체 생성
             message = AIMessage(content=content)
@@ -177,6 +280,30 @@ class PotensChatModel(BaseChatModel):
             generation = ChatGeneration(message=error_message)
             return ChatResult(generations=[generation])
     
+    def _stream(
+        self,
+        messages: List[BaseMessage],
+        stop: Optional[List[str]] = None,
+        run_manager: Optional[CallbackManagerForLLMRun] = None,
+        **kwargs: Any,
+    ) -> Iterator[ChatGenerationChunk]:
+        """
+        응답을 조각 단위로 생성 (chat_model.stream()에서 사용)
+        
+        stop 시퀀스가 나오면 그 앞에서 멈추고 연결을 닫습니다.
+        """
+        if self.pii_middleware is not None:
+            messages = self.pii_middleware.mask_messages(messages)
+        prompt, system_prompt = self._messages_to_prompt(messages)
+        pieces = _stream_text(self, prompt, system_prompt, stop, stream=True)
+        if self.pii_middleware is not None:
+            pieces = self.pii_middleware.iter_unmask(pieces)
+        for text in pieces:
+            chunk = ChatGenerationChunk(message=AIMessageChunk(content=text))
+            if run_manager:
+                run_manager.on_llm_new_token(text, chunk=chunk)
+            yield chunk
+    
     def _messages_to_prompt(self, messages: List[BaseMessage]) -> tuple[str, Optional[str]]:
         """
         LangChain 메시지를 POTENS API 형식으로 변환
@@ -0,0 +1,248 @@
+# %% 0. 파일 헤더 및 설명
+"""
+ReAct 응답 파서 (스트리밍 / 단일 패스)
+
+PandasPseudoAgent, EDAAgent, SecurePandasAgent, Streamlit 앱이 각자 split/re.findall로
+응답 전체를 여러 번 훑던 코드 추출 로직을 하나로 합친 상태 기계입니다.
+
+- 청크를 받는 대로 줄 단위로 한 번만 처리 (아직 끝나지 않은 마지막 줄만 버퍼에 보관)
+- 섹션이 끝나는 즉시 이벤트 발생: thought, action, action_input(코드), final_answer
+- 코드 형식: ```python ... ``` 블록(응답 어디서든, 한 줄짜리 ```result = 1``` 포함),
+  또는 "Action Input:" 뒤의 코드 줄 (같은 줄 또는 다음 줄부터 빈 줄/다음 헤더까지)
+- 모델이 지어낸 "Observation:" 구간은 다음 헤더까지 무시
+- "Final Answer:" 이후는 끝까지 최종 답변 (줄 중간에 나와도 인식, close() 시점에 확정)
+
+스트리밍 LLM과 함께 쓰면 응답이 다 내려오기 전에 앞쪽 코드부터 실행할 수 있습니다.
+
+사용법:
+    from react_parser import ReActParser, parse_react
+
+    parsed = parse_react(response.content)
+    parsed.codes, parsed.final_answer
+
+    parser = ReActParser()
+    for chunk in chat_model.stream(messages):
+        for event in parser.feed(chunk.content):
+            if event.kind == ACTION_INPUT:
+                executor.submit(run, event.text)
+    parser.close()
+"""
+
+import re
+from typing import Iterable, Iterator, List, NamedTuple, Optional
+
+# 이벤트 종류
+THOUGHT = "thought"
+ACTION = "action"
+ACTION_INPUT = "action_input"
+FINAL_ANSWER = "final_answer"
+
+# 줄 시작의 ReAct 헤더 (**Thought:** 같은 마크다운 강조도 허용)
+HEADER_PATTERN = re.compile(
+    r"^\s*\**\s*(Thought|Action Input|Action|Final Answer|Observation)\s*\**\s*:\s*\**\s?(.*)$"
+)
+
+# 줄 중간의 Final Answer ("...충분합니다. Final Answer: 서울이 가장 높습니다")
+INLINE_FINAL_PATTERN = re.compile(r"\**\s*Final Answer\s*\**\s*:\s*\**\s?")
+
+# 여는 ``` 뒤의 언어 태그 (```python, ```py ...)
+LANGUAGE_TAG = re.compile(r"[\w+-]*")
+# 한 줄짜리 블록 앞의 언어 이름 (```python result = 1```)
+LANGUAGE_PREFIX = re.compile(r"^(?:python|py)\s+")
+
+# %% 1. 이벤트
+
+class ReActEvent(NamedTuple):
+    """파서가 섹션 하나를 완성할 때마다 내보내는 이벤트"""
+    kind: str   # THOUGHT, ACTION, ACTION_INPUT, FINAL_ANSWER
+    text: str
+
+# %% 2. 파서
+
+class ReActParser:
+    """
+    청크 단위로 입력을 받는 ReAct 응답 상태 기계
+
+    feed()/close()가 그 시점에 완성된 이벤트 목록을 반환하고,
+    누적 결과는 thoughts, actions, codes, final_answer 속성에 남습니다.
+    """
+
+    def __init__(self, strip_comments: bool = False):
+        """
+        Args:
+            strip_comments: True면 코드에서 빈 줄과 주석 줄(#...) 제거
+        """
+        self.strip_comments = strip_comments
+        self.thoughts: List[str] = []
+        self.actions: List[str] = []
+        self.codes: List[str] = []
+        self.final_answer: Optional[str] = None
+
+        self._pending = ""          # 아직 줄바꿈이 오지 않은 마지막 줄
+        self._section = None        # thought / action_input / final / observation / None
+        self._lines: List[str] = [] # 현재 섹션(생각, 코드, 최종 답변)의 줄
+        self._fenced = False        # ``` 블록 안인지
+        self._closed = False
+
+    def feed(self, chunk: str) -> List[ReActEvent]:
+        """청크 하나를 처리하고 완성된 이벤트 반환"""
+        if self._closed:
+            raise ValueError("이미 close()된 파서입니다")
+        events: List[ReActEvent] = []
+        if not chunk:
+            return events
+        *lines, self._pending = (self._pending + chunk).split("\n")
+        for line in lines:
+            self._consume_line(line, events)
+        return events
+
+    def close(self) -> List[ReActEvent]:
+        """스트림 종료: 남은 줄과 열린 섹션을 마무리하고 이벤트 반환"""
+        events: List[ReActEvent] = []
+        if self._closed:
+            return events
+        if self._pending:
+            self._consume_line(self._pending, events)
+            self._pending = ""
+        if self._fenced:
+            # 닫는 ``` 전에 응답이 끊긴 경우(stop 시퀀스 등)에도 코드는 살림
+            self._fenced = False
+            self._emit_code(events)
+        self._end_section(events)
+        self._closed = True
+        return events
+
+    # ---- 줄 처리 ----
+
+    def _consume_line(self, line: str, events: List[ReActEvent]):
+        stripped = line.strip()
+
+        if self._section == "final":
+            # 최종 답변은 끝까지 (코드 블록 포함) 그대로 보관
+            self._lines.append(line)
+            return
+
+        if self._fenced:
+            if stripped.endswith("```"):
+                # 닫는 ``` (코드 마지막 줄 끝에 붙은 경우 포함)
+                if stripped != "```":
+                    self._lines.append(line.rstrip()[:-3])
+                self._fenced = False
+                self._emit_code(events)
+                self._section = None
+            else:
+                self._lines.append(line)
+            return
+
+        if stripped.startswith("```"):
+            # 응답 어디서든 코드 블록 시작 (진행 중이던 생각/코드 줄은 마무리)
+            self._end_section(events)
+            self._section = "action_input"
+            self._open_fence(stripped, events)
+            return
+
+        match = HEADER_PATTERN.match(line)
+        if not (match and match.group(1) == "Final Answer"):
+            inline = INLINE_FINAL_PATTERN.search(line, match.end(1) if match else 0)
+            if inline:
+                # 앞부분(Thought: ... 등)을 먼저 처리한 뒤 최종 답변 시작
+                if line[:inline.start()].strip():
+                    self._consume_line(line[:inline.start()], events)
+                if self._section != "final":
+                    self._start_section("Final Answer", line[inline.end():].rstrip(), events)
+                return
+
+        if match:
+            self._start_section(match.group(1), match.group(2).rstrip(), events)
+            return
+
+        if self._section == "thought":
+            self._lines.append(line)
+        elif self._section == "action_input":
+            if stripped:
+                self._lines.append(line)
+            elif self._lines:
+                # 코드 블록 없는 Action Input은 빈 줄에서 끝
+                self._end_section(events)
+
+    def _start_section(self, header: str, rest: str, events: List[ReActEvent]):
+        self._end_section(events)
+        self._lines = []
+
+        if header == "Thought":
+            self._section = "thought"
+            if rest:
+                self._lines.append(rest)
+        elif header == "Action":
+            self.actions.append(rest.strip())
+            events.append(ReActEvent(ACTION, rest.strip()))
+        elif header == "Action Input":
+            self._section = "action_input"
+            if rest.strip().startswith("```"):
+                self._open_fence(rest.strip(), events)
+            elif rest.strip():
+                self._lines.append(rest)
+        elif header == "Final Answer":
+            self._section = "final"
+            if rest:
+                self._lines.append(rest)
+        else:
+            # 모델이 지어낸 Observation → 다음 헤더까지 무시
+            self._section = "observation"
+
+    def _open_fence(self, text: str, events: List[ReActEvent]):
+        """
+        ``` 로 시작하는 텍스트 처리
+
+        같은 줄에서 닫히면(```result = 1```) 바로 코드로 내보내고, 아니면 블록을 열어 둡니다.
+        여는 ``` 뒤가 언어 태그(python)면 버리고, 코드면 첫 줄로 보관합니다.
+        """
+        body = text[3:]
+        if body.rstrip().endswith("```"):
+            self._lines = [LANGUAGE_PREFIX.sub("", body.rstrip()[:-3].strip())]
+            self._emit_code(events)
+            self._section = None
+            return
+        self._fenced = True
+        self._lines = [] if LANGUAGE_TAG.fullmatch(body.strip()) else [body]
+
+    def _end_section(self, events: List[ReActEvent]):
+        if self._section == "thought":
+            thought = "\n".join(self._lines).strip()
+            if thought:
+                self.thoughts.append(thought)
+                events.append(ReActEvent(THOUGHT, thought))
+        elif self._section == "action_input" and not self._fenced:
+            self._emit_code(events)
+        elif self._section == "final":
+            self.final_answer = "\n".join(self._lines).strip()
+            events.append(ReActEvent(FINAL_ANSWER, self.final_answer))
+        self._section = None
+        self._lines = []
+
+    def _emit_code(self, events: List[ReActEvent]):
+        lines = self._lines
+        if self.strip_comments:
+            lines = [l for l in lines if l.strip() and not l.strip().startswith("#")]
+        code = "\n".join(lines).strip()
+        self._lines = []
+        if code:
+            self.codes.append(code)
+            events.append(ReActEvent(ACTION_INPUT, code))
+
+# %% 3. 편의 함수
+
+def parse_react(text: str, strip_comments: bool = False) -> ReActParser:
+    """완성된 응답 텍스트 하나를 파싱 (codes, final_answer 등은 반환된 파서의 속성)"""
+    parser = ReActParser(strip_comments=strip_comments)
+    parser.feed(text)
+    parser.close()
+    return parser
+
+
+def iter_events(chunks: Iterable[str], strip_comments: bool = False) -> Iterator[ReActEvent]:
+    """문자열 청크 스트림에서 이벤트를 완성되는 대로 생성"""
+    parser = ReActParser(strip_comments=strip_comments)
+    for chunk in chunks:
+        yield from parser.feed(chunk)
+    yield from parser.close()
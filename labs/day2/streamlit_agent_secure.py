@@ -11,16 +11,45 @@ import pandas as pd
 import numpy as np
 from typing import Optional, Dict, Any
 from langchain_core.messages import HumanMessage, AIMessage, SystemMessage
-from potens_wrapper import PotensChatModel
+from potens_wrapper import PotensChatModel, REACT_STOP
+from data_profile import summarize_profile
+from react_parser import parse_react
+from pii_dataframe import mask_dataframe, print_pii_report
 
 # ============================================================================
 # Part 1: 안전한 시스템 프롬프트 (스키마만 전달)
 # ============================================================================
 
-def create_safe_system_prompt(df: pd.DataFrame) -> str:
+SAFE_PROMPT_RULES = """
+**중요: 데이터는 사용자의 로컬 환경에만 존재합니다.**
+당신은 코드만 생성하고, 사용자가 로컬에서 실행합니다.
+
+형식:
+Thought: (분석 계획)
+Action: python_repl
+Action Input: (Pandas 코드, result 변수에 저장)
+
+Observation을 받으면 해석하고 다음 단계를 제안하세요.
+"""
+
+def create_safe_system_prompt(df: pd.DataFrame, profile: Optional[Dict[str, Any]] = None) -> str:
     """
     데이터의 스키마 정보만 추출 (실제 값은 포함 X)
+    
+    Args:
+        df: 분석할 DataFrame
+        profile: data_profile 프로파일 (있으면 재계산 없이 메타정보만 사용)
     """
+    if profile:
+        # 캐시된 프로파일에서 값/분포를 제외한 메타정보만 사용
+        schema_text = summarize_profile(profile, max_chars=2000, include_values=False)
+        return f"""
+당신은 Pandas 데이터 분석 전문가입니다.
+
+**데이터 스키마 (메타정보만):**
+{schema_text}
+""" + SAFE_PROMPT_RULES
+    
     schema_info = {
         "num_rows": len(df),
         "num_columns": len(df.columns),
@@ -46,18 +75,7 @@ def create_safe_system_prompt(df: pd.DataFrame) -> str:
     for col, info in schema_info['columns'].items():
         prompt += f"\n  - {col}: {info['dtype']}, 결측치={'있음' if info['has_null'] else '없음'}"
     
-    prompt += """
-
-**중요: 데이터는 사용자의 로컬 환경에만 존재합니다.**
-당신은 코드만 생성하고, 사용자가 로컬에서 실행합니다.
-
-형식:
-Thought: (분석 계획)
-Action: python_repl
-Action Input: (Pandas 코드, result 변수에 저장)
-
-Observation을 받으면 해석하고 다음 단계를 제안하세요.
-"""
+    prompt += "\n" + SAFE_PROMPT_RULES
     
     return prompt
 
@@ -126,18 +144,41 @@ class SecurePandasAgent:
     데이터를 외부로 보내지 않는 안전한 Agent
     """
     
-    def __init__(self, chat_model: PotensChatModel, df: pd.DataFrame):
+    def __init__(
+        self,
+        chat_model: PotensChatModel,
+        df: pd.DataFrame,
+        profile: Optional[Dict[str, Any]] = None,
+        mask_pii: bool = False,
+    ):
+        """
+        Args:
+            chat_model: LLM
+            df: 분석할 DataFrame
+            profile: data_profile 프로파일
+            mask_pii: True면 분석 전에 PII 컬럼(이름, ID, 전화번호 등)을 가명화/삭제 (pii_dataframe)
+        """
         self.chat_model = chat_model
+        self.pii_report = None
+        if mask_pii:
+            # 실행되는 코드도 마스킹된 값만 보도록 DataFrame 자체를 교체
+            df, self.pii_report = mask_dataframe(df)
+            print_pii_report(self.pii_report)
         self.df = df
         self.messages = []
         
         # 스키마만 포함된 시스템 프롬프트
-        safe_prompt = create_safe_system_prompt(df)
+        safe_prompt = create_safe_system_prompt(df, profile=profile)
+        if self.pii_report is not None and not self.pii_report.empty:
+            masked_cols = ", ".join(f"{col}({row['action']})" for col, row in self.pii_report.iterrows())
+            safe_prompt += f"\n**PII 마스킹된 컬럼:** {masked_cols} (가명화된 값은 같은 값끼리 같은 토큰)\n"
         self.messages.append(SystemMessage(content=safe_prompt))
         
         print("✅ 보안 설정 완료:")
         print("   - 데이터 스키마만 LLM에 전달")
         print("   - 실제 값은 로컬에만 유지")
+        if mask_pii:
+            print("   - PII 컬럼은 분석 전에 마스킹")
     
     def run(self, question: str, max_iterations: int = 5):
         """안전하게 분석 실행"""
@@ -154,17 +195,18 @@ class SecurePandasAgent:
             print(f"반복 {i+1}/{max_iterations}")
             
             # LLM 호출
-            response = self.chat_model.invoke(self.messages)
+            response = self.chat_model.invoke(self.messages, stop=REACT_STOP)
             print(f"\n🤖 Agent:\n{response.content[:300]}...")
             
             self.messages.append(response)
+            parsed = parse_react(response.content)
             
             # Final Answer 확인
-            if "Final Answer:" in response.content:
-                return self._extract_final_answer(response.content)
+            if parsed.final_answer is not None:
+                return parsed.final_answer
             
             # 코드 추출
-            code = self._extract_code(response.content)
+            code = parsed.codes[0] if parsed.codes else None
             if code:
                 print(f"\n💻 생성된 코드:\n{code}")
                 
@@ -200,24 +242,6 @@ class SecurePandasAgent:
             return local_vars.get("result", "실행 완료")
         except Exception as e:
             return f"에러: {str(e)}"
-    
-    def _extract_code(self, text: str) -> Optional[str]:
-        """코드 추출"""
-        if "Action Input:" in text:
-            lines = text.split("Action Input:")[1].split("\n")
-            code_lines = []
-            for line in lines[1:]:
-                if line.strip() == "" or "Observation" in line or "Thought" in line:
-                    break
-                code_lines.append(line)
-            return "\n".join(code_lines).strip() if code_lines else None
-        return None
-    
-    def _extract_final_answer(self, text: str) -> str:
-        """Final Answer 추출"""
-        if "Final Answer:" in text:
-            return text.split("Final Answer:")[1].strip()
-        return text
 
 # ============================================================================
 # Part 4: 보안 vs 비보안 비교 데모
@@ -271,6 +295,13 @@ def demo_security_comparison():
     safe_obs = create_safe_observation(result)
     print(f"   {safe_obs}")
     print("   → 통계값은 OK (개인 식별 불가)")
+    
+    print("\n" + "="*80)
+    print("🕵️ PII 컬럼 마스킹 (SecurePandasAgent(mask_pii=True))")
+    print("="*80)
+    masked, report = mask_dataframe(df)
+    print_pii_report(report)
+    print(masked.to_string())
 
 # ============================================================================
 # Part 5: Streamlit 적용 예시
@@ -0,0 +1,239 @@
+# %% 0. 파일 헤더 및 설명
+"""
+실습 데이터셋 대용량 생성기 (ecommerce / hr / basic)
+
+data/DATASET_GUIDE.md에 적힌 숨겨진 인사이트를 그대로 심은 데이터를
+원하는 행 수만큼 청크 단위로 생성해 CSV 또는 Parquet으로 바로 씁니다.
+(메모리는 청크 하나 크기만 사용 → 1,000만 행 이상도 가능)
+
+숨겨진 인사이트:
+- ecommerce: 프리미엄 고객 구매액 2배, 서울 고객 평점 높음, 40대 구매 횟수 최다, 여성 평점 약간 높음
+- hr: 개발 부서 연봉 20% 높음, 부장 연봉은 사원의 2.5배, 야근↑ → 만족도↓, 만족도↓ → 퇴사율↑
+- basic: 패턴 없이 결측치(salary 5%, score 3%) 포함
+
+재현성:
+- 청크 i는 (seed, i)로 만든 난수 생성기를 사용하므로 seed, rows, chunk_rows가 같으면 항상 같은 파일
+
+사용법:
+    python synthetic_data.py ecommerce --rows 10000000 --out data/ecommerce_10m.parquet
+    python synthetic_data.py hr --rows 1000000 --out data/hr_1m.csv --seed 7
+
+    from synthetic_data import generate, write_dataset
+    df = generate("ecommerce", 1000)                  # 메모리에서 바로 사용
+"""
+
+import os
+import sys
+import time
+import argparse
+from typing import Callable, Dict, Iterator, Optional
+
+import numpy as np
+import pandas as pd
+
+DEFAULT_SEED = 42
+DEFAULT_CHUNK_ROWS = 500_000
+
+# %% 1. 스키마별 청크 생성 (벡터화)
+
+def _dates(rng: np.random.Generator, n: int, start: str = "2023-01-01", days: int = 365) -> np.ndarray:
+    """start부터 days일 안의 임의 날짜 문자열 (YYYY-MM-DD)"""
+    base = np.datetime64(start)
+    return (base + rng.integers(0, days, n).astype("timedelta64[D]")).astype(str)
+
+
+def ecommerce_chunk(rng: np.random.Generator, start_id: int, n: int) -> pd.DataFrame:
+    """전자상거래 고객 n명 (customer_id는 start_id부터)"""
+    age = rng.integers(20, 70, n)
+    gender = rng.choice(np.array(["F", "M"]), n, p=[0.52, 0.48])
+    region = rng.choice(np.array(["서울", "경기", "부산", "대구", "기타"]), n, p=[0.31, 0.23, 0.2, 0.16, 0.1])
+    is_premium = (rng.random(n) < 0.29).astype(np.int64)
+
+    # 👔 40대 구매 횟수 최다
+    purchase_count = rng.poisson(5, n) + np.where((age >= 40) & (age < 50), 2, 0)
+    # 💎 프리미엄 고객 구매액 2배
+    total_amount = rng.exponential(250_000, n) * np.where(is_premium == 1, 2.0, 1.0)
+    # 🏙️ 서울 평점 +0.5, 👩 여성 평점 +0.15
+    rating = rng.normal(3.0, 0.9, n) + np.where(region == "서울", 0.5, 0.0) + np.where(gender == "F", 0.15, 0.0)
+
+    return pd.DataFrame({
+        "customer_id": np.arange(start_id, start_id + n),
+        "age": age,
+        "gender": gender,
+        "region": region,
+        "purchase_count": purchase_count,
+        "total_amount": total_amount.astype(np.int64) + 1,
+        "avg_rating": np.clip(rating, 1, 5).round(2),
+        "is_premium": is_premium,
+        "signup_date": _dates(rng, n),
+    })
+
+
+HR_DEPARTMENTS = np.array(["개발", "마케팅", "영업", "재무", "기획", "인사"])
+HR_POSITIONS = np.array(["사원", "대리", "과장", "차장", "부장"])
+HR_POSITION_PAY = np.array([1.0, 1.3, 1.7, 2.1, 2.5])
+
+
+def hr_chunk(rng: np.random.Generator, start_id: int, n: int) -> pd.DataFrame:
+    """인사 데이터 직원 n명 (employee_id는 start_id부터)"""
+    department = rng.choice(HR_DEPARTMENTS, n, p=[0.3, 0.22, 0.2, 0.11, 0.09, 0.08])
+    position_idx = rng.choice(len(HR_POSITIONS), n, p=[0.34, 0.2, 0.25, 0.14, 0.07])
+
+    # 📊 직급별 연봉 (부장 = 사원 x 2.5), 💻 개발 부서 +20%
+    salary = (
+        45_000_000 * HR_POSITION_PAY[position_idx]
+        * np.where(department == "개발", 1.2, 1.0)
+        * rng.lognormal(0.0, 0.15, n)
+    )
+    # 😰 야근이 많을수록 만족도 낮음
+    overtime = np.clip(rng.poisson(20, n), 0, 60)
+    satisfaction = np.clip(rng.normal(3.0, 0.7, n) - 0.08 * (overtime - 20), 1, 5)
+    # 🚪 만족도가 낮을수록 퇴사 확률 높음 (로지스틱)
+    resign_prob = 1 / (1 + np.exp(0.8 + 1.5 * (satisfaction - 3.0)))
+
+    ids = np.arange(start_id, start_id + n)
+    return pd.DataFrame({
+        "employee_id": ids,
+        "name": np.char.add("직원", ids.astype(str)),
+        "age": rng.integers(25, 60, n),
+        "gender": rng.choice(np.array(["F", "M"]), n, p=[0.53, 0.47]),
+        "department": department,
+        "position": HR_POSITIONS[position_idx],
+        "years_at_company": rng.integers(1, 25, n),
+        "salary": (salary // 1000 * 1000).astype(np.int64),
+        "performance_score": np.clip(rng.normal(80, 10, n), 60, 99.9).round(1),
+        "overtime_hours": overtime,
+        "satisfaction_score": satisfaction.round(2),
+        "has_resigned": (rng.random(n) < resign_prob).astype(np.int64),
+    })
+
+
+def basic_chunk(rng: np.random.Generator, start_id: int, n: int) -> pd.DataFrame:
+    """기본 실습 데이터 n명 (salary 5%, score 3% 결측)"""
+    ids = np.arange(start_id, start_id + n)
+    salary = (rng.integers(3_000, 8_000, n) * 10_000).astype(float)
+    salary[rng.random(n) < 0.05] = np.nan
+    score = rng.uniform(60, 100, n).round(1)
+    score[rng.random(n) < 0.03] = np.nan
+    return pd.DataFrame({
+        "id": ids,
+        "name": np.char.add("User", ids.astype(str)),
+        "age": rng.integers(20, 65, n),
+        "gender": rng.choice(np.array(["M", "F"]), n),
+        "city": rng.choice(np.array(["서울", "대구", "인천", "부산", "광주"]), n, p=[0.28, 0.25, 0.24, 0.14, 0.09]),
+        "salary": salary,
+        "experience_years": rng.integers(0, 20, n),
+        "score": score,
+    })
+
+
+SCHEMAS: Dict[str, Callable[[np.random.Generator, int, int], pd.DataFrame]] = {
+    "ecommerce": ecommerce_chunk,
+    "hr": hr_chunk,
+    "basic": basic_chunk,
+}
+
+# %% 2. 청크 스트림 / 파일 쓰기
+
+def iter_chunks(
+    schema: str,
+    rows: int,
+    chunk_rows: int = DEFAULT_CHUNK_ROWS,
+    seed: int = DEFAULT_SEED,
+) -> Iterator[pd.DataFrame]:
+    """
+    rows행을 chunk_rows씩 나눠 생성 (청크마다 독립 난수 생성기)
+
+    Args:
+        schema: "ecommerce", "hr", "basic"
+        rows: 전체 행 수
+        chunk_rows: 청크 하나의 행 수 (메모리 사용량 결정)
+        seed: 난수 시드
+    """
+    if schema not in SCHEMAS:
+        raise ValueError(f"지원하지 않는 스키마: {schema!r} (가능: {', '.join(SCHEMAS)})")
+    make_chunk = SCHEMAS[schema]
+    for index, start in enumerate(range(0, rows, chunk_rows)):
+        rng = np.random.default_rng([seed, index])
+        yield make_chunk(rng, start + 1, min(chunk_rows, rows - start))
+
+
+def generate(schema: str, rows: int, seed: int = DEFAULT_SEED,
+             chunk_rows: int = DEFAULT_CHUNK_ROWS) -> pd.DataFrame:
+    """메모리에 DataFrame으로 생성 (작은 데이터용)"""
+    return pd.concat(iter_chunks(schema, rows, chunk_rows, seed), ignore_index=True)
+
+
+def write_dataset(
+    schema: str,
+    rows: int,
+    out: str,
+    seed: int = DEFAULT_SEED,
+    chunk_rows: int = DEFAULT_CHUNK_ROWS,
+    verbose: bool = True,
+) -> Dict[str, float]:
+    """
+    청크 단위로 생성하며 CSV 또는 Parquet(확장자로 판단)에 바로 쓰기
+
+    CSV는 기존 샘플처럼 utf-8-sig(BOM)로 저장하고,
+    Parquet은 청크 하나가 row group 하나가 됩니다 (partitioned_engine의 파티션 단위).
+
+    Returns:
+        {"rows", "seconds", "size_mb"}
+    """
+    is_parquet = out.endswith((".parquet", ".pq"))
+    directory = os.path.dirname(out)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+
+    started = time.perf_counter()
+    written = 0
+    writer = None
+    try:
+        for index, chunk in enumerate(iter_chunks(schema, rows, chunk_rows, seed)):
+            if is_parquet:
+                import pyarrow as pa
+                import pyarrow.parquet as pq
+                table = pa.Table.from_pandas(chunk, preserve_index=False)
+                if writer is None:
+                    writer = pq.ParquetWriter(out, table.schema)
+                writer.write_table(table.cast(writer.schema))
+            elif index == 0:
+                chunk.to_csv(out, index=False, encoding="utf-8-sig")
+            else:
+                chunk.to_csv(out, index=False, header=False, mode="a", encoding="utf-8")
+            written += len(chunk)
+            if verbose:
+                print(f"   {written:,} / {rows:,}행 ({written / rows:.0%})")
+    finally:
+        if writer is not None:
+            writer.close()
+
+    seconds = time.perf_counter() - started
+    size_mb = os.path.getsize(out) / (1024 * 1024) if os.path.exists(out) else 0.0
+    if verbose:
+        print(f"✅ {out}: {written:,}행, {size_mb:.1f}MB, {seconds:.1f}초")
+    return {"rows": written, "seconds": round(seconds, 2), "size_mb": round(size_mb, 2)}
+
+# %% 3. CLI
+
+def main(argv: Optional[list] = None) -> int:
+    parser = argparse.ArgumentParser(description="숨겨진 인사이트가 있는 실습 데이터셋을 대용량으로 생성")
+    parser.add_argument("schema", choices=sorted(SCHEMAS), help="생성할 데이터셋 종류")
+    parser.add_argument("--rows", type=int, default=1_000_000, help="행 수 (기본 1,000,000)")
+    parser.add_argument("--out", help="출력 파일 (.csv 또는 .parquet, 기본 data/<schema>_<rows>.csv)")
+    parser.add_argument("--seed", type=int, default=DEFAULT_SEED, help=f"난수 시드 (기본 {DEFAULT_SEED})")
+    parser.add_argument("--chunk-rows", type=int, default=DEFAULT_CHUNK_ROWS,
+                        help=f"청크 행 수 (메모리 사용량, 기본 {DEFAULT_CHUNK_ROWS:,})")
+    parser.add_argument("--quiet", action="store_true", help="진행 로그 생략")
+    args = parser.parse_args(argv)
+
+    if args.rows <= 0 or args.chunk_rows <= 0:
+        parser.error("--rows와 --chunk-rows는 1 이상이어야 합니다")
+    out = args.out or os.path.join("data", f"{args.schema}_{args.rows}.csv")
+    write_dataset(args.schema, args.rows, out, seed=args.seed, chunk_rows=args.chunk_rows, verbose=not args.quiet)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,74 @@
+"""
+agent_checkpoint 회귀 테스트: 쓰다 만 마지막 줄이 있는 파일에서 이어서 기록해도 이후 레코드를 잃지 않는지 확인
+
+실행: python test/_test_agent_checkpoint.py  (labs/day2에서)
+Jupyter Notebook에서 # %% 단위로 실행 가능
+"""
+# %%
+# === 1. 준비: 두 단계를 기록한 체크포인트 ===
+import os
+import sys
+import tempfile
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from langchain_core.messages import AIMessage, HumanMessage
+from agent_checkpoint import AgentCheckpoint
+
+
+def write_session(directory: str) -> AgentCheckpoint:
+    checkpoint = AgentCheckpoint("torn", directory=directory)
+    checkpoint.reset({"goal": "매출 분석"})
+    checkpoint.record_message(HumanMessage(content="매출 분석"))
+    checkpoint.record_message(AIMessage(content="Action: df.shape"))
+    checkpoint.record_step(1, ["df.shape"], [(100, 5)], "(100, 5)")
+    checkpoint.commit()
+    checkpoint.record_message(AIMessage(content="Action: df.head()"))
+    checkpoint.record_step(2, ["df.head()"], ["..."], "...")
+    checkpoint.close()
+    return checkpoint
+
+# %%
+# === 2. 마지막 줄이 잘린 파일 → 로드 시 잘라내고, 이후 기록은 다시 읽힘 ===
+if __name__ == "__main__":
+    with tempfile.TemporaryDirectory() as tmp:
+        checkpoint = write_session(tmp)
+        with open(checkpoint.path, "rb") as f:
+            data = f.read()
+        # 마지막 레코드를 쓰다가 죽은 상황 (줄 중간에서 끊김)
+        with open(checkpoint.path, "wb") as f:
+            f.write(data[:-20])
+
+        resumed = AgentCheckpoint("torn", directory=tmp)
+        state = resumed.load()
+        assert state["meta"] == {"goal": "매출 분석"}
+        assert [h["iteration"] for h in state["history"]] == [1]
+        assert data.startswith(open(checkpoint.path, "rb").read()), "쓰다 만 줄이 남아 있음"
+
+        resumed.record_step(2, ["df.head()"], ["..."], "...")
+        resumed.record_final("서울 매출이 가장 높습니다")
+        resumed.close()
+
+        state = AgentCheckpoint("torn", directory=tmp).load()
+        assert [h["iteration"] for h in state["history"]] == [1, 2], state["history"]
+        assert state["final"] == "서울 매출이 가장 높습니다"
+        print("✅ 쓰다 만 줄을 잘라낸 뒤 이어서 기록한 레코드도 복구됨")
+
+# %%
+# === 3. 줄바꿈만 빠진 마지막 줄도 잘라냄 (다음 레코드와 한 줄로 붙지 않도록) ===
+if __name__ == "__main__":
+    with tempfile.TemporaryDirectory() as tmp:
+        checkpoint = write_session(tmp)
+        with open(checkpoint.path, "rb") as f:
+            data = f.read()
+        with open(checkpoint.path, "wb") as f:
+            f.write(data[:-1])
+
+        resumed = AgentCheckpoint("torn", directory=tmp)
+        resumed.load()
+        resumed.record_final("완료")
+        resumed.close()
+
+        state = AgentCheckpoint("torn", directory=tmp).load()
+        assert state["final"] == "완료"
+        assert [h["iteration"] for h in state["history"]] == [1]
+        print("✅ 줄바꿈이 빠진 마지막 줄도 잘라내고 이어서 기록")
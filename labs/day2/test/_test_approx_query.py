@@ -0,0 +1,69 @@
+"""
+approx_query 회귀 테스트: 행 수에 비례하는 결과는 근사하지 않고, 길이와 무관한 통계만 근사하는지 확인
+
+실행: python test/_test_approx_query.py  (labs/day2에서)
+Jupyter Notebook에서 # %% 단위로 실행 가능
+"""
+# %%
+# === 1. 준비: 20만 행 DataFrame과 근사 엔진 ===
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from approx_query import ApproxEngine
+
+
+def make_frame(rows: int = 200_000) -> pd.DataFrame:
+    rng = np.random.default_rng(0)
+    return pd.DataFrame({
+        "region": rng.choice(["서울", "경기", "부산"], rows, p=[0.5, 0.3, 0.2]),
+        "amt": rng.normal(200, 30, rows).round(2),
+    })
+
+
+def run(code: str, frame: pd.DataFrame):
+    return eval(code, {"pd": pd, "np": np}, {"df": frame})
+
+
+def check_engine(df: pd.DataFrame, approx: ApproxEngine):
+    # 행 수에 비례하는 결과 → 근사하지 않음 (호출 측이 정확히 계산)
+    for code in ("len(df)", "df.amt.sum()", "(df.amt > 200).sum()", "df['region'].value_counts()",
+                 "df.groupby('region')['amt'].count()", "df.shape[0]"):
+        assert approx.estimate(lambda frame: run(code, frame)) is None, code
+
+    # 표본에서 치우치는 연산 → 코드 단계에서 걸러냄
+    for code in ("df.amt.max()", "df.amt.min()", "df['region'].nunique()"):
+        assert approx.is_biased(code), code
+    assert not approx.is_biased("df.amt.mean()")
+
+    # 길이와 무관한 통계 → 근사하고, 신뢰구간이 실제 값을 포함
+    for code in ("df.amt.mean()", "(df.amt > 200).mean()", "df.groupby('region')['amt'].mean()",
+                 "df['region'].value_counts(normalize=True)", "df.amt.std()"):
+        estimate = approx.estimate(lambda frame: run(code, frame))
+        assert estimate is not None and estimate["precise"], code
+        exact = run(code, df)
+        exact = pd.Series([float(exact)], index=["value"]) if np.isscalar(exact) else exact.astype(float)
+        # 층 비율은 표본 배분 반올림만큼 어긋날 수 있음 (구간 폭 0)
+        slack = (estimate["high"] - estimate["low"]).reindex(exact.index) + exact.abs() * 1e-3
+        assert ((exact >= estimate["low"].reindex(exact.index) - slack)
+                & (exact <= estimate["high"].reindex(exact.index) + slack)).all(), code
+
+# %%
+# === 2. 메모리 DataFrame / CSV 표본 모두 확인 ===
+if __name__ == "__main__":
+    import tempfile
+
+    df = make_frame()
+    check_engine(df, ApproxEngine.from_frame(df, sample_size=20_000, strata="region"))
+    print("✅ approx_query: 길이 의존 결과는 정확 계산, 길이 무관 통계만 근사 (from_frame)")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "sample.csv")
+        df.to_csv(path, index=False)
+        approx = ApproxEngine.from_csv(path, sample_size=20_000, strata="region")
+        assert approx.population_rows == len(df)
+        check_engine(df, approx)
+    print("✅ approx_query: 길이 의존 결과는 정확 계산, 길이 무관 통계만 근사 (from_csv)")
@@ -0,0 +1,51 @@
+"""
+dtype_compaction 회귀 테스트: 압축 전후 Agent 코드의 계산 결과가 같은지 확인
+
+실행: python test/_test_dtype_compaction.py  (labs/day2에서)
+Jupyter Notebook에서 # %% 단위로 실행 가능
+"""
+# %%
+# === 1. 준비: 샘플 데이터 로드 ===
+import os
+import sys
+
+import pandas as pd
+
+DAY2_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+sys.path.insert(0, DAY2_DIR)
+from dtype_compaction import compact_dtypes
+
+# Agent가 흔히 만드는 산술 코드 (정수를 int8/int32로 줄이면 오버플로하던 식)
+EXPRESSIONS = [
+    "(df['age'] * 2).max()",
+    "(df['age'] ** 2).max()",
+    "(df['total_amount'] * 1000).min()",
+    "df['total_amount'].sum()",
+    "df.groupby('region', observed=True)['total_amount'].sum().sort_index()",
+    "(df['purchase_count'] * df['total_amount']).mean()",
+]
+
+# %%
+# === 2. 압축 전후 비교 ===
+if __name__ == "__main__":
+    raw = pd.read_csv(os.path.join(DAY2_DIR, "data", "sample_ecommerce.csv"))
+    compacted, report = compact_dtypes(raw)
+
+    assert isinstance(compacted["region"].dtype, pd.CategoricalDtype)
+    assert pd.api.types.is_datetime64_any_dtype(compacted["signup_date"])
+    assert compacted["age"].dtype == raw["age"].dtype  # 정수는 기본으로 그대로
+    assert report.loc["(합계)", "after_bytes"] < report.loc["(합계)", "before_bytes"]
+
+    for expr in EXPRESSIONS:
+        before = eval(expr, {"df": raw})
+        after = eval(expr, {"df": compacted})
+        if isinstance(before, pd.Series):
+            pd.testing.assert_series_equal(before, after, check_index_type=False, check_categorical=False)
+        else:
+            assert before == after, (expr, before, after)
+    print(f"✅ dtype_compaction: 압축 전후 산술 결과 {len(EXPRESSIONS)}개 동일")
+
+    # 정수 축소는 명시적으로 켤 때만
+    downcast, _ = compact_dtypes(raw, downcast_integers=True)
+    assert downcast["age"].dtype.itemsize < raw["age"].dtype.itemsize
+    print("✅ dtype_compaction: downcast_integers=True일 때만 정수 축소")
@@ -0,0 +1,103 @@
+"""
+partitioned_engine 회귀 테스트: 여러 파티션으로 나눈 CSV 결과가 pandas와 같은지 확인
+
+실행: python test/_test_partitioned_engine.py  (labs/day2에서)
+Jupyter Notebook에서 # %% 단위로 실행 가능
+"""
+# %%
+# === 1. 준비: 샘플 데이터를 작은 파티션으로 나누기 ===
+import os
+import sys
+import tempfile
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from partitioned_engine import PartitionedFrame
+
+
+def make_csv(path: str, rows: int = 5000) -> pd.DataFrame:
+    rng = np.random.default_rng(0)
+    df = pd.DataFrame({
+        "region": rng.choice(["서울", "경기", "부산"], rows),
+        "gender": rng.choice(["F", "M"], rows),
+        "amount": rng.exponential(1000, rows).round(2),
+        "count": rng.integers(0, 20, rows),
+        "signup_date": pd.Timestamp("2024-01-01") + pd.to_timedelta(rng.integers(0, 365, rows), unit="D"),
+    })
+    df.loc[::97, "amount"] = np.nan
+    df.to_csv(path, index=False)
+    return pd.read_csv(path)
+
+
+def check_frame(pdf: PartitionedFrame, df: pd.DataFrame):
+    assert len(pdf._dataset.specs) > 1, "파티션이 하나뿐이면 합치기 로직을 검증할 수 없음"
+    assert len(pdf) == len(df)
+
+    grouped = df.groupby("region")
+    for func in ("sum", "mean", "count", "min", "max", "var", "std"):
+        got = getattr(pdf.groupby("region")[["amount", "count"]], func)()
+        want = getattr(grouped[["amount", "count"]], func)()
+        pd.testing.assert_frame_equal(got, want, check_dtype=False, check_exact=False, rtol=1e-9)
+
+    pd.testing.assert_series_equal(pdf.groupby("region").size(), grouped.size(),
+                                   check_dtype=False, check_names=False)
+    pd.testing.assert_series_equal(pdf.groupby(["region", "gender"])["amount"].mean(),
+                                   df.groupby(["region", "gender"])["amount"].mean(), check_exact=False)
+    pd.testing.assert_frame_equal(pdf.groupby("region").agg({"amount": ["sum", "std"], "count": "max"}),
+                                  grouped.agg({"amount": ["sum", "std"], "count": "max"}),
+                                  check_dtype=False, check_exact=False)
+
+    assert abs(pdf["amount"].mean() - df["amount"].mean()) < 1e-9
+    assert abs(pdf["amount"].std() - df["amount"].std()) < 1e-9
+    pd.testing.assert_series_equal(pdf.isnull().sum(), df.isnull().sum(), check_dtype=False)
+    assert pdf["region"].value_counts().to_dict() == df["region"].value_counts().to_dict()
+    assert len(pdf.query("amount > 1000")) == len(df.query("amount > 1000"))
+
+    # 숫자가 아닌 컬럼의 count/min/max, int 컬럼 sum의 타입
+    for col in ("region", "signup_date", "count", "amount"):
+        assert pdf[col].count() == df[col].count(), col
+        assert pdf[col].min() == df[col].min(), col
+        assert pdf[col].max() == df[col].max(), col
+    assert pdf["count"].sum() == df["count"].sum()
+    assert isinstance(pdf["count"].sum(), np.integer), type(pdf["count"].sum())
+    assert pdf.query("region == '부산'")["signup_date"].max() == df.query("region == '부산'")["signup_date"].max()
+
+    # describe 분위수는 스케치를 합쳐 계산 (파티션이 작으면 pandas와 같음, 전체 로드 없음)
+    fallbacks = pdf.stats["fallbacks"]
+    pd.testing.assert_frame_equal(pdf.describe(), df.describe(), check_exact=False, rtol=1e-9)
+    assert pdf.stats["fallbacks"] == fallbacks
+
+# %%
+# === 2. 스레드 풀 / 프로세스 풀 모두 확인 ===
+if __name__ == "__main__":
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "sample.csv")
+        df = make_csv(path)
+        for use_processes in (False, True):
+            pdf = PartitionedFrame.from_path(path, partition_bytes=16 * 1024, max_workers=2,
+                                             use_processes=use_processes)
+            try:
+                check_frame(pdf, df)
+            finally:
+                pdf.close()
+            print(f"✅ partitioned_engine == pandas (use_processes={use_processes})")
+
+# %%
+# === 3. 큰 파티션에서는 분위수 스케치가 근사값 ===
+if __name__ == "__main__":
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "large.csv")
+        df = make_csv(path, rows=50000)
+        pdf = PartitionedFrame.from_path(path, partition_bytes=256 * 1024, max_workers=2, use_processes=False)
+        try:
+            got, want = pdf.describe(), df.describe()
+            spread = want.loc["max"] - want.loc["min"]
+            error = ((got.loc[["25%", "50%", "75%"]] - want.loc[["25%", "50%", "75%"]]).abs() / spread).max().max()
+            assert error < 0.01, error
+            pd.testing.assert_frame_equal(got.loc[["count", "mean", "std", "min", "max"]],
+                                          want.loc[["count", "mean", "std", "min", "max"]], check_exact=False)
+        finally:
+            pdf.close()
+        print(f"✅ describe 분위수 스케치 근사 오차 {error:.4%} (범위 대비)")
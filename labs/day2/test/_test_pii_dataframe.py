@@ -0,0 +1,69 @@
+"""
+pii_dataframe 회귀 테스트: 범주형 지역 컬럼은 PERSON이 아니고, 실제 PII 컬럼은 찾아서 마스킹하는지 확인
+
+실행: python test/_test_pii_dataframe.py  (labs/day2에서)
+Jupyter Notebook에서 # %% 단위로 실행 가능
+"""
+# %%
+# === 1. 준비: 이커머스형 DataFrame (region은 category) ===
+import os
+import sys
+import tempfile
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from pii_dataframe import classify_column, mask_dataframe, scan_dataframe
+from pii_vault import PiiVault
+
+SURNAMES = list("김이박최정강조윤장임")
+GIVEN = list("민서지하도윤수현준영진우")
+
+
+def make_frame(rows: int = 5000) -> pd.DataFrame:
+    rng = np.random.default_rng(0)
+    names = [rng.choice(SURNAMES) + "".join(rng.choice(GIVEN, 2)) for _ in range(rows)]
+    return pd.DataFrame({
+        "customer_id": np.arange(1, rows + 1),
+        "customer_name": names,
+        "region": pd.Categorical(rng.choice(["서울", "경기", "부산", "기타"], rows)),
+        "department": rng.choice(["마케팅", "인사팀", "개발팀"], rows),
+        "phone": [f"010-{rng.integers(1000, 9999)}-{rng.integers(1000, 9999)}" for _ in range(rows)],
+        "memo": [f"배송 요청 연락처 010-{1000 + i % 9000}-5678" if i % 2 else "문 앞에 놓아주세요"
+                 for i in range(rows)],
+        "total_amount": rng.integers(1000, 1_000_000, rows),
+    })
+
+# %%
+# === 2. 스캔 / 마스킹 확인 ===
+if __name__ == "__main__":
+    df = make_frame()
+    report = scan_dataframe(df)
+
+    assert "region" not in report.index, report
+    assert "department" not in report.index, report
+    assert "total_amount" not in report.index, report
+    assert report.loc["customer_name", "entity"] == "PERSON"
+    assert report.loc["customer_id", "entity"] == "IDENTIFIER"
+    assert report.loc["phone", "entity"] == "KR_PHONE" and report.loc["phone", "scope"] == "column"
+    assert report.loc["memo", "scope"] == "text"
+
+    # 고유값이 행마다 다른 작은 범주 값도 두 글자 지명/흔한 단어면 이름이 아님
+    tiny = pd.Series(["서울", "경기", "부산", "기타"], name="region")
+    assert classify_column(tiny)["entity"] is None
+    print("✅ scan_dataframe: 범주형 지역/부서는 PII 아님, 이름/ID/전화/메모는 탐지")
+
+    with tempfile.TemporaryDirectory() as tmp, PiiVault(os.path.join(tmp, "vault.sqlite"), key=b"test-key") as vault:
+        masked, report = mask_dataframe(df, vault=vault)
+        # 볼트 토큰이라 마스킹 결과에서 원래 값으로 되돌릴 수 있음
+        first = masked.loc[0, "customer_name"]
+        assert vault.reidentify(f"{first}님") == f"{df.loc[0, 'customer_name']}님"
+        assert masked.loc[0, "customer_id"].startswith("CUSTOMER_ID_")
+    assert masked["region"].equals(df["region"])
+    assert masked["customer_name"].str.startswith("CUST_").all()
+    # 같은 이름 → 같은 토큰 (groupby 유지)
+    assert df.groupby("customer_name").ngroups == masked.groupby("customer_name").ngroups
+    assert (masked["phone"] == "<KR_PHONE>").all()
+    assert not masked["memo"].str.contains("010-").any()
+    print("✅ mask_dataframe: 가명화/삭제/치환 후 PII 값이 남지 않음")
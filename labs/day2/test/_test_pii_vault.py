@@ -0,0 +1,72 @@
+"""
+pii_vault 회귀 테스트: 같은 볼트를 여러 인스턴스/스레드가 써도 토큰 충돌 없이 재식별되는지 확인
+
+실행: python test/_test_pii_vault.py  (labs/day2에서)
+Jupyter Notebook에서 # %% 단위로 실행 가능
+"""
+# %%
+# === 1. 준비: day1 모듈 경로 ===
+import os
+import sys
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
+
+DAY1_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..", "day1")
+sys.path.insert(0, DAY1_DIR)
+from pii_vault import PiiVault
+
+KEY = b"test-key"
+
+
+def check_roundtrip(vault_path: str):
+    with PiiVault(vault_path, key=KEY) as vault:
+        token = vault.tokenize("010-1234-5678", "KR_PHONE")
+        assert token.startswith("PHONE_")
+        assert vault.tokenize("01012345678", "KR_PHONE") == token  # 표기만 다른 같은 값
+        assert vault.tokenize("홍길동") != vault.tokenize("홍길순")
+        text = f"{vault.tokenize('홍길동')}님 연락처 {token}로 회신"
+    # 새 인스턴스(다른 실행)에서도 같은 토큰, 디스크에서 재식별
+    with PiiVault(vault_path, key=KEY) as vault:
+        assert vault.tokenize("홍길동").startswith("CUST_")
+        assert vault.reidentify(text) == "홍길동님 연락처 010-1234-5678로 회신"
+
+
+def check_collisions(vault_path: str, values: int = 300):
+    """
+    token_hex=1 (접두어당 16개)로 일부러 충돌을 만들고,
+    서로 다른 연결 두 개를 여러 스레드가 번갈아 쓰게 해 프로세스 간 경합을 흉내 냄
+    """
+    vaults = [PiiVault(vault_path, key=KEY, token_hex=1) for _ in range(2)]
+    names = [f"고객{i}" for i in range(values)]
+    # 두 인스턴스가 같은 값들을 반대 순서로 처음 보게 해 충돌 해소 순서가 엇갈리게 함
+    jobs = [(vaults[0], name) for name in names] + [(vaults[1], name) for name in reversed(names)]
+    jobs[::2], jobs[1::2] = jobs[:values], jobs[values:]
+    try:
+        with ThreadPoolExecutor(max_workers=8) as pool:
+            tokens = list(pool.map(lambda job: job[0].tokenize(job[1]), jobs))
+        by_name = {}
+        for (_, name), token in zip(jobs, tokens):
+            by_name.setdefault(name, set()).add(token)
+
+        # 같은 값 → 어느 인스턴스에서든 같은 토큰, 다른 값 → 다른 토큰
+        assert all(len(found) == 1 for found in by_name.values()), "같은 값이 다른 토큰을 받음"
+        token_of = {name: found.pop() for name, found in by_name.items()}
+        assert len(set(token_of.values())) == values, "다른 값이 같은 토큰을 받음"
+
+        # 양쪽 인스턴스 모두 상대가 만든 토큰까지 원래 값으로 되돌림
+        for vault in vaults:
+            mapping = vault.lookup(token_of.values())
+            assert all(mapping[token] == name for name, token in token_of.items())
+        assert len(vaults[0]) == values
+    finally:
+        for vault in vaults:
+            vault.close()
+
+# %%
+# === 2. 실행 ===
+if __name__ == "__main__":
+    with tempfile.TemporaryDirectory() as tmp:
+        check_roundtrip(os.path.join(tmp, "roundtrip.sqlite"))
+        print("✅ pii_vault: 같은 값은 실행이 달라도 같은 토큰, 응답 재식별")
+        check_collisions(os.path.join(tmp, "collisions.sqlite"))
+        print("✅ pii_vault: 인스턴스/스레드 간 토큰 충돌 없이 기록")
@@ -0,0 +1,68 @@
+"""
+react_parser 회귀 테스트: 헤더 위치/코드 블록 형식별 추출 결과 확인 (한 번에 / 글자 단위 스트리밍)
+
+실행: python test/_test_react_parser.py  (labs/day2에서)
+Jupyter Notebook에서 # %% 단위로 실행 가능
+"""
+# %%
+# === 1. 준비: 응답 형식별 기대 결과 ===
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from react_parser import ACTION_INPUT, FINAL_ANSWER, ReActParser, parse_react
+
+# (이름, 응답, 기대 코드 목록, 기대 최종 답변)
+CASES = [
+    ("fenced block",
+     "Thought: 평균을 봅니다\nAction: python\nAction Input:\n```python\nresult = df['age'].mean()\n```\n",
+     ["result = df['age'].mean()"], None),
+    ("code on header line",
+     "Action: python\nAction Input: result = df.shape\n\nObservation: (10, 3)\n",
+     ["result = df.shape"], None),
+    ("single-line fence on header line",
+     "Action Input: ```result=1```\n",
+     ["result=1"], None),
+    ("single-line fence with language",
+     "Action Input:\n```python result = len(df)```\n",
+     ["result = len(df)"], None),
+    ("closing fence on last code line",
+     "Action Input:\n```\nx = 1\nresult = x```\nFinal Answer: 끝",
+     ["x = 1\nresult = x"], "끝"),
+    ("fabricated observation ignored",
+     "Action Input: result = 1\nObservation: result = 2\nThought: 완료\nFinal Answer: 1입니다",
+     ["result = 1"], "1입니다"),
+    ("final answer at line start",
+     "Thought: 충분합니다\n**Final Answer:** 서울이 가장 높습니다\n- 근거: 평균 4.2",
+     [], "서울이 가장 높습니다\n- 근거: 평균 4.2"),
+    ("final answer inline after thought",
+     "Thought: 충분합니다. Final Answer: 서울이 가장 높습니다",
+     [], "서울이 가장 높습니다"),
+    ("final answer inline in prose",
+     "분석을 마쳤습니다. **Final Answer:** 부산",
+     [], "부산"),
+    ("unclosed fence (stop sequence)",
+     "Action Input:\n```python\nresult = df.describe()",
+     ["result = df.describe()"], None),
+]
+
+
+def check_case(name: str, text: str, codes, final):
+    parsed = parse_react(text)
+    assert parsed.codes == codes, (name, parsed.codes)
+    assert parsed.final_answer == final, (name, parsed.final_answer)
+
+    # 글자 단위 스트리밍도 같은 결과 + 같은 순서의 이벤트
+    parser = ReActParser()
+    events = [event for ch in text for event in parser.feed(ch)] + parser.close()
+    assert [e.text for e in events if e.kind == ACTION_INPUT] == codes, (name, events)
+    assert [e.text for e in events if e.kind == FINAL_ANSWER] == ([final] if final is not None else []), name
+
+# %%
+# === 2. 실행 ===
+if __name__ == "__main__":
+    for case in CASES:
+        check_case(*case)
+    assert parse_react("Action Input:\n```\n# 주석\nresult = 1\n```", strip_comments=True).codes == ["result = 1"]
+    assert parse_react("Thought: 생각\n").thoughts == ["생각"]
+    print(f"✅ react_parser: {len(CASES)}개 응답 형식 (한 번에 / 스트리밍) 모두 통과")